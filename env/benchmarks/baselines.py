@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Earlier implementations, kept only as comparison points for the benchmarks
+"""
+
+
+def substring_scan(content, resolutions, current_date):
+    """The O(lines x defects) defect log loop that update_defect_log.py replaced
+
+    Every line is checked against every resolution with substring tests,
+    so DEF-001 also matches DEF-0010.
+    """
+    updated_lines = []
+    for line in content.split('\n'):
+        updated_line = line
+        for defect_id, resolution in resolutions.items():
+            if defect_id in line and '| Open |' in line:
+                updated_line = line.replace('| Open |', '| Resolved |')
+                updated_line = updated_line.replace('| |', f'| {resolution} |')
+                updated_line = updated_line.replace(f'| {current_date} | |', f'| {current_date} | {current_date} |')
+        updated_lines.append(updated_line)
+    return '\n'.join(updated_lines)
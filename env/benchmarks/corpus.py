@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Synthetic corpus generation for the fixer benchmarks
+
+Every generator is deterministic for a given size and seed, and produces
+content that exercises the rules (tables without blank lines, bold Phase
+lines, bash fences, unpinned actions, open defects) at a realistic density.
+"""
+import os
+import random
+from typing import Dict
+
+ACTIONS = [
+    'actions/checkout@v3',
+    'actions/setup-node@v3',
+    'gaurav-nelson/github-action-markdown-link-check@v1',
+    'actions/cache@v4',
+]
+
+
+def markdown(lines: int, seed: int = 0) -> str:
+    """Markdown with headings, prose, tables, bold phases and bash fences"""
+    rng = random.Random(seed)
+    out = ['# Synthetic Training Module', '']
+    while len(out) < lines:
+        kind = rng.randrange(6)
+        if kind == 0:
+            out.append(f'## Section {len(out)}')
+            out.append('')
+        elif kind == 1:
+            out.append(f'Paragraph text for line {len(out)} with a [link](docs/guide.md#setup).')
+            out.append('| Metric | Target | Actual |')
+            out.append('|--------|--------|--------|')
+            for row in range(rng.randint(1, 6)):
+                out.append(f'| metric-{row} | {rng.randint(50, 100)}% | {rng.randint(0, 100)}% |')
+            out.append('Text straight after the table.')
+        elif kind == 2:
+            out.append(f'**Phase {rng.randint(1, 9)}: Step {len(out)}**')
+            out.append('')
+        elif kind == 3:
+            out.extend(['```bash', '#!/bin/bash', 'echo "validate"', 'git status', '```', ''])
+        else:
+            out.append(f'Plain prose line {len(out)} describing the exercise in some detail.')
+    return '\n'.join(out[:lines]) + '\n'
+
+
+def yaml(lines: int, seed: int = 0) -> str:
+    """YAML metrics template with a leading blank line"""
+    rng = random.Random(seed)
+    out = ['', 'daily_metrics_template:']
+    while len(out) < lines:
+        out.append(f'  metric_{len(out)}:')
+        out.append(f'    target: {rng.randint(1, 100)}')
+        out.append('    measurement: percentage')
+    return '\n'.join(out[:lines]) + '\n'
+
+
+def workflow(lines: int, seed: int = 0) -> str:
+    """GitHub Actions workflow with unpinned actions and missing scripts"""
+    rng = random.Random(seed)
+    out = ['name: Synthetic', 'on: [push]', 'jobs:']
+    job = 0
+    while len(out) < lines:
+        out.extend([f'  job-{job}:', '    runs-on: ubuntu-latest', '    steps:'])
+        for _ in range(rng.randint(3, 12)):
+            if rng.random() < 0.3:
+                out.append(f'      - uses: {rng.choice(ACTIONS)}')
+            elif rng.random() < 0.1:
+                out.append('      - run: python3 scripts/validate-completeness.py')
+            else:
+                out.append(f'      - run: echo "step {len(out)}" && make target-{rng.randint(1, 50)}')
+        job += 1
+    return '\n'.join(out[:lines]) + '\n'
+
+
+def defect_log(rows: int, seed: int = 0) -> str:
+    """Defect log table with a mix of open and resolved rows"""
+    rng = random.Random(seed)
+    out = [
+        '# CodeRabbit Review Defect Log',
+        '',
+        '| Defect ID | PR # | Actionable Comment / Description | Severity | Owner | Status | Resolution Notes | Date Opened | Date Closed |',
+        '|-----------|------|----------------------------------|----------|-------|--------|------------------|-------------|-------------|',
+    ]
+    for i in range(1, rows + 1):
+        status = 'Open' if rng.random() < 0.7 else 'Resolved'
+        notes, closed = ('', '') if status == 'Open' else ('Fixed earlier', '2025-09-20')
+        out.append(f'| DEF-{i:06d} | {rng.randint(1, 500)} | docs/file-{i}.md: finding {i} | '
+                   f'{rng.choice(["Low", "Medium", "High"])} | System | {status} | {notes} | 2025-09-01 | {closed} |')
+    return '\n'.join(out) + '\n'
+
+
+def write_tree(root: str, files: int, lines_per_file: int, seed: int = 0) -> Dict[str, int]:
+    """Write a docs/training tree of mixed file types; returns counts and bytes"""
+    rng = random.Random(seed)
+    generators = [('md', markdown)] * 7 + [('yaml', yaml), ('yml', workflow), ('txt', None)]
+    total_bytes = 0
+    for i in range(files):
+        ext, generate = rng.choice(generators)
+        directory = os.path.join(root, rng.choice(['docs', 'training/curriculum', 'training/exercises']),
+                                 f'group-{i % 50:02d}')
+        os.makedirs(directory, exist_ok=True)
+        content = generate(lines_per_file, seed + i) if generate else 'notes\n' * lines_per_file
+        with open(os.path.join(directory, f'file-{i:06d}.{ext}'), 'w') as f:
+            f.write(content)
+        total_bytes += len(content.encode('utf-8'))
+    return {'files': files, 'bytes': total_bytes}
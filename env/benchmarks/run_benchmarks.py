@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the scripts/ fixers
+
+Generates synthetic corpora, times each fixer and the end-to-end
+fix_defects.py run, and records throughput (MB/s, files/s) and peak RSS
+as JSON so runs can be compared. Each case runs in a fresh process, so
+peak RSS belongs to that case alone.
+
+    python3 benchmarks/run_benchmarks.py --lines 1000 100000 --files 10 1000 --output bench.json
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Add env/ and scripts/ to path to import the corpus generators and fixers
+ENV_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(os.path.dirname(ENV_DIR), 'scripts')
+sys.path.insert(0, ENV_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+
+from benchmarks import corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB, where available"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _text_case(generate, module, name):
+    """Time one fixer function over a generated buffer
+
+    The fixer is imported inside the benchmark process and before the timer
+    starts, so module import cost is not counted.
+    """
+    def case(size, workdir):
+        transform = getattr(importlib.import_module(module), name)
+        content = generate(size)
+        return {'bytes': len(content.encode('utf-8')), 'seconds': _timed(transform, content)}
+    return case
+
+
+def _markdown_pipeline(size, workdir):
+    """Every markdown rule over one buffer, as the engine runs them"""
+    import fix_defects
+    from remediation.engine import FileResult
+
+    content = corpus.markdown(size)
+    rules = fix_defects.pipeline.rules_for('bench.md')
+    seconds = _timed(fix_defects.pipeline.apply, content, rules, FileResult('bench.md'))
+    return {'bytes': len(content.encode('utf-8')), 'seconds': seconds}
+
+
+def _markdown_streaming(size, workdir):
+    """fix_markdown_tables streaming a file through a temporary file"""
+    import fix_defects
+
+    path = os.path.join(workdir, 'report.md')
+    with open(path, 'w') as f:
+        f.write(corpus.markdown(size))
+    return {'bytes': os.path.getsize(path), 'seconds': _timed(fix_defects.fix_markdown_tables, path)}
+
+
+def _defect_log(indexed):
+    """Resolve every other row of a generated log, indexed or with the old substring scan"""
+    def case(size, workdir):
+        if indexed:
+            from update_defect_log import update_content
+        else:
+            from benchmarks.baselines import substring_scan as update_content
+
+        content = corpus.defect_log(size)
+        resolutions = {f'DEF-{i:06d}': f'Resolved finding {i}' for i in range(1, size + 1, 2)}
+        seconds = _timed(update_content, content, resolutions, '2025-10-01')
+        return {'bytes': len(content.encode('utf-8')), 'seconds': seconds}
+    return case
+
+
+def _end_to_end(warm):
+    def case(size, workdir, lines_per_file=200, jobs=1):
+        import fix_defects
+
+        root = os.path.join(workdir, 'tree')
+        stats = corpus.write_tree(root, size, lines_per_file)
+        # Every rule over the whole generated tree, not just its default targets
+        config = os.path.join(workdir, 'fix.yaml')
+        with open(config, 'w') as f:
+            f.write('remediation:\n  scope: repository\n')
+        args = [root, '--config', config, '--jobs', str(jobs)]
+        args += ['--cache', os.path.join(workdir, 'cache.json')] if warm else ['--no-cache']
+        with contextlib.redirect_stdout(io.StringIO()):
+            if warm:
+                fix_defects.main(args)
+            seconds = _timed(fix_defects.main, args)
+        return {'bytes': stats['bytes'], 'files': stats['files'], 'seconds': seconds}
+    return case
+
+
+# name -> (size unit, case function)
+CASES = {
+    'markdown-tables': ('lines', _text_case(corpus.markdown, 'fix_defects', 'add_table_blank_lines')),
+    'bold-headings': ('lines', _text_case(corpus.markdown, 'fix_defects', 'convert_bold_headings')),
+    'bash-strict-mode': ('lines', _text_case(corpus.markdown, 'fix_defects', 'add_bash_strict_mode')),
+    'markdown-pipeline': ('lines', _markdown_pipeline),
+    'markdown-streaming': ('lines', _markdown_streaming),
+    'yaml-blank-lines': ('lines', _text_case(corpus.yaml, 'fix_defects', 'strip_leading_blank_lines')),
+    'workflow-actions': ('lines', _text_case(corpus.workflow, 'fix_defects', 'pin_workflow_actions')),
+    'workflow-scripts': ('lines', _text_case(corpus.workflow, 'fix_workflows', 'guard_workflow_scripts')),
+    'defect-log-update': ('lines', _defect_log(indexed=True)),
+    'defect-log-substring': ('lines', _defect_log(indexed=False)),
+    'end-to-end': ('files', _end_to_end(warm=False)),
+    'end-to-end-warm': ('files', _end_to_end(warm=True)),
+}
+
+
+def run_case(name, size, options):
+    """Run one case in the current process and return its measurements"""
+    unit, case = CASES[name]
+    workdir = tempfile.mkdtemp(prefix='fixer-bench-')
+    try:
+        kwargs = options if unit == 'files' else {}
+        measured = case(size, workdir, **kwargs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    seconds = max(measured['seconds'], 1e-9)
+    result = {
+        'case': name,
+        unit: size,
+        'bytes': measured['bytes'],
+        'seconds': round(measured['seconds'], 6),
+        'mb_per_s': round(measured['bytes'] / 1e6 / seconds, 3),
+        'peak_rss_kb': peak_rss_kb(),
+    }
+    if 'files' in measured:
+        result['files_per_s'] = round(measured['files'] / seconds, 1)
+    return result
+
+
+def run_benchmarks(lines=(1000, 10000), files=(10, 100), cases=None,
+                   lines_per_file=200, jobs=1, isolate=True):
+    """Run every selected case at every size; returns the JSON report"""
+    options = {'lines_per_file': lines_per_file, 'jobs': jobs}
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name in cases or CASES:
+        unit, _ = CASES[name]
+        for size in (files if unit == 'files' else lines):
+            if isolate:
+                # A fresh interpreter per case keeps peak RSS attributable
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    results.append(executor.submit(run_case, name, size, options).result())
+            else:
+                results.append(run_case(name, size, options))
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': options,
+        'results': results,
+    }
+
+
+def format_report(report):
+    lines = [f"{'case':<20} {'size':>9} {'seconds':>10} {'MB/s':>9} {'files/s':>9} {'peak RSS':>10}"]
+    for r in report['results']:
+        size = r.get('files', r.get('lines'))
+        files_per_s = f"{r['files_per_s']:.0f}" if 'files_per_s' in r else '-'
+        rss = f"{r['peak_rss_kb'] // 1024} MiB" if r['peak_rss_kb'] is not None else '-'
+        lines.append(f"{r['case']:<20} {size:>9} {r['seconds']:>10.4f} {r['mb_per_s']:>9.2f} {files_per_s:>9} {rss:>10}")
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scripts/ fixers on synthetic corpora")
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000],
+                        help="line counts for single-file cases (default: %(default)s)")
+    parser.add_argument('--files', type=int, nargs='+', default=[10, 100],
+                        help="file counts for end-to-end cases (default: %(default)s)")
+    parser.add_argument('--lines-per-file', type=int, default=200,
+                        help="lines in each generated file for end-to-end cases (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="--jobs passed to fix_defects.py in end-to-end cases (default: %(default)s)")
+    parser.add_argument('--case', dest='cases', action='append', choices=sorted(CASES),
+                        help="run only this case (repeatable)")
+    parser.add_argument('--output', '-o', help="write the JSON report here instead of stdout")
+    parser.add_argument('--no-isolate', dest='isolate', action='store_false',
+                        help="run cases in this process (faster, but peak RSS is cumulative)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmarks(args.lines, args.files, args.cases, args.lines_per_file,
+                            args.jobs, args.isolate)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(format_report(report))
+        print(f"\nResults written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
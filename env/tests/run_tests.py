@@ -34,8 +34,20 @@ def run_specific_test(test_module):
     
     return result.wasSuccessful()
 
+def run_benchmarks(output=None):
+    """Run the fixer benchmarks at quick sizes (see benchmarks/run_benchmarks.py)"""
+    from benchmarks import run_benchmarks as bench
+
+    args = ['--lines', '1000', '10000', '--files', '10', '100']
+    if output:
+        args += ['--output', output]
+    return bench.main(args) == 0
+
 if __name__ == '__main__':
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        # Run benchmarks, optionally writing the JSON report to a file
+        success = run_benchmarks(sys.argv[2] if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1:
         # Run specific test
         test_name = sys.argv[1]
         success = run_specific_test(test_name)
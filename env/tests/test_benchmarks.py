@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the fixer benchmark harness (benchmarks/run_benchmarks.py)
+"""
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add env directory to path to import the benchmarks package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import corpus, run_benchmarks
+
+
+class TestCorpus(unittest.TestCase):
+    """Test cases for synthetic corpus generation"""
+
+    def test_generators_are_deterministic(self):
+        """Test the same size and seed always produce the same corpus"""
+        for generate in (corpus.markdown, corpus.yaml, corpus.workflow, corpus.defect_log):
+            self.assertEqual(generate(200, seed=3), generate(200, seed=3))
+        self.assertNotEqual(corpus.markdown(200, seed=1), corpus.markdown(200, seed=2))
+
+    def test_corpus_exercises_rules(self):
+        """Test generated content contains work for the fixers"""
+        import fix_defects
+
+        content = corpus.markdown(500)
+        self.assertNotEqual(fix_defects.add_table_blank_lines(content), content)
+        self.assertNotEqual(fix_defects.pin_workflow_actions(corpus.workflow(200)), corpus.workflow(200))
+
+    def test_write_tree(self):
+        """Test the tree writer reports the files and bytes it wrote"""
+        with tempfile.TemporaryDirectory() as root:
+            stats = corpus.write_tree(root, 12, 20)
+            written = [os.path.join(d, f) for d, _, files in os.walk(root) for f in files]
+            self.assertEqual(stats['files'], len(written))
+            self.assertEqual(stats['bytes'], sum(os.path.getsize(p) for p in written))
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark runner"""
+
+    def test_report_in_process(self):
+        """Test every case reports throughput at tiny sizes"""
+        report = run_benchmarks.run_benchmarks(lines=[50], files=[3], lines_per_file=20, isolate=False)
+        self.assertEqual([r['case'] for r in report['results']], list(run_benchmarks.CASES))
+        for result in report['results']:
+            self.assertGreater(result['bytes'], 0)
+            self.assertGreaterEqual(result['mb_per_s'], 0)
+        end_to_end = [r for r in report['results'] if r['case'].startswith('end-to-end')]
+        self.assertTrue(all('files_per_s' in r for r in end_to_end))
+
+    def test_isolated_case_writes_json(self):
+        """Test a case run in a child process lands in the JSON output"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            run_benchmarks.main(['--lines', '50', '--case', 'markdown-tables', '--output', output])
+            with open(output) as f:
+                report = json.load(f)
+        self.assertEqual(len(report['results']), 1)
+        self.assertEqual(report['results'][0]['lines'], 50)
+        self.assertIn('peak_rss_kb', report['results'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the completeness validator (scripts/validate-completeness.py)
+"""
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.join(REPO_DIR, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import headings
+from remediation.completeness import (DocumentType, CompletenessValidator, heading_key, load_types,
+                                      report, template_sections)
+from remediation.headings import parse_markdown
+
+spec = importlib.util.spec_from_file_location('validate_completeness',
+                                              os.path.join(SCRIPTS_DIR, 'validate-completeness.py'))
+validate_completeness = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(validate_completeness)
+
+SPRINT = "# Sprint {n}\n## Overview\nText\n## Key Achievements\n- one\n## Lessons Learned\n- two\n"
+
+
+class TestSections(unittest.TestCase):
+    """Test cases for deriving and comparing sections"""
+
+    def test_template_sections(self):
+        """Test that the specification template's level-2 headings are required"""
+        with open(os.path.join(REPO_DIR, 'training/templates/specification-template.md')) as f:
+            sections = template_sections(parse_markdown(f.read()))
+        self.assertEqual(sections, ('Overview', 'Requirements', 'Design', 'Implementation Details',
+                                    'Testing Strategy', 'Acceptance Criteria'))
+
+    def test_placeholders_skipped(self):
+        """Test that [placeholder] and deeper headings are not required"""
+        doc = parse_markdown("# Plan: [Name]\n## Phases\n### Phase 1\n## [Custom Section]\n")
+        self.assertEqual(template_sections(doc), ('Phases',))
+
+    def test_heading_key(self):
+        """Test that numbering, emoji and case do not matter"""
+        self.assertEqual(heading_key("1. Key Achievements:"), 'key achievements')
+        self.assertEqual(heading_key("📋 Overview"), heading_key("overview"))
+
+
+class TestCompletenessValidator(unittest.TestCase):
+    """Test cases for validating a tree of documents"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        shutil.copytree(os.path.join(REPO_DIR, 'training/templates'), self.path('training/templates'))
+        for n in (1, 2, 3):
+            self.write(f'docs/history/sprints/sprint-{n}-summary.md', SPRINT.format(n=n))
+        self.write('docs/history/sprints/sprint-2-summary.md', "# Sprint 2\n## 1. Overview\n## Key achievements\n")
+        self.write('docs/specs/search.md', "# Search\n## Overview\n## Requirements\n## Design\n"
+                   "## Implementation Details\n## Testing Strategy\n## Acceptance Criteria\n")
+        self.write('docs/adr/adr-0001-cache.md', "# ADR-0001\n## Status\n## Context\n## Decision\n")
+        self.write('docs/guide.md', "# Untyped\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content):
+        os.makedirs(os.path.dirname(self.path(rel_path)), exist_ok=True)
+        with open(self.path(rel_path), 'w') as f:
+            f.write(content)
+
+    def validate(self, jobs=1, index=None, validator=None):
+        validator = validator or CompletenessValidator(root=self.root)
+        results = validator.validate([self.path('docs'), self.path('training')], jobs, index)
+        return {r.path: r for r in results}
+
+    def test_missing_sections(self):
+        """Test typed documents against their templates and untyped ones ignored"""
+        results = self.validate()
+        self.assertEqual(sorted(results), [
+            'docs/adr/adr-0001-cache.md', 'docs/history/sprints/sprint-1-summary.md',
+            'docs/history/sprints/sprint-2-summary.md', 'docs/history/sprints/sprint-3-summary.md',
+            'docs/specs/search.md'])
+        self.assertEqual(results['docs/history/sprints/sprint-2-summary.md'].missing, ('Lessons Learned',))
+        self.assertTrue(results['docs/specs/search.md'].complete)
+        adr = results['docs/adr/adr-0001-cache.md']
+        self.assertEqual((adr.type, adr.missing), ('adr', ('Consequences', 'Alternatives Considered', 'References')))
+
+    def test_report(self):
+        """Test the machine-readable summary"""
+        summary = report(list(self.validate().values()))
+        self.assertEqual((summary['checked'], summary['complete'], summary['incomplete']), (5, 3, 2))
+        self.assertEqual(json.loads(json.dumps(summary)), summary)
+
+    def test_index_reused(self):
+        """Test that a second run parses only the file that changed"""
+        index = self.path('.markdown_index.json')
+        self.validate(index=index)
+        self.write('docs/history/sprints/sprint-2-summary.md', SPRINT.format(n=2))
+        validator = CompletenessValidator(root=self.root)
+        with patch.object(headings, 'parse_markdown', wraps=headings.parse_markdown) as parsed:
+            results = self.validate(index=index, validator=validator)
+        self.assertEqual(parsed.call_count, 1)
+        self.assertTrue(results['docs/history/sprints/sprint-2-summary.md'].complete)
+
+    def test_parallel_matches_serial(self):
+        """Test that parsing across processes gives the same results"""
+        self.assertEqual(self.validate(jobs=2), self.validate())
+
+    def test_rules_file(self):
+        """Test declaring document types in JSON"""
+        rules = self.path('rules.json')
+        with open(rules, 'w') as f:
+            json.dump([{'name': 'guide', 'patterns': ['guide.md'], 'sections': ['Setup']}], f)
+        types = load_types(rules)
+        self.assertEqual(types, (DocumentType('guide', ('guide.md',), None, ('Setup',)),))
+        results = CompletenessValidator(types, self.root).validate([self.path('docs')])
+        self.assertEqual([(r.path, r.missing) for r in results], [('docs/guide.md', ('Setup',))])
+        with open(rules, 'w') as f:
+            json.dump([{'name': 'guide'}], f)
+        with self.assertRaises(ValueError):
+            load_types(rules)
+
+    def test_templates_from_this_repository(self):
+        """Test validating a tree that has no training/templates of its own"""
+        shutil.rmtree(self.path('training'))
+        results = self.validate()
+        self.assertTrue(results['docs/specs/search.md'].complete)
+        self.assertEqual(results['docs/adr/adr-0001-cache.md'].missing,
+                         ('Consequences', 'Alternatives Considered', 'References'))
+
+    def test_cli(self):
+        """Test the JSON report and exit status from the command line"""
+        with redirect_stdout(io.StringIO()) as out:
+            status = validate_completeness.main(['--root', self.root, '--json', '--no-index'])
+        self.assertEqual(status, 1)
+        self.assertEqual(json.loads(out.getvalue())['incomplete'], 2)
+        with redirect_stdout(io.StringIO()) as out:
+            status = validate_completeness.main(['--root', self.root, '--no-index', self.path('docs/specs')])
+        self.assertEqual(status, 0)
+        self.assertIn('Checked 1 documents: 1 complete, 0 incomplete', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content metrics engine (scripts/generate-metrics.py)
+"""
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import content_metrics
+from remediation.content_metrics import MetricsCache, iter_file_metrics, measure, write_metrics_json
+
+spec = importlib.util.spec_from_file_location('generate_metrics', os.path.join(SCRIPTS_DIR, 'generate-metrics.py'))
+generate_metrics = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_metrics)
+
+DOC = """# Guide
+
+Intro with a [link](other.md) and `code`.
+
+| Col | Other |
+|-----|-------|
+| a b | c     |
+
+```bash
+echo not counted
+```
+
+## Next ##
+- item [two](#guide)
+"""
+
+
+class TestMeasure(unittest.TestCase):
+    """Test cases for per-document counts"""
+
+    def test_counts(self):
+        """Test each count on a small document"""
+        self.assertEqual(measure(DOC), {
+            'words': 15, 'headings': 2, 'tables': 1, 'code_blocks': 1, 'links': 2})
+
+    def test_unclosed_fence_is_a_block(self):
+        """Test that a fence left open still counts as a code block"""
+        self.assertEqual(measure("text\n```\ncode")['code_blocks'], 1)
+
+
+class TestContentMetrics(unittest.TestCase):
+    """Test cases for the cached, streaming report"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.cache_path = os.path.join(self.root, '.cache.json')
+        for name in ('docs/guide.md', 'docs/sub/other.md', 'training/day1.md'):
+            self.write(name, DOC)
+        self.write('docs/notes.txt', "not markdown")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content):
+        os.makedirs(os.path.dirname(self.path(rel_path)), exist_ok=True)
+        with open(self.path(rel_path), 'w') as f:
+            f.write(content)
+
+    def run_metrics(self, jobs=1):
+        cache = MetricsCache(self.cache_path)
+        out = io.StringIO()
+        summary = write_metrics_json(out, [self.path('docs'), self.path('training')], cache, jobs)
+        cache.save()
+        return json.loads(out.getvalue()), summary, cache
+
+    def test_report(self):
+        """Test per-file records and the aggregate summary"""
+        report, summary, _ = self.run_metrics()
+        self.assertEqual(report['summary'], summary)
+        self.assertEqual([os.path.basename(f['path']) for f in report['files']], ['guide.md', 'other.md', 'day1.md'])
+        self.assertEqual(summary['words'], 45)
+        self.assertEqual(summary['link_density'], round(100 * 6 / 45, 2))
+        self.assertEqual(summary['stale_files'], 0)
+
+    def test_only_changed_files_measured(self):
+        """Test that unchanged and merely touched files come from the cache"""
+        self.run_metrics()
+        os.utime(self.path('docs/guide.md'), ns=(1, 1))
+        self.write('training/day1.md', "# Day one\n")
+        with patch.object(content_metrics, 'measure', wraps=content_metrics.measure) as measured:
+            report, summary, cache = self.run_metrics()
+        self.assertEqual(measured.call_count, 1)
+        self.assertEqual(cache.measured, 1)
+        self.assertEqual(report['files'][2]['words'], 2)
+        self.assertTrue(report['files'][0]['stale'])
+
+    def test_staleness(self):
+        """Test that age comes from mtime and the threshold is configurable"""
+        cache = MetricsCache(None)
+        old = time.time() - 10 * 86400
+        os.utime(self.path('docs/guide.md'), (old, old))
+        records = list(iter_file_metrics([self.path('docs')], cache, stale_days=5))
+        self.assertEqual([r['stale'] for r in records], [True, False])
+        self.assertAlmostEqual(records[0]['age_days'], 10, delta=0.2)
+
+    def test_deleted_files_evicted(self):
+        """Test that the cache forgets files that were removed"""
+        self.run_metrics()
+        os.remove(self.path('docs/sub/other.md'))
+        self.run_metrics()
+        stored = json.load(open(self.cache_path))['files']
+        self.assertEqual(len(stored), 2)
+
+    def test_parallel_matches_serial(self):
+        """Test that measuring across processes gives the same report"""
+        serial = self.run_metrics()[0]
+        os.remove(self.cache_path)
+        parallel = self.run_metrics(jobs=2)[0]
+        self.assertEqual(parallel['files'], serial['files'])
+
+    def test_cli_output_file(self):
+        """Test writing the report to a file in a directory that does not exist yet"""
+        output = self.path('metrics/content-metrics.json')
+        with redirect_stderr(io.StringIO()) as err:
+            status = generate_metrics.main([self.path('docs'), '--output', output, '--cache', self.cache_path])
+        self.assertEqual(status, 0)
+        self.assertIn('Measured 2 files (2 changed)', err.getvalue())
+        with open(output) as f:
+            self.assertEqual(json.load(f)['summary']['files'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the append-only defect event store (scripts/remediation/defect_store.py)
+"""
+import unittest
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import defect_events
+from remediation.defect_store import DefectStore
+from remediation.manifest import ManifestEntry
+from remediation.mdtable import MarkdownDocument
+
+
+class TestDefectStore(unittest.TestCase):
+    """Test cases for appending and folding events"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.store = DefectStore(os.path.join(self.root, 'events'))
+        self.log = os.path.join(self.root, 'DEFECT_LOG.md')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_events_fold_in_append_order(self):
+        """Test that later events override earlier fields"""
+        self.store.open_defect('DEF-001', 12, 'Table spacing', 'Low', date='2025-09-22')
+        self.store.set_status('DEF-001', 12, 'Resolved', 'Added blank lines', '2025-09-23')
+        self.store.set_status('DEF-001', 12, 'Open')
+        record = self.store.fold()['DEF-001']
+        self.assertEqual(record['Status'], 'Open')
+        self.assertEqual(record['Date Closed'], '')
+        self.assertEqual(record['Resolution Notes'], 'Added blank lines')
+        self.assertEqual(record['Date Opened'], '2025-09-22')
+
+    def test_shards_per_pr(self):
+        """Test that each PR gets its own shard, listed in numeric order"""
+        self.store.open_defect('DEF-002', 10, 'b', 'Low')
+        self.store.open_defect('DEF-001', 9, 'a', 'Low')
+        self.assertEqual([pr for pr, _ in self.store.shards()], ['9', '10'])
+        self.assertEqual(list(self.store.fold(10)), ['DEF-002'])
+        self.assertEqual(self.store.locate('DEF-001'), '9')
+        self.assertIsNone(self.store.locate('DEF-404'))
+
+    def test_partial_trailing_line_ignored(self):
+        """Test that an append still being written is not read"""
+        self.store.open_defect('DEF-001', 1, 'a', 'Low')
+        with open(self.store.shard_path(1), 'a') as f:
+            f.write('{"id": "DEF-001", "pr": "1", "set": {"Sta')
+        self.assertEqual(self.store.fold()['DEF-001']['Status'], 'Open')
+
+    def test_invalid_pr_rejected(self):
+        """Test that a PR cannot name a path outside the store"""
+        with self.assertRaises(ValueError):
+            self.store.shard_path('../1')
+
+    def test_compact_only_when_stale(self):
+        """Test that compaction is skipped until a new event arrives"""
+        self.store.open_defect('DEF-001', 1, 'a | b', 'Low')
+        self.assertTrue(self.store.compact(self.log))
+        self.assertFalse(self.store.compact(self.log))
+        self.store.set_status('DEF-001', 1, 'Resolved', 'done', '2025-09-23')
+        self.assertTrue(self.store.compact(self.log))
+
+        with open(self.log) as f:
+            table = MarkdownDocument.parse(f.read()).find_table('Defect ID', 'Status')
+        row = table.rows[0]
+        self.assertEqual(table.get(row, 'Status'), 'Resolved')
+        self.assertEqual(table.get(row, 'Actionable Comment / Description'), 'a \\| b')
+
+    def test_compact_rewrites_missing_output(self):
+        """Test that a deleted log is regenerated even without new events"""
+        self.store.open_defect('DEF-001', 1, 'a', 'Low')
+        self.store.compact(self.log)
+        os.remove(self.log)
+        self.assertTrue(self.store.compact(self.log))
+
+    def test_per_pr_views(self):
+        """Test that compaction writes one view per PR"""
+        self.store.open_defect('DEF-001', 1, 'a', 'Low')
+        self.store.open_defect('DEF-002', 2, 'b', 'High')
+        views = os.path.join(self.root, 'views')
+        self.store.compact(self.log, views)
+        self.assertEqual(sorted(os.listdir(views)), ['PR-1.md', 'PR-2.md'])
+        with open(os.path.join(views, 'PR-2.md')) as f:
+            content = f.read()
+        self.assertTrue(content.startswith('# CodeRabbit PR #2 Review Defect Log'))
+        self.assertIn('DEF-002', content)
+        self.assertNotIn('DEF-001', content)
+
+
+class TestDefectEvents(unittest.TestCase):
+    """Test cases for the defect_events.py command line"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.events = os.path.join(self.root, 'events')
+        self.log = os.path.join(self.root, 'DEFECT_LOG.md')
+        with open(self.log, 'w') as f:
+            f.write("# CodeRabbit Review Defect Log\n\n"
+                    "| Defect ID | PR # | Actionable Comment / Description | Severity | Owner | Status | Resolution Notes | Date Opened | Date Closed |\n"
+                    "|---|---|---|---|---|---|---|---|---|\n"
+                    "| DEF-001 | 1 | Table spacing | Low | System | Open | | 2025-09-22 | |\n"
+                    "| DEF-002 | 3 | Pin actions | High | System | Resolved | Pinned | 2025-09-22 | 2025-09-23 |\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        with redirect_stdout(io.StringIO()) as out:
+            code = defect_events.main(['--store', self.events] + list(argv))
+        return code, out.getvalue()
+
+    def test_import_round_trip(self):
+        """Test that importing then compacting reproduces the table"""
+        with open(self.log) as f:
+            before = MarkdownDocument.parse(f.read()).find_table('Defect ID')
+        self.assertEqual(self.run_cli('import', '--log', self.log)[0], 0)
+        self.assertEqual(self.run_cli('compact', '--log', self.log)[0], 0)
+        with open(self.log) as f:
+            after = MarkdownDocument.parse(f.read()).find_table('Defect ID')
+        self.assertEqual([r.cells for r in after.rows], [r.cells for r in before.rows])
+
+    def test_import_is_idempotent(self):
+        """Test that a second import appends nothing"""
+        self.assertIn('Imported 2 defects', self.run_cli('import', '--log', self.log)[1])
+        store = DefectStore(self.events)
+        version = store.version()
+        self.assertIn('Imported 0 defects', self.run_cli('import', '--log', self.log)[1])
+        self.assertEqual(store.version(), version)
+
+    def test_compact_keeps_surrounding_text(self):
+        """Test that only the defect table of an existing log is regenerated"""
+        with open(self.log) as f:
+            table = f.read().split('\n', 2)[2]
+        with open(self.log, 'w') as f:
+            f.write("# Team Defect Log\n\nTracked from CodeRabbit reviews.\n\n" + table + "\n## Notes\nKeep this.\n")
+        self.run_cli('import', '--log', self.log)
+        self.run_cli('status', 'DEF-001', 'resolve', '--date', '2025-10-01')
+        self.run_cli('compact', '--log', self.log)
+        with open(self.log) as f:
+            content = f.read()
+        self.assertTrue(content.startswith("# Team Defect Log\n\nTracked from CodeRabbit reviews.\n\n| Defect ID"))
+        self.assertTrue(content.endswith("\n\n## Notes\nKeep this.\n"))
+        self.assertNotIn('# CodeRabbit Review Defect Log', content)
+        table = MarkdownDocument.parse(content).find_table('Defect ID', 'Status')
+        self.assertEqual(table.get(table.rows[0], 'Status'), 'Resolved')
+
+    def test_compact_refuses_unseeded_store(self):
+        """Test that compacting over a fresh store keeps the log unless forced"""
+        with open(self.log) as f:
+            before = f.read()
+        code, out = self.run_cli('compact', '--log', self.log)
+        self.assertEqual(code, 2)
+        self.assertIn('DEF-001, DEF-002', out)
+        with open(self.log) as f:
+            self.assertEqual(f.read(), before)
+
+        self.assertEqual(self.run_cli('compact', '--log', self.log, '--force')[0], 0)
+        with open(self.log) as f:
+            self.assertEqual(MarkdownDocument.parse(f.read()).find_table('Defect ID').rows, [])
+
+    def test_compact_refuses_to_drop_unknown_rows(self):
+        """Test that a log row added by hand is not lost by compaction"""
+        self.run_cli('import', '--log', self.log)
+        with open(self.log, 'a') as f:
+            f.write("| DEF-003 | 1 | Added by hand | Low | System | Open | | 2025-09-24 | |\n")
+        self.run_cli('status', 'DEF-001', 'resolve')
+        self.assertEqual(self.run_cli('compact', '--log', self.log)[0], 2)
+        self.run_cli('import', '--log', self.log)
+        self.assertEqual(self.run_cli('compact', '--log', self.log)[0], 0)
+        with open(self.log) as f:
+            table = MarkdownDocument.parse(f.read()).find_table('Defect ID')
+        self.assertEqual(sorted(table.get(r, 'Defect ID') for r in table.rows), ['DEF-001', 'DEF-002', 'DEF-003'])
+
+    def test_status_locates_pr(self):
+        """Test that status finds the shard of a defect without --pr"""
+        self.run_cli('import', '--log', self.log)
+        code, _ = self.run_cli('status', 'DEF-001', 'resolve', '--notes', 'Fixed', '--date', '2025-10-01')
+        self.assertEqual(code, 0)
+        record = DefectStore(self.events).fold(1)['DEF-001']
+        self.assertEqual((record['Status'], record['Date Closed']), ('Resolved', '2025-10-01'))
+        self.assertEqual(self.run_cli('status', 'DEF-404', 'Resolved')[0], 1)
+
+    def test_manifest_report(self):
+        """Test that a manifest appends only real changes and reports the rest"""
+        self.run_cli('import', '--log', self.log)
+        store = DefectStore(self.events)
+        size = os.path.getsize(store.shard_path(3))
+        report = defect_events.apply_manifest(store, [
+            ManifestEntry('DEF-001', 'Resolved', 'Fixed'),
+            ManifestEntry('DEF-002', 'Resolved'),
+            ManifestEntry('DEF-404', 'Resolved'),
+        ])
+        self.assertEqual(report.changed, {'Resolved': ['DEF-001']})
+        self.assertEqual(report.unchanged, {'Resolved': ['DEF-002']})
+        self.assertEqual(report.missing, ['DEF-404'])
+        self.assertEqual(os.path.getsize(store.shard_path(3)), size)
+
+    def test_manifest_blank_pr_cell(self):
+        """Test that a defect imported without a PR is updated in its shard"""
+        with open(self.log, 'a') as f:
+            f.write("| DEF-003 | | No PR recorded | Low | System | Open | | 2025-09-24 | |\n")
+        self.run_cli('import', '--log', self.log)
+        store = DefectStore(self.events)
+        report = defect_events.apply_manifest(store, [ManifestEntry('DEF-003', 'Resolved', 'Fixed')])
+        self.assertEqual(report.changed, {'Resolved': ['DEF-003']})
+        record = store.fold('unknown')['DEF-003']
+        self.assertEqual((record['Status'], record['PR #']), ('Resolved', ''))
+
+    def test_show_compacts_when_stale(self):
+        """Test that reading the log through show regenerates it first"""
+        self.run_cli('import', '--log', self.log)
+        self.run_cli('status', 'DEF-001', 'resolve', '--date', '2025-10-01')
+        code, out = self.run_cli('show', '--log', self.log)
+        self.assertEqual(code, 0)
+        table = MarkdownDocument.parse(out).find_table('Defect ID', 'Status')
+        self.assertEqual(table.get(table.rows[0], 'Status'), 'Resolved')
+        with open(self.log) as f:
+            self.assertEqual(f.read(), out)
+        self.assertFalse(DefectStore(self.events).is_stale(self.log))
+        self.assertNotIn('DEF-001', self.run_cli('show', '--pr', '3')[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Unit tests for repository file discovery (scripts/remediation/discovery.py)
+"""
+import unittest
+import tempfile
+import os
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation.discovery import FileDiscovery, glob_to_regex, load_fix_scope, load_scope
+import fix_defects
+import fix_workflows
+
+
+class TestGlobMatching(unittest.TestCase):
+    """Test cases for glob compilation"""
+
+    def test_double_star_matches_any_depth(self):
+        """Test that **/ matches zero or more directories"""
+        regex = glob_to_regex('**/*.md')
+        self.assertTrue(regex.match('README.md'))
+        self.assertTrue(regex.match('training/curriculum/day1_foundation.md'))
+        self.assertFalse(regex.match('README.md.bak'))
+
+    def test_single_star_stays_in_segment(self):
+        """Test that * does not cross directory boundaries"""
+        regex = glob_to_regex('.github/workflows/*.yml')
+        self.assertTrue(regex.match('.github/workflows/ci.yml'))
+        self.assertFalse(regex.match('.github/workflows/sub/ci.yml'))
+
+    def test_bare_pattern_matches_basename(self):
+        """Test that patterns without a slash match in any directory"""
+        regex = glob_to_regex('*.log')
+        self.assertTrue(regex.match('build.log'))
+        self.assertTrue(regex.match('logs/run/build.log'))
+
+
+class TestFileDiscovery(unittest.TestCase):
+    """Test cases for the directory walk"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        files = [
+            'README.md',
+            'docs/guide.md',
+            'docs/notes.txt',
+            'training/metrics/outcomes.yaml',
+            'training/metrics/run.log',
+            'node_modules/pkg/README.md',
+            '.git/HEAD.md',
+            'scripts/__pycache__/x.md',
+            'image.png',
+        ]
+        for rel_path in files:
+            path = os.path.join(self.test_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('# x\n')
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_load_scope_from_coderabbit_config(self):
+        """Test that include/exclude patterns come from .coderabbit.yaml"""
+        config = os.path.join(self.test_dir, '.coderabbit.yaml')
+        with open(config, 'w') as f:
+            f.write('reviews:\n  scope:\n    include_patterns:\n      - "**/*.md"\n'
+                    '    # comment\n    exclude_patterns:\n      - "docs/**"\nlanguage: "en-US"\n')
+
+        include, exclude = load_scope(config)
+
+        self.assertEqual(include, ['**/*.md'])
+        self.assertEqual(exclude, ['docs/**'])
+
+    def test_load_scope_defaults_without_config(self):
+        """Test fallback to default patterns"""
+        include, exclude = load_scope(os.path.join(self.test_dir, 'missing.yaml'))
+        self.assertIn('**/*.md', include)
+        self.assertIn('.git/**', exclude)
+
+    def test_walk_prunes_excluded_directories(self):
+        """Test that excluded directories are never scanned"""
+        discovery = FileDiscovery()
+        scanned = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned.append(os.path.relpath(path, self.test_dir))
+            return real_scandir(path)
+
+        with patch('os.scandir', side_effect=tracking_scandir):
+            found = list(discovery.walk(self.test_dir))
+
+        rel = [os.path.relpath(p, self.test_dir) for p in found]
+        self.assertEqual(rel, ['README.md', 'docs/guide.md', 'docs/notes.txt',
+                               'training/metrics/outcomes.yaml'])
+        self.assertNotIn('node_modules', scanned)
+        self.assertNotIn('.git', scanned)
+        self.assertNotIn('scripts/__pycache__', scanned)
+
+    def test_walk_is_lazy(self):
+        """Test that results stream before the walk finishes"""
+        walker = FileDiscovery().walk(self.test_dir)
+        self.assertTrue(next(walker).endswith('README.md'))
+
+    def test_expand_passes_files_through(self):
+        """Test that explicit files are not filtered"""
+        discovery = FileDiscovery(['**/*.md'])
+        explicit = os.path.join(self.test_dir, 'image.png')
+        found = list(discovery.expand([explicit, os.path.join(self.test_dir, 'docs')]))
+        self.assertEqual(found[0], explicit)
+        self.assertTrue(found[1].endswith('guide.md'))
+
+    def write_config(self, remediation):
+        config = os.path.join(self.test_dir, 'fix.yaml')
+        with open(config, 'w') as f:
+            f.write('reviews:\n  scope:\n    include_patterns:\n      - "**/*.md"\n' + remediation + 'language: "en-US"\n')
+        return config
+
+    def test_fix_defects_main_uses_discovery(self):
+        """Test that fix_defects walks the tree instead of a fixed list"""
+        doc = os.path.join(self.test_dir, 'docs/guide.md')
+        with open(doc, 'w') as f:
+            f.write('Intro\n| A |\n|---|\nOutro\n')
+        config = self.write_config('remediation:\n  scope: repository\n')
+
+        with patch('builtins.print'):
+            code = fix_defects.main([self.test_dir, '--no-cache', '--config', config])
+
+        self.assertEqual(code, 0)
+        with open(doc) as f:
+            self.assertEqual(f.read(), 'Intro\n\n| A |\n|---|\n\nOutro\n')
+
+    def test_default_targets_only(self):
+        """Test that without a remediation block only each rule's flagged files are fixed"""
+        content = 'Intro\n| A |\n|---|\nOutro\n\n**Phase 1: Setup**\n'
+        paths = [os.path.join(self.test_dir, 'docs', name) for name in ('guide.md', 'IntegrationPlan.md')]
+        for path in paths:
+            with open(path, 'w') as f:
+                f.write(content)
+
+        with patch('builtins.print'):
+            fix_defects.main([self.test_dir, '--no-cache', '--config', os.path.join(self.test_dir, 'none.yaml')])
+
+        with open(paths[0]) as f:
+            self.assertEqual(f.read(), content)
+        with open(paths[1]) as f:
+            self.assertEqual(f.read(), 'Intro\n\n| A |\n|---|\n\nOutro\n\n**Phase 1: Setup**\n')
+
+    def test_rule_patterns_widen_one_rule(self):
+        """Test that rule_patterns give a single rule its own globs"""
+        config = self.write_config('remediation:\n  rule_patterns:\n    bold-headings:\n      - "**/docs/*.md"\n')
+        self.assertEqual(load_fix_scope(config), (False, {'bold-headings': ['**/docs/*.md']}))
+        doc = os.path.join(self.test_dir, 'docs/guide.md')
+        with open(doc, 'w') as f:
+            f.write('Intro\n| A |\n|---|\n\n**Phase 1: Setup**\n')
+
+        with patch('builtins.print'):
+            fix_defects.main([self.test_dir, '--no-cache', '--config', config])
+
+        with open(doc) as f:
+            self.assertEqual(f.read(), 'Intro\n| A |\n|---|\n\n#### Phase 1: Setup\n')
+
+    def test_fix_scope_defaults_without_block(self):
+        """Test that a config without a remediation block keeps the default targets"""
+        self.assertEqual(load_fix_scope(self.write_config('')), (False, {}))
+        self.assertEqual(load_fix_scope(os.path.join(self.test_dir, 'none.yaml')), (False, {}))
+
+
+class TestRuleIdempotence(unittest.TestCase):
+    """Rules now run over the whole tree on every pass, so they must be idempotent"""
+
+    def test_metrics_mkdir_added_once(self):
+        """Test that mkdir -p is not inserted twice"""
+        content = '# Create daily metrics file\ncat > "$METRICS_DIR/$DATE-$PARTICIPANT_ID-day$DAY.json"\n'
+        once = fix_defects.add_metrics_mkdir(content)
+        self.assertIn('mkdir -p "$METRICS_DIR"', once)
+        self.assertEqual(fix_defects.add_metrics_mkdir(once), once)
+
+    def test_workflow_guards_added_once(self):
+        """Test that already guarded script calls are left alone"""
+        content = '      run: python3 scripts/validate-completeness.py\n'
+        once = fix_workflows.guard_workflow_scripts(content)
+        self.assertIn('if [ -f scripts/validate-completeness.py ]', once)
+        self.assertEqual(fix_workflows.guard_workflow_scripts(once), once)
+
+
+if __name__ == '__main__':
+    unittest.main()
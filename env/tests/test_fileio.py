@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Unit tests for atomic writes and advisory locking (scripts/remediation/fileio.py)
+"""
+import unittest
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import fileio
+from remediation.cache import FixCache
+from remediation.fileio import atomic_write_text, atomic_writer, locked
+
+LOG_HEADER = ("| Defect ID | Severity | Status | Resolution Notes | Date Closed |\n"
+              "|---|---|---|---|---|\n")
+
+
+def _resolve_one(log_path, defect_id):
+    """Worker: resolve one defect through the normal read-modify-write path"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    import update_defect_log
+    from remediation.manifest import ManifestEntry
+    update_defect_log.apply_manifest(log_path, [ManifestEntry(defect_id, 'Resolved', f'fixed {defect_id}')],
+                                     '2025-10-01')
+
+
+def _record_one(cache_path, name):
+    """Worker: add one entry to a shared fix cache"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    from remediation.cache import FixCache
+    cache = FixCache(cache_path, 'rules')
+    cache.record(os.path.join(os.path.dirname(cache_path), name), 1, 2, 'digest')
+    cache.save()
+
+
+class TestAtomicWriter(unittest.TestCase):
+    """Test cases for the streaming atomic writer"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'report.json')
+        with open(self.path, 'w') as f:
+            f.write('old')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_replaces_on_success(self):
+        """Test that the target only changes once the block completes"""
+        with atomic_writer(self.path) as out:
+            out.write('new')
+            with open(self.path) as f:
+                self.assertEqual(f.read(), 'old')
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'new')
+
+    def test_left_alone_on_error(self):
+        """Test that a failure keeps the old file and removes the temporary one"""
+        with self.assertRaises(ValueError):
+            with atomic_writer(self.path) as out:
+                out.write('partial')
+                raise ValueError
+        self.assertEqual(os.listdir(self.temp_dir.name), ['report.json'])
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'old')
+
+    def test_new_file_follows_umask(self):
+        """Test that a created file gets the umask's permissions, an existing one keeps its own"""
+        os.chmod(self.path, 0o640)
+        created = os.path.join(self.temp_dir.name, 'new.json')
+        previous = os.umask(0o027)
+        try:
+            atomic_write_text(self.path, 'new')
+            atomic_write_text(created, 'new')
+            with atomic_writer(os.path.join(self.temp_dir.name, 'streamed.json')) as out:
+                out.write('new')
+        finally:
+            os.umask(previous)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.stat(created).st_mode & 0o777, 0o640)
+        self.assertEqual(os.stat(os.path.join(self.temp_dir.name, 'streamed.json')).st_mode & 0o777, 0o640)
+
+    def test_exclusive_never_replaces(self):
+        """Test that an exclusive writer only creates the file"""
+        with self.assertRaises(FileExistsError):
+            with atomic_writer(self.path, exclusive=True) as out:
+                out.write('new')
+        self.assertEqual(os.listdir(self.temp_dir.name), ['report.json'])
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'old')
+
+
+@unittest.skipIf(fileio.fcntl is None, "advisory locks need fcntl")
+class TestLocked(unittest.TestCase):
+    """Test cases for the locked() context manager"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'doc.md')
+        with open(self.path, 'w') as f:
+            f.write('old')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_missing_file(self):
+        """Test that a missing file yields None unless created"""
+        missing = os.path.join(self.temp_dir.name, 'missing')
+        with locked(missing) as f:
+            self.assertIsNone(f)
+        self.assertFalse(os.path.exists(missing))
+        with locked(missing, create=True) as f:
+            self.assertEqual(f.read(), b'')
+
+    def test_lock_excludes_other_processes(self):
+        """Test that another process cannot take the lock while it is held"""
+        probe = ("import fcntl, sys\n"
+                 "f = open(sys.argv[1], 'rb')\n"
+                 "try:\n    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+                 "except OSError:\n    sys.exit(1)\n")
+        with locked(self.path):
+            self.assertEqual(subprocess.run([sys.executable, '-c', probe, self.path]).returncode, 1)
+        self.assertEqual(subprocess.run([sys.executable, '-c', probe, self.path]).returncode, 0)
+
+    def test_waiter_follows_replacement(self):
+        """Test that a waiter wakes up holding the replaced file, not the old one"""
+        seen = []
+        with locked(self.path):
+            waiter = threading.Thread(target=lambda: seen.append(self._read_locked()))
+            waiter.start()
+            time.sleep(0.1)
+            atomic_write_text(self.path, 'new')
+        waiter.join(5)
+        self.assertEqual(seen, [b'new'])
+
+    def _read_locked(self):
+        with locked(self.path) as f:
+            return f.read()
+
+
+@unittest.skipIf(fileio.fcntl is None, "advisory locks need fcntl")
+class TestConcurrentUpdates(unittest.TestCase):
+    """Test cases for parallel jobs updating the same files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.context = multiprocessing.get_context('spawn')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_parallel(self, target, jobs):
+        workers = [self.context.Process(target=target, args=args) for args in jobs]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            self.assertEqual(worker.exitcode, 0)
+
+    def test_defect_log_updates_not_lost(self):
+        """Test that concurrent log updates each land in the final file"""
+        log = os.path.join(self.temp_dir.name, 'DEFECT_LOG.md')
+        ids = [f'DEF-{i:03d}' for i in range(8)]
+        with open(log, 'w') as f:
+            f.write(LOG_HEADER + ''.join(f'| {i} | Low | Open | | |\n' for i in ids))
+
+        self.run_parallel(_resolve_one, [(log, i) for i in ids])
+
+        with open(log) as f:
+            content = f.read()
+        self.assertEqual(content.count('| Resolved |'), len(ids))
+        for i in ids:
+            self.assertIn(f'fixed {i}', content)
+
+    def test_cache_saves_merge(self):
+        """Test that concurrent cache saves keep each other's entries"""
+        cache_path = os.path.join(self.temp_dir.name, 'cache.json')
+        names = [f'doc{i}.md' for i in range(6)]
+        for name in names:
+            open(os.path.join(self.temp_dir.name, name), 'w').close()
+
+        self.run_parallel(_record_one, [(cache_path, name) for name in names])
+
+        self.assertEqual(sorted(FixCache(cache_path, 'rules').entries), names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental fixing cache (scripts/remediation/cache.py)
+"""
+import unittest
+import tempfile
+import os
+import json
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation.cache import FixCache, open_cache, ruleset_fingerprint
+from remediation.engine import FixerPipeline
+import fix_defects
+
+
+class TestFixCache(unittest.TestCase):
+    """Test cases for cache-driven skipping"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'cache.json')
+        self.doc = os.path.join(self.test_dir, 'doc.md')
+        with open(self.doc, 'w') as f:
+            f.write('Intro\n| A |\n|---|\nOutro\n')
+        self.pipeline = FixerPipeline()
+        self.pipeline.register('tables', fix_defects.add_table_blank_lines, ['**/*.md'])
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def run_cached(self):
+        cache = open_cache(self.cache_path, self.pipeline.rules)
+        results = self.pipeline.run([self.doc], cache=cache)
+        cache.save()
+        return results
+
+    def test_warm_run_skips_without_reading(self):
+        """Test that a clean file is skipped on stat alone"""
+        self.assertEqual(self.run_cached()[0].status, 'fixed')
+
+        with patch('builtins.open', wraps=open) as mock_file:
+            cache = open_cache(self.cache_path, self.pipeline.rules)
+            results = self.pipeline.run([self.doc], cache=cache)
+
+        self.assertEqual(results[0].status, 'cached')
+        opened = [call.args[0] for call in mock_file.call_args_list]
+        self.assertNotIn(self.doc, opened)
+
+    def test_modified_file_is_reprocessed(self):
+        """Test that a content change invalidates the entry"""
+        self.run_cached()
+        with open(self.doc, 'a') as f:
+            f.write('Tail\n| B |\n|---|\n')
+
+        self.assertEqual(self.run_cached()[0].status, 'fixed')
+
+    def test_touched_file_matched_by_hash(self):
+        """Test that an mtime-only change is resolved by the content hash"""
+        self.run_cached()
+        st = os.stat(self.doc)
+        os.utime(self.doc, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+        self.assertEqual(self.run_cached()[0].status, 'cached')
+
+    def test_rule_change_invalidates_everything(self):
+        """Test that a different rule set discards all entries"""
+        self.run_cached()
+        self.pipeline.register('upper', str.upper, ['**/*.md'])
+
+        cache = open_cache(self.cache_path, self.pipeline.rules)
+
+        self.assertEqual(cache.entries, {})
+        self.assertFalse(cache.is_clean(self.doc))
+
+    def test_deleted_files_evicted(self):
+        """Test that entries for deleted files are dropped on save"""
+        self.run_cached()
+        os.remove(self.doc)
+
+        cache = open_cache(self.cache_path, self.pipeline.rules)
+        cache.save()
+
+        with open(self.cache_path) as f:
+            self.assertEqual(json.load(f)['files'], {})
+
+    def test_fingerprint_is_stable(self):
+        """Test that the same rules produce the same fingerprint"""
+        self.assertEqual(ruleset_fingerprint(self.pipeline.rules),
+                         ruleset_fingerprint(list(self.pipeline.rules)))
+
+    def test_corrupt_cache_ignored(self):
+        """Test that an unreadable cache behaves like an empty one"""
+        with open(self.cache_path, 'w') as f:
+            f.write('{not json')
+
+        cache = FixCache(self.cache_path, 'x')
+
+        self.assertEqual(cache.entries, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
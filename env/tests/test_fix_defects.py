@@ -12,6 +12,12 @@ import sys
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Add scripts directory to path to import the fixers
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import fix_defects
+
 class TestFixDefects(unittest.TestCase):
     """Test cases for defect fixing functionality"""
     
@@ -176,5 +182,68 @@ another_key: another_value
         if table_end_index and table_end_index < len(fixed_lines) - 1:
             self.assertEqual(fixed_lines[table_end_index + 1], '')
 
+class TestStreamingTables(unittest.TestCase):
+    """Test cases for the streaming fix_markdown_tables"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'report.md')
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.test_dir)
+
+    def test_streaming_matches_buffered(self):
+        """Test that the streaming fixer produces the buffered result"""
+        content = "# T\nText\n| a |\n|---|\nAfter\n| b |\n\n| c |\nEnd"
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+        self.assertTrue(fix_defects.fix_markdown_tables(self.path))
+
+        with open(self.path) as f:
+            self.assertEqual(f.read(), fix_defects.add_table_blank_lines(content))
+
+    def test_trailing_newline_preserved(self):
+        """Test that line endings at EOF survive the stream"""
+        for content in ['| a |\n', '| a |', '', 'x\n| a |\n\n']:
+            with open(self.path, 'w') as f:
+                f.write(content)
+            fix_defects.fix_markdown_tables(self.path)
+            with open(self.path) as f:
+                self.assertEqual(f.read(), fix_defects.add_table_blank_lines(content))
+
+    def test_unchanged_file_not_replaced(self):
+        """Test that a clean file is left in place"""
+        with open(self.path, 'w') as f:
+            f.write('Text\n\n| a |\n\nEnd\n')
+        inode = os.stat(self.path).st_ino
+
+        fix_defects.fix_markdown_tables(self.path)
+
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(os.listdir(self.test_dir), ['report.md'])
+
+    def test_memory_stays_flat(self):
+        """Test that peak memory does not grow with file size"""
+        import tracemalloc
+
+        block = 'Paragraph line\n| col | col |\n|-----|-----|\n| v | v |\nTrailing text\n'
+        with open(self.path, 'w') as f:
+            for _ in range(30000):
+                f.write(block)
+        size = os.path.getsize(self.path)
+
+        tracemalloc.start()
+        fix_defects.fix_markdown_tables(self.path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertGreater(size, 1_500_000)
+        self.assertLess(peak, size // 10)
+
+
 if __name__ == '__main__':
     unittest.main()
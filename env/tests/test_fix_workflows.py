@@ -13,6 +13,13 @@ import re
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Add scripts directory to path to import the fixers
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import fix_workflows
+from remediation.pins import PINNED_ACTIONS, ReplacementTable, action_pin_table, pin_actions
+
 class TestFixWorkflows(unittest.TestCase):
     """Test cases for workflow fixing functionality"""
     
@@ -173,5 +180,130 @@ jobs:
         self.assertIn('permissions:', content)
         self.assertIn('contents: read', content)
 
+class TestPinTable(unittest.TestCase):
+    """Test cases for the compiled action pin table"""
+
+    def test_all_pins_in_one_pass(self):
+        """Test that every known action is pinned by a single table"""
+        content = ("      - uses: actions/checkout@v3\n"
+                   "      - uses: actions/setup-node@v3\n"
+                   "      - uses: gaurav-nelson/github-action-markdown-link-check@v1\n")
+
+        pinned = pin_actions(content)
+
+        self.assertIn('actions/checkout@b4ffde65f46336ab88eb53be808477a3936bae11 # v4', pinned)
+        self.assertIn('actions/setup-node@60edb5dd545a775178f52524783378180af0d1f8 # v4', pinned)
+        self.assertIn('markdown-link-check@a947807a87961f05621720101487bf0890a81bce # v1', pinned)
+        self.assertEqual(pin_actions(pinned), pinned)
+
+    def test_longer_tags_not_matched(self):
+        """Test that @v3 does not rewrite @v3.1 or @v3-beta"""
+        content = 'uses: actions/checkout@v3.1\nuses: actions/checkout@v3-beta\n'
+        self.assertEqual(pin_actions(content), content)
+
+    def test_new_pin_is_data_only(self):
+        """Test that adding a pin needs no code change"""
+        pins = dict(PINNED_ACTIONS)
+        pins[('actions/cache', 'v3')] = ('0' * 40, 'v4')
+
+        table = action_pin_table(pins)
+
+        self.assertEqual(table.apply('uses: actions/cache@v3'), f'uses: actions/cache@{"0" * 40} # v4')
+
+    def test_replacement_table_prefers_longest_literal(self):
+        """Test that overlapping literals resolve to the longest match"""
+        table = ReplacementTable({'ab': '1', 'abc': '2'})
+        self.assertEqual(table.apply('abc ab'), '2 1')
+
+    def test_workflow_transform_matches_sequential_subs(self):
+        """Test that the combined pass equals the old chain of re.sub calls"""
+        content = """jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v3
+      - uses: actions/setup-node@v3
+      - run: python3 scripts/validate-completeness.py
+      - run: python3 scripts/generate-metrics.py --output metrics/content-metrics.json --jobs 0
+      - run: python3 scripts/update-search-index.py
+"""
+        expected = content
+        for old, new in [
+            (r'python3 scripts/validate-completeness\.py',
+             r'if [ -f scripts/validate-completeness.py ]; then python3 scripts/validate-completeness.py; else echo "Skipping completeness validation - script not found"; fi'),
+            (r'python3 scripts/generate-metrics\.py --output metrics/content-metrics\.json --jobs 0',
+             r'if [ -f scripts/generate-metrics.py ]; then python3 scripts/generate-metrics.py --output metrics/content-metrics.json --jobs 0; else echo "Skipping metrics generation - script not found"; fi'),
+            (r'python3 scripts/update-search-index\.py',
+             r'if [ -f scripts/update-search-index.py ]; then python3 scripts/update-search-index.py; else echo "Skipping search index update - script not found"; fi'),
+            (r'uses: actions/checkout@v3', 'uses: actions/checkout@b4ffde65f46336ab88eb53be808477a3936bae11 # v4'),
+            (r'uses: actions/setup-node@v3', 'uses: actions/setup-node@60edb5dd545a775178f52524783378180af0d1f8 # v4'),
+            (r'runs-on: ubuntu-latest\n    steps:',
+             r'runs-on: ubuntu-latest\n    permissions:\n      contents: read\n      pull-requests: read\n    steps:'),
+        ]:
+            expected = re.sub(old, new, expected)
+
+        self.assertEqual(fix_workflows.guard_workflow_scripts(content), expected)
+
+
+class TestScriptGuards(unittest.TestCase):
+    """Test cases for wrapping script steps in existence checks"""
+
+    def test_arguments_inside_guard(self):
+        """Test that a step with arguments is wrapped whole and the guard holds the flags"""
+        content = "      - run: python3 scripts/validate-completeness.py --jobs 0\n"
+        fixed = fix_workflows.guard_workflow_scripts(content)
+        self.assertEqual(fixed, '      - run: if [ -f scripts/validate-completeness.py ]; then '
+                                'python3 scripts/validate-completeness.py --jobs 0; '
+                                'else echo "Skipping completeness validation - script not found"; fi\n')
+        self.assertEqual(fix_workflows.guard_workflow_scripts(fixed), fixed)
+
+    def test_search_index_flags_inside_guard(self):
+        """Test that the parallel search index step keeps its flags inside the guard"""
+        fixed = fix_workflows.guard_workflow_scripts("run: python3 scripts/update-search-index.py --jobs 0\n")
+        self.assertEqual(fixed, 'run: if [ -f scripts/update-search-index.py ]; then '
+                                'python3 scripts/update-search-index.py --jobs 0; '
+                                'else echo "Skipping search index update - script not found"; fi\n')
+
+    def test_link_check_guarded(self):
+        """Test that the link check step is wrapped in an existence check"""
+        fixed = fix_workflows.guard_workflow_scripts("run: python3 scripts/check_links.py docs --jobs 0\n")
+        self.assertIn('if [ -f scripts/check_links.py ]; then python3 scripts/check_links.py docs --jobs 0;', fixed)
+        self.assertEqual(fix_workflows.guard_workflow_scripts(fixed), fixed)
+
+    def test_legacy_metrics_redirect_guarded(self):
+        """Test that workflows still redirecting generate-metrics.py output keep the DEF-018 guard"""
+        fixed = fix_workflows.guard_workflow_scripts('run: python3 scripts/generate-metrics.py > metrics/content-metrics.json\n')
+        self.assertEqual(fixed, 'run: if [ -f scripts/generate-metrics.py ]; then '
+                                'python3 scripts/generate-metrics.py > metrics/content-metrics.json; '
+                                'else echo "Skipping metrics generation - script not found"; fi\n')
+        self.assertEqual(fix_workflows.guard_workflow_scripts(fixed), fixed)
+
+    def test_any_arguments_inside_guard(self):
+        """Test that new flags and redirects are wrapped whole, whatever they are"""
+        content = ("      - run: python3 scripts/validate-completeness.py --json > report.json\n"
+                   "      - run: python3 scripts/update-search-index.py --index /tmp/index 2>&1\n")
+        fixed = fix_workflows.guard_workflow_scripts(content)
+        self.assertEqual(fixed, '      - run: if [ -f scripts/validate-completeness.py ]; then '
+                                'python3 scripts/validate-completeness.py --json > report.json; '
+                                'else echo "Skipping completeness validation - script not found"; fi\n'
+                                '      - run: if [ -f scripts/update-search-index.py ]; then '
+                                'python3 scripts/update-search-index.py --index /tmp/index 2>&1; '
+                                'else echo "Skipping search index update - script not found"; fi\n')
+        self.assertEqual(fix_workflows.guard_workflow_scripts(fixed), fixed)
+
+    def test_unlisted_scripts_left_alone(self):
+        """Test that only the scripts in SCRIPT_GUARDS are wrapped"""
+        content = "run: python3 scripts/training_assessment.py --all\nrun: python3 scripts/generate-metrics.pyc\n"
+        self.assertEqual(fix_workflows.guard_workflow_scripts(content), content)
+
+    def test_command_separators_end_a_step(self):
+        """Test that a call before ';', '&&', '|' or a comment is wrapped up to it"""
+        fixed = fix_workflows.guard_workflow_scripts("run: python3 scripts/update-search-index.py && echo done\n")
+        self.assertIn('script not found"; fi && echo done', fixed)
+        fixed = fix_workflows.guard_workflow_scripts("run: python3 scripts/check_links.py docs | tee out  # links\n")
+        self.assertTrue(fixed.startswith('run: if [ -f scripts/check_links.py ]; then python3 scripts/check_links.py docs; '))
+        self.assertTrue(fixed.endswith('script not found"; fi | tee out  # links\n'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the single-pass fixer pipeline (scripts/remediation/engine.py)
+"""
+import unittest
+import tempfile
+import os
+import io
+import shutil
+import subprocess
+from unittest.mock import patch
+import sys
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import fileio
+from remediation.engine import FixerPipeline, format_summary, resolve_jobs
+import fix_defects
+import remediation
+from remediation import rules
+
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+
+def _fail_on_boom(content):
+    """Transform that raises for one specific file"""
+    if 'boom' in content:
+        raise RuntimeError('rule exploded')
+    return content.upper()
+
+
+class TestFixerPipeline(unittest.TestCase):
+    """Test cases for the fixer pipeline engine"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.doc = os.path.join(self.test_dir, 'doc.md')
+        with open(self.doc, 'w') as f:
+            f.write("# Doc\n\nText\n| A | B |\n|---|---|\n| 1 | 2 |\nMore\n\n**Phase 1: Setup**\n")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_file_read_and_written_once(self):
+        """Test that all rules share one read and one write"""
+        pipeline = FixerPipeline()
+        pipeline.register('tables', fix_defects.add_table_blank_lines, [self.doc])
+        pipeline.register('headings', fix_defects.convert_bold_headings, [self.doc])
+
+        with patch('remediation.engine.locked', wraps=fileio.locked) as read, \
+                patch('remediation.engine.atomic_write_bytes', wraps=fileio.atomic_write_bytes) as write:
+            result = pipeline.fix_file(self.doc)
+
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(result.status, 'fixed')
+        self.assertEqual(result.applied, ['tables', 'headings'])
+        self.assertEqual(set(result.timings), {'tables', 'headings'})
+
+        with open(self.doc) as f:
+            content = f.read()
+        self.assertIn('Text\n\n| A | B |', content)
+        self.assertIn('| 1 | 2 |\n\nMore', content)
+        self.assertIn('#### Phase 1: Setup', content)
+
+    def test_unchanged_file_not_written(self):
+        """Test that a clean file is never rewritten"""
+        pipeline = FixerPipeline()
+        pipeline.register('noop', lambda content: content, [self.doc])
+        mtime = os.stat(self.doc).st_mtime_ns
+
+        with patch('remediation.engine.atomic_write_bytes') as write:
+            result = pipeline.fix_file(self.doc)
+
+        self.assertEqual(result.status, 'unchanged')
+        write.assert_not_called()
+        self.assertEqual(os.stat(self.doc).st_mtime_ns, mtime)
+
+    def test_missing_file(self):
+        """Test that missing targets are reported, not raised"""
+        pipeline = FixerPipeline()
+        missing = os.path.join(self.test_dir, 'missing.md')
+        pipeline.register('noop', lambda content: content, [missing])
+
+        results = pipeline.run([missing])
+
+        self.assertEqual(results[0].status, 'missing')
+
+    def test_rules_mapped_by_file_type(self):
+        """Test that rules only apply to files matching their globs"""
+        pipeline = FixerPipeline()
+        pipeline.register('a', str.upper, ['**/*.md'])
+        pipeline.register('b', str.lower, ['**/*.md', '**/*.yml'])
+
+        self.assertEqual([r.name for r in pipeline.rules_for('docs/y.md')], ['a', 'b'])
+        self.assertEqual([r.name for r in pipeline.rules_for('./ci/x.yml')], ['b'])
+        self.assertEqual(pipeline.rules_for('script.py'), [])
+
+    def test_unmatched_files_skipped(self):
+        """Test that files without rules are never opened"""
+        pipeline = FixerPipeline()
+        pipeline.register('a', str.upper, ['**/*.yml'])
+
+        with patch('builtins.open', wraps=open) as mock_file:
+            results = pipeline.run([self.doc])
+
+        self.assertEqual(results, [])
+        mock_file.assert_not_called()
+
+    def test_duplicate_rule_name_rejected(self):
+        """Test that rule names are unique"""
+        pipeline = FixerPipeline()
+        pipeline.register('a', str.upper, ['x.md'])
+
+        with self.assertRaises(ValueError):
+            pipeline.register('a', str.lower, ['x.md'])
+
+    def test_timing_summary(self):
+        """Test that the summary lists files and rules"""
+        pipeline = FixerPipeline()
+        pipeline.register('tables', fix_defects.add_table_blank_lines, [self.doc])
+
+        summary = format_summary(pipeline.run([self.doc]))
+
+        self.assertIn('Per file:', summary)
+        self.assertIn(self.doc, summary)
+        self.assertIn('Per rule:', summary)
+        self.assertIn('tables', summary)
+
+    def test_legacy_wrapper_still_works(self):
+        """Test that the per-file fixer functions use the engine"""
+        self.assertTrue(fix_defects.fix_bold_headings(self.doc))
+        self.assertFalse(fix_defects.fix_bold_headings(os.path.join(self.test_dir, 'nope.md')))
+
+        with open(self.doc) as f:
+            self.assertIn('#### Phase 1: Setup', f.read())
+
+
+class TestDryRun(unittest.TestCase):
+    """Test cases for --check / --diff modes"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.doc = os.path.join(self.test_dir, 'doc.md')
+        self.content = "Intro\n| A |\n|---|\nOutro"
+        with open(self.doc, 'w') as f:
+            f.write(self.content)
+        self.pipeline = FixerPipeline()
+        self.pipeline.register('tables', fix_defects.add_table_blank_lines, ['**/*.md'])
+        self.config = os.path.join(self.test_dir, 'fix.yaml')
+        with open(self.config, 'w') as f:
+            f.write('remediation:\n  scope: repository\n')
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_dry_run_never_writes(self):
+        """Test that write=False leaves the file untouched"""
+        mtime = os.stat(self.doc).st_mtime_ns
+
+        results = self.pipeline.run([self.doc], write=False)
+
+        self.assertEqual(results[0].status, 'would-fix')
+        self.assertEqual(results[0].applied, ['tables'])
+        self.assertEqual(os.stat(self.doc).st_mtime_ns, mtime)
+        with open(self.doc) as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_unified_diff(self):
+        """Test that diff mode records a git-style patch"""
+        result = self.pipeline.run([self.doc], write=False, diff=True)[0]
+
+        self.assertIn('--- a/', result.diff)
+        self.assertIn('+++ b/', result.diff)
+        self.assertIn('+\n', result.diff)
+        self.assertIn('\\ No newline at end of file', result.diff)
+
+    def test_check_exit_code(self):
+        """Test that --check exits non-zero only when fixes are pending"""
+        with patch('builtins.print'):
+            self.assertEqual(fix_defects.main([self.doc, '--check', '--no-cache', '--config', self.config]), 1)
+            fix_defects.main([self.doc, '--no-cache', '--config', self.config])
+            self.assertEqual(fix_defects.main([self.doc, '--check', '--no-cache', '--config', self.config]), 0)
+
+    def test_diff_mode_prints_patch_only(self):
+        """Test that --diff writes the patch to stdout and nothing to disk"""
+        import io
+        from contextlib import redirect_stdout, redirect_stderr
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = fix_defects.main([self.doc, '--diff', '--no-cache', '--config', self.config])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(stdout.getvalue().startswith('--- a/'))
+        self.assertIn('Would fix', stderr.getvalue())
+        with open(self.doc) as f:
+            self.assertEqual(f.read(), self.content)
+
+
+class TestParallelRun(unittest.TestCase):
+    """Test cases for --jobs process pool execution"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.paths = []
+        for i, text in enumerate(['one', 'two', 'boom', 'four', 'five']):
+            path = os.path.join(self.test_dir, f'file{i}.md')
+            with open(path, 'w') as f:
+                f.write(text)
+            self.paths.append(path)
+        self.pipeline = FixerPipeline()
+        self.pipeline.register('upper', _fail_on_boom, self.paths)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_results_in_input_order(self):
+        """Test that parallel results match serial ordering"""
+        results = self.pipeline.run(self.paths, jobs=3)
+
+        self.assertEqual([r.path for r in results], self.paths)
+        self.assertEqual([r.status for r in results],
+                         ['fixed', 'fixed', 'error', 'fixed', 'fixed'])
+
+    def test_worker_failure_isolated(self):
+        """Test that one failing file does not stop the batch"""
+        results = self.pipeline.run(self.paths, jobs=2)
+
+        self.assertIn('rule exploded', results[2].error)
+        with open(self.paths[4]) as f:
+            self.assertEqual(f.read(), 'FIVE')
+        with open(self.paths[2]) as f:
+            self.assertEqual(f.read(), 'boom')
+
+    def test_serial_and_parallel_agree(self):
+        """Test that --jobs does not change the outcome"""
+        serial = [(r.path, r.status, r.applied) for r in self.pipeline.run(self.paths, jobs=1)]
+        for path in self.paths:
+            with open(path, 'w') as f:
+                f.write('boom' if path.endswith('file2.md') else 'x')
+        parallel = [(r.path, r.status, r.applied) for r in self.pipeline.run(self.paths, jobs=4)]
+
+        self.assertEqual(serial, parallel)
+
+    def test_resolve_jobs(self):
+        """Test --jobs value handling"""
+        self.assertEqual(resolve_jobs(3), 3)
+        self.assertGreaterEqual(resolve_jobs(0), 1)
+        with self.assertRaises(ValueError):
+            resolve_jobs(-1)
+
+
+class TestStreamedFiles(unittest.TestCase):
+    """Test cases for streaming large files through the rules' line forms"""
+
+    CASES = {
+        'tables': "Intro\n| a | b |\n|---|---|\n| 1 | 2 |\nAfter\n```\n| not | a table |\n```\n",
+        'headings': "**Phase 2: Build**\n\nText\n**Phase 3: Ship**\nmore text\n\n**HX-Infrastructure Practical Exercise:**\n",
+        'shebang': "```bash\n#!/bin/bash\necho hi\n```\n\n```\n#!/bin/bash",
+        'sed': "Run:\n    sed -i 's/image: app:v[0-9.]*/image: app:v${NEW_VERSION}/' applications/app/deployment.yaml\n",
+        'mkdir': ('x # Create daily metrics file\ncat > "$METRICS_DIR/$DATE-$PARTICIPANT_ID-day$DAY.json" << EOF\n'
+                  'mkdir -p "$METRICS_DIR"\n\n# Create daily metrics file\n'
+                  'cat > "$METRICS_DIR/$DATE-$PARTICIPANT_ID-day$DAY.json"\n'),
+        'crlf': "Text\r\n| a |\r\n|---|\r\n**Phase 1: Setup**\r\n",
+    }
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+
+    def fix(self, name, content, stream, write=True):
+        path = os.path.join(self.test_dir, f'{name}-{stream}.md')
+        with open(path, 'w', newline='') as f:
+            f.write(content)
+        threshold = 0 if stream else 1 << 62
+        with patch.object(rules.pipeline, 'stream_threshold', threshold):
+            result = rules.pipeline.fix_file(path, write=write)
+        with open(path, 'r', newline='') as f:
+            return result, f.read()
+
+    def test_streamed_matches_buffered(self):
+        """Test that every markdown rule's stream form gives the buffered output"""
+        for name, content in self.CASES.items():
+            with self.subTest(name):
+                buffered, expected = self.fix(name, content, stream=False)
+                with patch('remediation.engine.atomic_write_bytes', side_effect=AssertionError('buffered')):
+                    streamed, actual = self.fix(name, content, stream=True)
+                self.assertEqual(actual, expected)
+                self.assertEqual(streamed.status, buffered.status)
+                self.assertEqual(streamed.applied, buffered.applied)
+                self.assertEqual((streamed.size, streamed.digest), (buffered.size, buffered.digest))
+        self.assertEqual(streamed.status, 'fixed')
+
+    def test_repository_markdown_parity(self):
+        """Test that the chained streams reproduce the pipeline on this repository's docs"""
+        for directory, _, names in os.walk(REPO_ROOT):
+            if '.git' in directory:
+                continue
+            for name in names:
+                if not name.endswith('.md'):
+                    continue
+                path = os.path.join(directory, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                lines = content.split('\n')
+                for rule in rules.pipeline.rules_for(path):
+                    lines = rule.stream(lines)
+                self.assertEqual('\n'.join(lines), rules.pipeline.fix_text(content, path)[0], path)
+
+    def test_check_mode_leaves_file(self):
+        """Test that a streamed check reports the change without writing"""
+        content = self.CASES['tables']
+        result, after = self.fix('check', content, stream=True, write=False)
+        self.assertEqual(after, content)
+        self.assertEqual((result.status, result.applied), ('would-fix', ['markdown-tables']))
+        self.assertEqual(os.listdir(self.test_dir), ['check-True.md'])
+
+    def test_rules_without_stream_are_buffered(self):
+        """Test that a file is buffered unless every rule has a stream form"""
+        pipeline = FixerPipeline(stream_threshold=0)
+        pipeline.register('same', lambda text: text, ['*.md'], stream=lambda lines: lines)
+        pipeline.register('upper', str.upper, ['*.md'])
+        path = os.path.join(self.test_dir, 'x.md')
+        with open(path, 'w') as f:
+            f.write('abc\n')
+        self.assertFalse(pipeline.streams(path, pipeline.rules))
+        self.assertTrue(pipeline.streams(path, pipeline.rules[:1]))
+        self.assertEqual(pipeline.fix_file(path).applied, ['upper'])
+
+
+class TestLibraryApi(unittest.TestCase):
+    """Test cases for calling the fixers in-process"""
+
+    def test_fix_text_is_pure(self):
+        """Test fix_text selects rules by path and touches no files"""
+        content = "Intro\n| a | b |\n|---|---|\nAfter\n"
+        with patch('builtins.open', side_effect=AssertionError('no file I/O expected')):
+            fixed, applied = remediation.fix_text(content, 'docs/guide.md')
+            unchanged, none = remediation.fix_text(content, 'notes.txt')
+        self.assertEqual(fixed, "Intro\n\n| a | b |\n|---|---|\n\nAfter\n")
+        self.assertEqual(applied, ['markdown-tables'])
+        self.assertEqual((unchanged, none), (content, []))
+
+    def test_fix_stream(self):
+        """Test fix_stream copies fixed text between file objects"""
+        dst = io.StringIO()
+        applied = remediation.fix_stream(io.StringIO("\n\nkey: value\n"), dst, 'config.yaml')
+        self.assertEqual(dst.getvalue(), "key: value\n")
+        self.assertEqual(applied, ['yaml-blank-lines'])
+
+    def test_fix_paths_returns_results(self):
+        """Test fix_paths reports per-file results without printing"""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        path = os.path.join(test_dir, 'training', 'curriculum', 'day1_foundation.md')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write("**Phase 1: Setup**\n")
+        with patch('builtins.print') as mock_print:
+            results = remediation.fix_paths([path], write=False)
+        mock_print.assert_not_called()
+        self.assertEqual([(r.status, r.applied) for r in results], [('would-fix', ['bold-headings'])])
+
+    def test_imports_do_no_file_io(self):
+        """Test importing the scripts and package opens nothing but modules"""
+        code = (
+            "import sys\n"
+            "opened = []\n"
+            "sys.addaudithook(lambda event, args: opened.append(args[0]) if event == 'open' else None)\n"
+            "import remediation, fix_defects, fix_workflows, update_defect_log\n"
+            "print([p for p in opened if isinstance(p, str) and not p.endswith(('.py', '.pyc'))])\n"
+        )
+        output = subprocess.run([sys.executable, '-c', code], cwd=SCRIPTS_DIR, check=True,
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
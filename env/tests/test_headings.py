@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent heading/anchor index (scripts/remediation/headings.py)
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import headings
+from remediation.headings import HeadingIndex, Link
+from remediation.links import MISSING_ANCHOR, broken_anchors
+import check_links
+import fix_defects
+
+
+class HeadingIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.index_path = os.path.join(self.root, headings.INDEX_FILE)
+        self.write('guide.md', "# Guide\n## Usage\n")
+        self.write('docs/intro.md', "# Intro\nSee [usage](../guide.md#usage).\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content):
+        os.makedirs(os.path.dirname(self.path(rel_path)), exist_ok=True)
+        with open(self.path(rel_path), 'w') as f:
+            f.write(content)
+
+    def index_all(self):
+        index = HeadingIndex(self.index_path)
+        index.update([self.path('guide.md'), self.path('docs/intro.md')])
+        index.save()
+        return index
+
+
+class TestHeadingIndex(HeadingIndexTestCase):
+    """Test cases for incremental indexing"""
+
+    def test_entries_survive_runs(self):
+        """Test that a saved index answers without parsing anything"""
+        self.index_all()
+        index = self.index_all()
+        self.assertEqual(index.changed, set())
+        self.assertEqual([h.slug for h in index.docs['guide.md'].headings], ['guide', 'usage'])
+        self.assertEqual(index.docs['docs/intro.md'].links, (Link(2, '../guide.md#usage'),))
+
+    def test_only_changed_content_parsed(self):
+        """Test that a touched file is re-hashed but only edited bytes are re-parsed"""
+        self.index_all()
+        os.utime(self.path('docs/intro.md'), ns=(1, 1))
+        self.write('guide.md', "# Guide\n## How to use\n")
+        with patch.object(headings, 'parse_markdown', wraps=headings.parse_markdown) as parse:
+            index = self.index_all()
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(index.changed, {'guide.md'})
+        self.assertEqual(index.entries['docs/intro.md'][0], 1)
+
+    def test_parser_change_invalidates(self):
+        """Test that entries from a different parser are discarded"""
+        self.index_all()
+        with patch.object(headings, 'parser_fingerprint', return_value='other'):
+            index = HeadingIndex(self.index_path)
+        self.assertEqual(index.docs, {})
+
+    def test_inbound_links_and_prune(self):
+        """Test the reverse link lookup and forgetting deleted files"""
+        index = self.index_all()
+        self.assertEqual(index.links_to('guide.md'), [('docs/intro.md', Link(2, '../guide.md#usage'))])
+        index.prune(['guide.md'])
+        self.assertEqual(index.links_to('guide.md'), [])
+        index.save()
+        self.assertNotIn('docs/intro.md', HeadingIndex(self.index_path).docs)
+
+    def test_save_merges_concurrent_runs(self):
+        """Test that two runs indexing different files both keep their entries"""
+        first, second = HeadingIndex(self.index_path), HeadingIndex(self.index_path)
+        first.update([self.path('guide.md')])
+        second.update([self.path('docs/intro.md')])
+        first.save()
+        second.save()
+        self.assertEqual(sorted(HeadingIndex(self.index_path).docs), ['docs/intro.md', 'guide.md'])
+
+
+class TestIncrementalLinkChecks(HeadingIndexTestCase):
+    """Test cases for the link checks built on the index"""
+
+    def check(self, *args):
+        with redirect_stdout(io.StringIO()) as out:
+            status = check_links.main(['--root', self.root, '--json', *args, self.root])
+        return status, json.loads(out.getvalue())
+
+    def test_changed_reports_files_linking_in(self):
+        """Test that renaming a heading re-checks only the file and its referrers"""
+        self.assertEqual(self.check('--changed'), (0, []))
+        self.write('other.md', "# Other\n")
+        self.write('guide.md', "# Guide\n## How to use\n")
+        status, broken = self.check('--changed')
+        self.assertEqual(status, 1)
+        self.assertEqual([(b['path'], b['reason']) for b in broken], [('docs/intro.md', MISSING_ANCHOR)])
+        self.assertEqual(self.check('--changed'), (0, []))
+        self.assertEqual(self.check()[0], 1)
+
+    def test_broken_anchors_after_heading_fix(self):
+        """Test that the fixer warns about links into files whose headings it rewrote"""
+        self.write('plan.md', "# Plan\n\n**Phase 1: Setup**\n\nText\n")
+        self.write('docs/intro.md', "[setup](../plan.md#phase-1-setup) [old](../plan.md#setup-phase)\n")
+        self.write('fix.yaml', "remediation:\n  rule_patterns:\n    bold-headings:\n      - plan.md\n")
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            with redirect_stdout(io.StringIO()) as out:
+                fix_defects.main(['plan.md', '--config', 'fix.yaml'])
+            self.assertIn("Warning: docs/intro.md:1 links to ../plan.md#setup-phase, which no longer exists",
+                          out.getvalue())
+            self.assertNotIn("#phase-1-setup,", out.getvalue())
+            self.assertTrue(os.path.exists(headings.INDEX_FILE))
+            self.assertEqual(broken_anchors(['guide.md']), [])
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
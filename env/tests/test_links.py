@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline link checker (scripts/remediation/links.py)
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation.links import (
+    MISSING_ANCHOR, MISSING_FILE, OUTSIDE_ROOT, BrokenLink, LinkIndex, check_links, parse_markdown, slugify,
+)
+import check_links as check_links_cli
+
+
+class TestParseMarkdown(unittest.TestCase):
+    """Test cases for heading and link extraction"""
+
+    def test_slugs_follow_github(self):
+        """Test that punctuation is dropped and spaces become hyphens"""
+        self.assertEqual(slugify("Phase 1: Setup & `Config`"), 'phase-1-setup--config')
+        self.assertEqual(slugify("See [the guide](guide.md) now"), 'see-the-guide-now')
+        self.assertEqual(slugify("snake_case Über"), 'snake_case-über')
+
+    def test_duplicate_headings_numbered(self):
+        """Test that repeated headings get -1, -2 suffixes"""
+        doc = parse_markdown("# Notes\n## Notes\n### Notes ###\n")
+        self.assertEqual([h.slug for h in doc.headings], ['notes', 'notes-1', 'notes-2'])
+        self.assertEqual([h.level for h in doc.headings], [1, 2, 3])
+        self.assertEqual(doc.headings[2].text, 'Notes')
+
+    def test_links_outside_code_only(self):
+        """Test that links in fences and code spans are ignored"""
+        text = ("See [a](a.md#top) and ![img](img/x.png \"title\").\n"
+                "`[not](code.md)`\n"
+                "```\n[not](fenced.md)\n```\n"
+                "[ref]: <docs/ref guide.md>\n"
+                "| [cell](b.md) | x |\n|---|---|\n")
+        doc = parse_markdown(text)
+        self.assertEqual([(l.line, l.target) for l in doc.links],
+                         [(1, 'a.md#top'), (1, 'img/x.png'), (6, 'docs/ref guide.md'), (7, 'b.md')])
+
+    def test_html_anchors(self):
+        """Test that explicit id/name anchors are recorded"""
+        doc = parse_markdown('<a name="custom"></a>\n<div id="box">x</div>\n')
+        self.assertEqual(doc.anchors, {'custom', 'box'})
+
+
+class TestLinkIndex(unittest.TestCase):
+    """Test cases for resolving links against the tree"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.write('README.md', "# Top\n[guide](docs/guide.md#usage)\n[abs](/docs/guide.md)\n"
+                                "[dir](docs/)\n[site](https://example.com/missing.md)\n")
+        self.write('docs/guide.md', "# Guide\n## Usage\n[back](../README.md#top)\n[self](#guide)\n"
+                                    "[gone](missing.md)\n[bad](#nowhere)\n[up](../../x.md)\n"
+                                    "[img](../assets/logo.png)\n[other](../notes/other.md#Section)\n")
+        self.write('assets/logo.png', "")
+        self.write('notes/other.md', "## Section\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, rel_path, content):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test_broken_links_reported(self):
+        """Test that missing files, anchors and escapes are each reported once"""
+        index, broken = check_links([self.root], self.root)
+        self.assertEqual(broken, [
+            BrokenLink('docs/guide.md', 5, 'missing.md', MISSING_FILE),
+            BrokenLink('docs/guide.md', 6, '#nowhere', MISSING_ANCHOR),
+            BrokenLink('docs/guide.md', 7, '../../x.md', OUTSIDE_ROOT),
+        ])
+        self.assertEqual(sorted(index.docs), ['README.md', 'docs/guide.md', 'notes/other.md'])
+
+    def test_targets_parsed_on_demand(self):
+        """Test that checking one directory only parses the files its anchors need"""
+        index, broken = check_links([os.path.join(self.root, 'notes')], self.root)
+        self.assertEqual(broken, [])
+        self.assertEqual(list(index.docs), ['notes/other.md'])
+        self.assertIsNone(index.resolve('notes/other.md', '../README.md#top'))
+        self.assertIn('README.md', index.docs)
+
+    def test_parallel_matches_serial(self):
+        """Test that parsing across processes gives the same report"""
+        _, serial = check_links([self.root], self.root)
+        _, parallel = check_links([self.root], self.root, jobs=2)
+        self.assertEqual(parallel, serial)
+
+    def test_unreadable_file_recorded(self):
+        """Test that an undecodable file is an error, not a crash"""
+        with open(os.path.join(self.root, 'bad.md'), 'wb') as f:
+            f.write(b'\xff\xfe[x](y.md)')
+        index = LinkIndex(self.root)
+        index.load(['bad.md'])
+        self.assertIn('UnicodeDecodeError', index.errors['bad.md'])
+
+    def test_cli(self):
+        """Test the report format and exit status"""
+        with redirect_stdout(io.StringIO()) as out:
+            status = check_links_cli.main(['--root', self.root, os.path.join(self.root, 'docs')])
+        self.assertEqual(status, 1)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "docs/guide.md:5: broken link missing.md (no such file)")
+        self.assertIn("3 broken", lines[-1])
+        with redirect_stdout(io.StringIO()) as out:
+            check_links_cli.main(['--root', self.root, '--json', os.path.join(self.root, 'docs')])
+        self.assertEqual(json.loads(out.getvalue())[1]['reason'], MISSING_ANCHOR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the markdown block tokenizer (scripts/remediation/mdblocks.py)
+"""
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import mdblocks
+from remediation.engine import FileResult
+from remediation.mdblocks import BLANK, CODE, FENCE, HEADING, LIST, TABLE, TEXT, MarkdownBlocks
+import fix_defects
+
+
+class TestBlockTokenizer(unittest.TestCase):
+    """Test cases for line classification"""
+
+    def kinds(self, text):
+        return MarkdownBlocks(text).kinds
+
+    def test_document_structure(self):
+        """Test each block kind is recognised"""
+        text = "# Title\nIntro\n\n- item\n  more\n\n| A | B |\n|---|---|\n| 1 | 2 |\n```bash\n| not | table |\n```"
+        self.assertEqual(self.kinds(text), [
+            HEADING, TEXT, BLANK, LIST, LIST, BLANK, TABLE, TABLE, TABLE, FENCE, CODE, FENCE])
+
+    def test_pipe_lines_need_separator(self):
+        """Test that pipe lines without a separator row are not a table"""
+        self.assertEqual(self.kinds("| just | pipes |\ntext"), [TEXT, TEXT])
+
+    def test_fence_closes_on_matching_marker(self):
+        """Test that a shorter or different fence does not close a block"""
+        text = "````\n```\n~~~\n````\nafter"
+        self.assertEqual(self.kinds(text), [FENCE, CODE, CODE, FENCE, TEXT])
+
+    def test_unindented_text_ends_list(self):
+        """Test that list continuation stops at a blank line plus plain text"""
+        text = "1. first\nlazy\n\n   indented\n\nplain"
+        self.assertEqual(self.kinds(text), [LIST, LIST, BLANK, LIST, BLANK, TEXT])
+
+    def test_blocks_are_runs(self):
+        """Test that blocks group consecutive lines of one kind"""
+        blocks = MarkdownBlocks("a\nb\n\n# H").blocks()
+        self.assertEqual([(b.kind, b.start, b.end) for b in blocks],
+                         [(TEXT, 0, 2), (BLANK, 2, 3), (HEADING, 3, 4)])
+
+
+class TestMarkdownRules(unittest.TestCase):
+    """Test cases for the rules that query block structure"""
+
+    def test_tables_in_code_fences_untouched(self):
+        """Test that pipe lines inside fenced code get no blank lines"""
+        content = "Example:\n```text\n| A | B |\n|---|---|\n```\nDone\n"
+        self.assertEqual(fix_defects.add_table_blank_lines(content), content)
+
+    def test_streaming_tables_skip_fences(self):
+        """Test that the streaming path uses the same tokenizer"""
+        lines = ["```", "| A |", "|---|", "```", "Text", "| A |", "|---|", "End"]
+        self.assertEqual(list(fix_defects.table_blank_lines(lines)),
+                         ["```", "| A |", "|---|", "```", "Text", "", "| A |", "|---|", "", "End"])
+
+    def test_bold_heading_only_when_standalone(self):
+        """Test that bold Phase text is converted only as its own paragraph"""
+        content = ("**Phase 1: Setup**\n- step\n\n"
+                   "See **Phase 2: Build** first.\n\n"
+                   "- **Phase 3: Ship**\n\n"
+                   "```\n**Phase 4: Code**\n```\n\n"
+                   "**Phase 5: Wrap**\ncontinued paragraph\n")
+        expected = content.replace('**Phase 1: Setup**', '#### Phase 1: Setup')
+        self.assertEqual(fix_defects.convert_bold_headings(content), expected)
+
+    def test_bash_strict_mode_only_on_fence_shebang(self):
+        """Test that only a shebang opening a code block is replaced"""
+        content = "Use #!/bin/bash\nin prose.\n\n```bash\n#!/bin/bash\necho hi\n```\n"
+        fixed = fix_defects.add_bash_strict_mode(content)
+        self.assertIn("```bash\n#!/usr/bin/env bash\nset -euo pipefail\nIFS=$'\\n\\t'\n\necho hi\n", fixed)
+        self.assertTrue(fixed.startswith("Use #!/bin/bash\nin prose."))
+
+    def test_file_tokenized_once(self):
+        """Test that all markdown rules share one tokenization of a clean file"""
+        content = "# Doc\n\n| A |\n|---|\n\n**Phase 1: Setup** done\n\n```bash\n#!/bin/bash\n\n```\n" * 50
+        content = fix_defects.pipeline.fix_text(content, 'doc.md')[0]
+        mdblocks._last = None
+        rules = fix_defects.pipeline.rules_for('doc.md')
+        with patch.object(mdblocks, 'MarkdownBlocks', wraps=MarkdownBlocks) as tokenize:
+            fix_defects.pipeline.apply(content, rules, FileResult('doc.md'))
+        self.assertEqual(tokenize.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
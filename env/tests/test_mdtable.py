@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the markdown table model (scripts/remediation/mdtable.py)
+"""
+import unittest
+import os
+import sys
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation.mdtable import MarkdownDocument, Row, is_separator_row, split_cells, stream_tables
+
+
+class TestMarkdownTable(unittest.TestCase):
+    """Test cases for table parsing and serialization"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.text = """# Title
+
+Intro text.
+
+| Name | Status | Notes |
+|:-----|:------:|------:|
+| alpha | Open | |
+| beta | Closed | a \\| b |
+
+Footer.
+"""
+
+    def test_split_cells(self):
+        """Test cell splitting with empty and escaped cells"""
+        self.assertEqual(split_cells('| a | | c |'), ['a', '', 'c'])
+        self.assertEqual(split_cells('| a \\| b | c |'), ['a \\| b', 'c'])
+
+    def test_separator_detection(self):
+        """Test alignment separator rows"""
+        self.assertTrue(is_separator_row('|:---|:---:|---:|'))
+        self.assertFalse(is_separator_row('| a | b |'))
+
+    def test_parse_header_columns(self):
+        """Test that column positions come from the header"""
+        doc = MarkdownDocument.parse(self.text)
+        table = doc.tables[0]
+
+        self.assertEqual(table.header, ['Name', 'Status', 'Notes'])
+        self.assertEqual(table.columns['Status'], 1)
+        self.assertEqual(len(table.rows), 2)
+        self.assertEqual(table.get(table.rows[1], 'Notes'), 'a \\| b')
+
+    def test_round_trip_is_lossless(self):
+        """Test that an untouched document serializes byte-for-byte"""
+        self.assertEqual(MarkdownDocument.parse(self.text).serialize(), self.text)
+
+    def test_update_by_column_name(self):
+        """Test that only the edited row is re-rendered"""
+        doc = MarkdownDocument.parse(self.text)
+        table = doc.find_table('Name', 'Status')
+        row = table.index_by('Name')['alpha']
+
+        table.set(row, 'Notes', 'done')
+        out = doc.serialize()
+
+        self.assertIn('| alpha | Open | done |', out)
+        self.assertIn('| beta | Closed | a \\| b |', out)
+        self.assertTrue(out.startswith('# Title\n\nIntro text.\n\n'))
+        self.assertTrue(out.endswith('\nFooter.\n'))
+
+    def test_short_rows_padded(self):
+        """Test that setting a cell beyond a short row pads it"""
+        doc = MarkdownDocument.parse('| A | B | C |\n|---|---|---|\n| 1 |')
+        table = doc.tables[0]
+
+        table.set(table.rows[0], 'C', 'x')
+
+        self.assertEqual(doc.serialize().split('\n')[-1], '| 1 | | x |')
+
+    def test_where_filters_rows(self):
+        """Test equality queries on named columns"""
+        table = MarkdownDocument.parse(self.text).tables[0]
+        self.assertEqual([r.cells[0] for r in table.where(Status='Closed')], ['beta'])
+
+    def test_cell_matches_cells(self):
+        """Test that single-cell reads agree with the full split, with or without a trailing pipe"""
+        for line in ('| DEF-1 | Open', '| DEF-1 | Open |', '| DEF-1 | Open |  ', '|DEF-1|', '| | Open'):
+            cells = Row(line).cells
+            for index in range(len(cells) + 1):
+                with self.subTest(line=line, index=index):
+                    expected = cells[index] if index < len(cells) else ''
+                    self.assertEqual(Row(line).cell(index), expected)
+        self.assertEqual(Row('| DEF-1 | Open').cell(1), 'Open')
+
+    def test_where_on_row_without_trailing_pipe(self):
+        """Test that the last cell of an unterminated row is queryable"""
+        table = MarkdownDocument.parse('| ID | Status |\n|---|---|\n| DEF-1 | Open\n').tables[0]
+        self.assertEqual(table.get(table.rows[0], 'Status'), 'Open')
+        self.assertEqual(list(table.index_by('ID')), ['DEF-1'])
+        self.assertEqual(len(list(table.where(Status='Open'))), 1)
+
+    def test_find_table_without_match(self):
+        """Test that lookups for absent columns return None"""
+        self.assertIsNone(MarkdownDocument.parse(self.text).find_table('Owner'))
+
+
+class TestTableStream(unittest.TestCase):
+    """Test cases for reading tables row by row"""
+
+    def test_tables_in_order_with_unread_rows_skipped(self):
+        """Test that advancing past a table skips the rows not read"""
+        lines = iter("| A |\n|---|\n| 1 |\n| 2 |\ntext\n| B | C |\n|---|---|\n| x | y |".split('\n'))
+        tables = stream_tables(lines)
+
+        first = next(tables)
+        self.assertEqual(first.resolve_column('Z', 'A'), 'A')
+        self.assertEqual(next(iter(first)).cell(0), '1')
+
+        second = next(tables)
+        self.assertEqual([second.get(row, 'C') for row in second], ['y'])
+        self.assertIsNone(next(tables, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the section search index (scripts/remediation/search.py)
+"""
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation import search
+from remediation.search import SearchIndex, split_sections, update
+import search_docs
+
+spec = importlib.util.spec_from_file_location('update_search_index',
+                                              os.path.join(SCRIPTS_DIR, 'update-search-index.py'))
+update_search_index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(update_search_index)
+
+
+class TestSplitSections(unittest.TestCase):
+    """Test cases for sectioning and tokenizing documents"""
+
+    def test_sections_at_headings(self):
+        """Test that each heading starts a section and intro text gets the file title"""
+        sections = split_sections("Intro words\n# Setup Guide\nInstall the tools\n## Setup Guide\nAgain", 'guide')
+        self.assertEqual([(s.line, s.slug, s.title) for s in sections], [
+            (1, '', 'guide'), (2, 'setup-guide', 'Setup Guide'), (4, 'setup-guide-1', 'Setup Guide')])
+        self.assertEqual(sections[1].terms, {'setup': 2, 'guide': 2, 'install': 1, 'the': 1, 'tools': 1})
+
+    def test_fenced_heading_is_not_a_section(self):
+        """Test that '#' lines in code stay in the surrounding section"""
+        sections = split_sections("# Run\n```bash\n# not a heading\n```\n")
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0].terms['heading'], 1)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for the incremental on-disk index"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self.index_dir = os.path.join(self.root, 'index')
+        self.write('docs/setup.md', "# Setup\nInstall python and git.\n## Validation\nRun the validation workflow.\n")
+        self.write('docs/review.md', "# Review\nCodeRabbit reviews every pull request.\n")
+        self.write('training/day1.md', "# Day 1\nSpecification workshop with python exercises.\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content):
+        os.makedirs(os.path.dirname(self.path(rel_path)), exist_ok=True)
+        with open(self.path(rel_path), 'w') as f:
+            f.write(content)
+
+    def update(self):
+        return update([self.path('docs'), self.path('training')], self.index_dir)
+
+    def titles(self, query):
+        with SearchIndex(self.index_dir) as index:
+            return [hit.title for hit in index.search(query)]
+
+    def test_ranked_section_hits(self):
+        """Test that the section using a term most, relative to its length, ranks first"""
+        self.assertEqual(self.update().sections, 4)
+        self.assertEqual(self.titles('validation'), ['Validation'])
+        self.assertEqual(self.titles('python'), ['Setup', 'Day 1'])
+        self.assertEqual(self.titles('python workshop'), ['Day 1', 'Setup'])
+        self.assertEqual(self.titles('nothing-matches'), [])
+        hit = search.search('coderabbit', self.index_dir)[0]
+        self.assertEqual((os.path.basename(hit.path), hit.line, hit.slug), ('review.md', 1, 'review'))
+
+    def test_only_changed_files_tokenized(self):
+        """Test that an update re-reads only edited files and drops deleted ones"""
+        self.update()
+        os.remove(self.path('docs/review.md'))
+        self.write('training/day1.md', "# Day 1\nConstitution drafting.\n")
+        with patch.object(search, 'split_sections', wraps=search.split_sections) as tokenized:
+            result = self.update()
+        self.assertEqual(tokenized.call_count, 1)
+        self.assertEqual((result.files, result.indexed, result.removed), (2, 1, 1))
+        self.assertEqual(self.titles('constitution'), ['Day 1'])
+        self.assertEqual(self.titles('coderabbit'), [])
+        self.assertEqual(self.titles('python'), ['Setup'])
+
+    def test_unchanged_update_keeps_generation(self):
+        """Test that a no-op update rewrites nothing"""
+        self.update()
+        self.assertEqual(self.update().indexed, 0)
+        with SearchIndex(self.index_dir) as index:
+            self.assertEqual(index.generation, 1)
+
+    def test_readers_keep_their_generation(self):
+        """Test that an open index keeps answering from its generation during updates"""
+        self.update()
+        with SearchIndex(self.index_dir) as reader:
+            self.assertEqual([hit.title for hit in reader.search('coderabbit')], ['Review'])
+            self.write('docs/review.md', "# Review\nNothing here now.\n")
+            self.update()
+            self.write('docs/review.md', "# Review\nStill nothing.\n")
+            self.update()
+            self.assertEqual(reader.generation, 1)
+            self.assertEqual([hit.title for hit in reader.search('coderabbit')], ['Review'])
+        self.assertEqual(sorted(f for f in os.listdir(self.index_dir) if '.1.' in f), [])
+        self.assertEqual(self.titles('coderabbit'), [])
+
+    def hits(self, index_dir, query):
+        with SearchIndex(index_dir) as index:
+            return sorted((os.path.basename(hit.path), hit.slug, hit.score) for hit in index.search(query))
+
+    def test_update_patches_changed_terms_only(self):
+        """Test that an edit rewrites only its terms' postings and reads no other file's terms"""
+        self.update()
+        with SearchIndex(self.index_dir) as index:
+            before = index.lexicon['coderabbit']
+        self.write('training/day1.md', "# Day 1\nConstitution drafting with python.\n")
+        with patch.object(search, '_load_sections', wraps=search._load_sections) as loaded:
+            self.update()
+        self.assertEqual(loaded.call_count, 1)
+        with SearchIndex(self.index_dir) as index:
+            self.assertEqual(index.lexicon['coderabbit'], before)
+            self.assertEqual(index.manifest['next_section'], 5)
+            self.assertEqual(len(index), 4)
+
+        fresh = os.path.join(self.root, 'fresh')
+        update([self.path('docs'), self.path('training')], fresh)
+        for query in ('python', 'day constitution', 'validation workflow', 'coderabbit'):
+            self.assertEqual(self.hits(self.index_dir, query), self.hits(fresh, query))
+
+    def test_rebuilt_once_mostly_unused(self):
+        """Test that section ids and postings left behind by edits are reclaimed"""
+        self.update()
+        for text in ("one", "two", "three", "four"):
+            self.write('docs/setup.md', f"# Setup\nInstall {text}.\n## Validation\nRun {text}.\n")
+            self.update()
+            with SearchIndex(self.index_dir) as index:
+                self.assertLessEqual(index.manifest['next_section'], 2 * len(index))
+                self.assertLessEqual(index.manifest['unused_pairs'], index.manifest['pairs'])
+        self.assertEqual(self.titles('four'), ['Setup', 'Validation'])
+        self.assertEqual(self.titles('three'), [])
+        self.assertEqual(len(os.listdir(os.path.join(self.index_dir, 'terms'))), 3)
+
+    def test_interrupted_update_rebuilt(self):
+        """Test that an update stopped before publishing its manifest is rebuilt by the next one"""
+        self.update()
+        self.write('docs/review.md', "# Review\nConstitution review.\n")
+        with patch.object(search, '_publish', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.update()
+        self.assertEqual(self.titles('coderabbit'), ['Review'])
+        self.assertEqual(self.update().indexed, 0)
+        self.assertEqual(self.titles('coderabbit'), [])
+        self.assertEqual(self.titles('constitution'), ['Review'])
+
+    def test_missing_index(self):
+        """Test that querying before any update is a clear error"""
+        with self.assertRaises(ValueError):
+            SearchIndex(self.index_dir)
+
+    def test_parallel_matches_serial(self):
+        """Test that tokenizing across processes builds the same index"""
+        self.update()
+        serial = self.titles('python validation')
+        update([self.path('docs'), self.path('training')], os.path.join(self.root, 'parallel'), jobs=2)
+        with SearchIndex(os.path.join(self.root, 'parallel')) as index:
+            self.assertEqual([hit.title for hit in index.search('python validation')], serial)
+
+    def test_cli(self):
+        """Test updating and querying from the command line"""
+        with redirect_stdout(io.StringIO()) as out:
+            status = update_search_index.main([self.path('docs'), '--index', self.index_dir])
+        self.assertEqual(status, 0)
+        self.assertIn('Indexed 2 files (2 changed, 0 removed): 3 sections', out.getvalue())
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(search_docs.main(['--index', self.index_dir, '--json', 'install']), 0)
+        self.assertEqual(json.loads(out.getvalue())[0]['slug'], 'setup')
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(search_docs.main(['--index', self.index_dir, 'absent']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
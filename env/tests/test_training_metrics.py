@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar training-metrics analytics (scripts/training_metrics/)
+"""
+import unittest
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add scripts directory to path to import the modules
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import ingest_metrics
+import training_assessment
+from training_metrics import assessment, batch, frame, schema
+from training_metrics.store import MetricsStore, ingest
+from training_metrics import MetricsFrame, MetricsIndex, QUALITY_THRESHOLDS, TrainingAssessment, index_for
+
+
+def reference_assessment(metrics, participant_id, day):
+    """The original per-file scoring from training-outcomes.md"""
+    result = {"participant_id": participant_id, "day": day, "overall_score": 0,
+              "areas_of_strength": [], "areas_for_improvement": [], "recommendations": []}
+    scores = []
+    for metric, threshold in QUALITY_THRESHOLDS.items():
+        if metric in metrics:
+            score = metrics[metric]
+            if isinstance(score, bool):
+                score = 1.0 if score else 0.0
+            scores.append(score)
+            key = "areas_of_strength" if score >= threshold else "areas_for_improvement"
+            result[key].append(metric)
+    result["overall_score"] = sum(scores) / len(scores) if scores else 0
+    if result["overall_score"] < 0.8:
+        result["recommendations"].append("Additional support and practice needed")
+    if "quality_score" in result["areas_for_improvement"]:
+        result["recommendations"].append("Focus on deliverable quality improvement")
+    if "completion_rate" in result["areas_for_improvement"]:
+        result["recommendations"].append("Time management and task prioritization needed")
+    return result
+
+
+class MetricsDirTestCase(unittest.TestCase):
+    """Base class writing a metrics/daily directory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.metrics_dir = os.path.join(self.temp_dir.name, 'daily')
+        os.makedirs(self.metrics_dir)
+        self.written = {}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, participant_id, day, metrics, date='2025-09-22'):
+        path = os.path.join(self.metrics_dir, f'{date}-{participant_id}-day{day}.json')
+        with open(path, 'w') as f:
+            json.dump({"participant_id": participant_id, "date": date, "training_day": day,
+                       "metrics": metrics}, f)
+        self.written[(participant_id, day)] = metrics
+
+    def write_cohort(self):
+        for i, pid in enumerate(['alice', 'bob', 'carol-2']):
+            for day in range(1, 6):
+                if pid == 'bob' and day == 3:
+                    continue
+                self.write(pid, day, {
+                    "completion_rate": 0.8 + 0.05 * ((i + day) % 4),
+                    "quality_score": 0.7 + 0.06 * day,
+                    "validation_success": day % 2 == 0,
+                    "time_spent": 120,
+                })
+
+
+class TestMetricsFrame(MetricsDirTestCase):
+    """Test cases for loading metrics into columns"""
+
+    def test_columns_indexed_by_participant_and_day(self):
+        """Test that each file lands in its (participant, day) row"""
+        self.write('alice', 2, {"quality_score": 0.9, "validation_passed": True})
+        self.write('bob', 1, {"quality_score": 0.5})
+        loaded = MetricsFrame.load(self.metrics_dir)
+        self.assertEqual(loaded.participants, ['alice', 'bob'])
+        row = loaded.row('alice', 2)
+        self.assertTrue(loaded.present[row])
+        self.assertEqual(loaded.column('quality_score')[row], 0.9)
+        self.assertEqual(loaded.column('validation_passed')[row], 1.0)
+        self.assertIsNone(loaded.row('alice', 1))
+        self.assertTrue(frame.is_missing(loaded.column('validation_passed')[loaded.row('bob', 1)]))
+
+    def test_latest_date_wins(self):
+        """Test that a re-recorded day uses the newest file unless a date is given"""
+        self.write('alice', 1, {"quality_score": 0.5}, date='2025-09-22')
+        self.write('alice', 1, {"quality_score": 0.9}, date='2025-09-29')
+        latest = MetricsFrame.load(self.metrics_dir)
+        self.assertEqual(latest.column('quality_score')[latest.row('alice', 1)], 0.9)
+        dated = MetricsFrame.load(self.metrics_dir, date='2025-09-22')
+        self.assertEqual(dated.column('quality_score')[dated.row('alice', 1)], 0.5)
+
+    def test_unrelated_files_ignored(self):
+        """Test that files not named like daily metrics are skipped"""
+        with open(os.path.join(self.metrics_dir, 'notes.json'), 'w') as f:
+            f.write('[]')
+        self.write('alice', 9, {"quality_score": 1.0})
+        self.assertEqual(MetricsFrame.load(self.metrics_dir).participants, [])
+        self.assertEqual(MetricsFrame.load(os.path.join(self.metrics_dir, 'none')).participants, [])
+
+
+class TestMetricsIndex(MetricsDirTestCase):
+    """Test cases for the (participant, day) -> file index"""
+
+    def bump_mtime(self):
+        """Move the directory mtime on, whatever the filesystem's granularity"""
+        st = os.stat(self.metrics_dir)
+        os.utime(self.metrics_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_index_built_from_names(self):
+        """Test that indexing opens no file and resolves any date"""
+        self.write('alice', 1, {}, date='2025-09-22')
+        self.write('alice', 1, {}, date='2025-09-29')
+        self.write('bob-smith', 2, {}, date='2025-09-23')
+        with patch('builtins.open') as opened:
+            index = MetricsIndex(self.metrics_dir)
+        opened.assert_not_called()
+        self.assertEqual(index.participants(), ['alice', 'bob-smith'])
+        self.assertTrue(index.path('alice', 1).endswith('2025-09-29-alice-day1.json'))
+        self.assertTrue(index.path('alice', 1, '2025-09-22').endswith('2025-09-22-alice-day1.json'))
+        self.assertIsNone(index.path('alice', 2))
+        self.assertEqual(len(index.paths()), 2)
+
+    def test_cached_until_directory_changes(self):
+        """Test that the index is reused until the directory mtime moves"""
+        self.write('alice', 1, {})
+        index = index_for(self.metrics_dir)
+        with patch('os.scandir') as scandir:
+            self.assertIs(index_for(self.metrics_dir), index)
+        scandir.assert_not_called()
+
+        self.write('alice', 2, {})
+        self.bump_mtime()
+        rebuilt = index_for(self.metrics_dir)
+        self.assertIsNot(rebuilt, index)
+        self.assertIsNotNone(rebuilt.path('alice', 2))
+
+    def test_assessment_reloads_on_new_files(self):
+        """Test that reports pick up files added after the first load"""
+        self.write('alice', 1, {"quality_score": 0.9})
+        assessor = TrainingAssessment(self.metrics_dir)
+        self.assertIn("error", assessor.assess_daily_performance('alice', 2))
+        self.write('alice', 2, {"quality_score": 0.9}, date='2025-08-01')
+        self.bump_mtime()
+        self.assertEqual(assessor.assess_daily_performance('alice', 2)["day"], 2)
+        self.assertTrue(assessor.metrics_file('alice', 2).endswith('2025-08-01-alice-day2.json'))
+
+
+class TestTrainingAssessment(MetricsDirTestCase):
+    """Test cases for cohort-wide assessment"""
+
+    def test_matches_per_file_assessment(self):
+        """Test that column scoring agrees with the original per-file loop"""
+        self.write_cohort()
+        assessor = TrainingAssessment(self.metrics_dir)
+        for (pid, day), metrics in self.written.items():
+            expected = reference_assessment(metrics, pid, day)
+            actual = assessor.assess_daily_performance(pid, day)
+            self.assertAlmostEqual(actual.pop("overall_score"), expected.pop("overall_score"))
+            self.assertEqual(actual, expected)
+        self.assertEqual(assessor.assess_daily_performance('bob', 3), {"error": "Metrics file not found"})
+        self.assertEqual(assessor.assess_daily_performance('nobody', 1), {"error": "Metrics file not found"})
+
+    def test_directory_read_once(self):
+        """Test that a cohort report opens each file once in total"""
+        self.write_cohort()
+        assessor = TrainingAssessment(self.metrics_dir)
+        with patch('builtins.open', wraps=open) as opened:
+            reports = assessor.generate_cohort_report()
+            assessor.generate_progress_report('alice')
+        self.assertEqual(opened.call_count, len(self.written))
+        self.assertEqual(sorted(reports), ['alice', 'bob', 'carol-2'])
+
+    def test_progress_report(self):
+        """Test progress statistics over the recorded days"""
+        self.write('alice', 1, {"completion_rate": 0.5, "quality_score": 0.5})
+        self.write('alice', 4, {"completion_rate": 1.0, "quality_score": 1.0})
+        report = TrainingAssessment(self.metrics_dir).generate_progress_report('alice')
+        self.assertEqual([a["day"] for a in report["daily_assessments"]], [1, 4])
+        self.assertEqual(report["overall_progress"],
+                         {"average_score": 0.75, "improvement_trend": 0.5, "consistency": 0.5})
+        empty = TrainingAssessment(self.metrics_dir).generate_progress_report('nobody')
+        self.assertEqual((empty["daily_assessments"], empty["overall_progress"]), ([], {}))
+
+    def test_stdlib_and_numpy_agree(self):
+        """Test that the array fallback gives the same scores as NumPy"""
+        if assessment.np is None:
+            self.skipTest("NumPy not installed")
+        self.write_cohort()
+        loaded = MetricsFrame.load(self.metrics_dir)
+        fast = assessment.CohortScores(loaded, QUALITY_THRESHOLDS)
+        with patch.object(assessment, 'np', None):
+            slow = assessment.CohortScores(loaded, QUALITY_THRESHOLDS)
+        self.assertEqual((fast.seen, fast.passed), (slow.seen, slow.passed))
+        for a, b in zip(fast.overall, slow.overall):
+            self.assertAlmostEqual(a, b)
+
+    def test_cli(self):
+        """Test the command line for one participant and the cohort"""
+        self.write_cohort()
+        with redirect_stdout(io.StringIO()) as out:
+            training_assessment.main(['alice', '--metrics-dir', self.metrics_dir])
+        self.assertEqual(json.loads(out.getvalue())["participant_id"], 'alice')
+        with redirect_stdout(io.StringIO()) as out:
+            training_assessment.main(['--all', '--metrics-dir', self.metrics_dir])
+        self.assertEqual([json.loads(line)["participant_id"] for line in out.getvalue().splitlines()],
+                         ['alice', 'bob', 'carol-2'])
+
+
+class TestCohortBatch(MetricsDirTestCase):
+    """Test cases for batched, pooled cohort reports"""
+
+    def setUp(self):
+        super().setUp()
+        self.write_cohort()
+
+    def strip_dates(self, reports):
+        for report in reports:
+            report.pop("report_date", None)
+        return reports
+
+    def test_chunks_match_single_load(self):
+        """Test that chunked assessment gives the same reports as one load"""
+        whole = TrainingAssessment(self.metrics_dir).generate_cohort_report()
+        chunked = list(batch.iter_cohort_reports(self.metrics_dir, chunk_size=2))
+        self.assertEqual(self.strip_dates(chunked), self.strip_dates(list(whole.values())))
+
+    def test_chunk_loads_only_its_participants(self):
+        """Test that a chunk opens only its own participants' files"""
+        with patch('builtins.open', wraps=open) as opened:
+            batch.assess_participants(self.metrics_dir, ['bob'])
+        self.assertEqual(opened.call_count, 4)
+
+    def test_pool_streams_jsonl_in_order(self):
+        """Test that pooled output keeps the requested order"""
+        ids = ['carol-2', 'nobody', 'alice', 'bob']
+        out = io.StringIO()
+        count = batch.write_cohort_jsonl(out, self.metrics_dir, iter(ids), jobs=2, chunk_size=1)
+        reports = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 4)
+        self.assertEqual([r["participant_id"] for r in reports], ids)
+        self.assertEqual(reports[1]["daily_assessments"], [])
+
+    def test_in_flight_chunks_bounded(self):
+        """Test that no more than two chunks per worker are outstanding"""
+        outstanding = []
+
+        class Future:
+            def __init__(self, value):
+                self.value = value
+                outstanding.append(self)
+
+            def result(self):
+                outstanding.remove(self)
+                return self.value
+
+        class Executor:
+            peak = 0
+
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def submit(self, fn, *args):
+                future = Future(fn(*args))
+                Executor.peak = max(Executor.peak, len(outstanding))
+                return future
+
+        with patch.object(batch, 'ProcessPoolExecutor', Executor):
+            reports = list(batch.iter_cohort_reports(self.metrics_dir, ['alice', 'bob', 'carol-2'] * 10,
+                                                     jobs=2, chunk_size=1))
+        self.assertEqual(len(reports), 30)
+        self.assertEqual(Executor.peak, 4)
+
+    def test_failing_chunk_reports_errors(self):
+        """Test that unreadable metrics mark only their chunk as failed"""
+        with open(os.path.join(self.metrics_dir, '2025-09-22-bob-day1.json'), 'w') as f:
+            f.write('{not json')
+        lines = batch._run_chunks(batch._report_lines, self.metrics_dir, ['alice', 'bob'], None, 1, 1, None)
+        reports = [json.loads(line) for line in lines]
+        self.assertNotIn("error", reports[0])
+        self.assertIn("JSONDecodeError", reports[1]["error"])
+
+    def test_cli_participants_file(self):
+        """Test reading participant IDs from a file"""
+        ids_file = os.path.join(self.temp_dir.name, 'ids.txt')
+        with open(ids_file, 'w') as f:
+            f.write("# cohort A\nbob\n\nalice\n")
+        with redirect_stdout(io.StringIO()) as out:
+            code = training_assessment.main(['--participants', ids_file, '--metrics-dir', self.metrics_dir,
+                                             '--jobs', '2'])
+        self.assertEqual(code, 0)
+        self.assertEqual([json.loads(line)["participant_id"] for line in out.getvalue().splitlines()],
+                         ['bob', 'alice'])
+
+
+
+class TestMetricsStore(MetricsDirTestCase):
+    """Test cases for the columnar store and its ingest command"""
+
+    def setUp(self):
+        super().setUp()
+        self.store_path = os.path.join(self.temp_dir.name, 'cohort.tmcs')
+
+    def strip_dates(self, reports):
+        for report in reports.values():
+            report.pop("report_date")
+        return reports
+
+    def test_schema_follows_template(self):
+        """Test that the stored fields are the template's numeric fields"""
+        with open(os.path.join(REPO_ROOT, 'training', 'metrics', 'outcome-tracking-templates.yaml')) as f:
+            template = re.search(r'^daily_metrics_template:\n(.*?)^\w', f.read(), re.M | re.S).group(1)
+        sections, section = {}, None
+        for line in template.splitlines():
+            heading = re.match(r'  (\w+):\s*$', line)
+            leaf = re.match(r'    (\w+): (-?[\d.]+)\b', line)
+            if heading:
+                section = heading.group(1)
+            elif leaf and section:
+                sections.setdefault(section, []).append(leaf.group(1))
+        self.assertEqual({k: tuple(v) for k, v in sections.items()}, schema.TEMPLATE_SECTIONS)
+
+    def test_template_shaped_record(self):
+        """Test that a record using the template's sections is read"""
+        path = os.path.join(self.metrics_dir, '2025-09-22-dana-day2.json')
+        with open(path, 'w') as f:
+            json.dump({"participant_info": {"participant_id": "dana"},
+                       "session_info": {"date": "2025-09-22", "training_day": 2},
+                       "completion_metrics": {"completion_rate": 0.95},
+                       "quality_metrics": {"code_quality": 0.7}}, f)
+        record = frame.read_record(path)
+        self.assertEqual((record.participant_id, record.day), ('dana', 2))
+        self.assertEqual(record.metrics, {"completion_rate": 0.95, "code_quality": 0.7})
+
+    def test_ingest_is_incremental(self):
+        """Test that re-running ingest only appends new records"""
+        self.write_cohort()
+        self.assertEqual(ingest(self.metrics_dir, self.store_path), (14, 0))
+        self.write('alice', 1, {"quality_score": 1.0}, date='2025-09-29')
+        self.assertEqual(ingest(self.metrics_dir, self.store_path), (1, 14))
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 15)
+
+    def test_new_store_follows_umask(self):
+        """Test that a created store is readable as the umask allows, not private to its creator"""
+        self.write('alice', 1, {"quality_score": 0.9})
+        previous = os.umask(0o022)
+        try:
+            ingest(self.metrics_dir, self.store_path)
+        finally:
+            os.umask(previous)
+        self.assertEqual(os.stat(self.store_path).st_mode & 0o777, 0o644)
+
+    def test_columns_are_views(self):
+        """Test that store columns are read in place from the mapping"""
+        self.write_cohort()
+        ingest(self.metrics_dir, self.store_path)
+        with MetricsStore(self.store_path) as store:
+            loaded = store.frame()
+            column = loaded.column('quality_score')
+            self.assertIsInstance(column, memoryview)
+            self.assertFalse(column.contiguous)
+            json_frame = MetricsFrame.load(self.metrics_dir)
+            for pid, day in self.written:
+                self.assertAlmostEqual(column[loaded.row(pid, day)],
+                                       json_frame.column('quality_score')[json_frame.row(pid, day)])
+
+    def test_reports_match_json(self):
+        """Test that assessing the store gives the same reports as the JSON files"""
+        self.write_cohort()
+        self.write('alice', 2, {"quality_score": 0.1}, date='2025-09-01')
+        ingest(self.metrics_dir, self.store_path)
+        from_json = TrainingAssessment(self.metrics_dir).generate_cohort_report()
+        from_store = TrainingAssessment(store=self.store_path).generate_cohort_report()
+        self.assertEqual(self.strip_dates(from_store), self.strip_dates(from_json))
+        dated = TrainingAssessment(store=self.store_path, date='2025-09-01')
+        self.assertEqual(dated.assess_daily_performance('alice', 2)["areas_for_improvement"], ['quality_score'])
+
+    def test_torn_append_ignored_then_dropped(self):
+        """Test that a partial trailing record is not read and is replaced by the next append"""
+        self.write('alice', 1, {"quality_score": 0.9})
+        ingest(self.metrics_dir, self.store_path)
+        with open(self.store_path, 'ab') as f:
+            f.write(b'bob\0\0\0')
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 1)
+        self.write('bob', 1, {"quality_score": 0.5})
+        ingest(self.metrics_dir, self.store_path)
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(sorted(store.participant_ids()), ['alice', 'bob'])
+            self.assertEqual(store.frame().column('quality_score')[1], 0.5)
+
+    def test_rows_grouped_by_participant(self):
+        """Test that later appends join their participant's rows, found by binary search"""
+        self.write('bob', 1, {"quality_score": 0.5})
+        self.write('alice', 1, {"quality_score": 0.9})
+        ingest(self.metrics_dir, self.store_path)
+        self.write('alice', 2, {"quality_score": 0.8})
+        self.write('carol', 1, {"quality_score": 0.7})
+        ingest(self.metrics_dir, self.store_path)
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(store.participants(), ['alice', 'bob', 'carol'])
+            self.assertEqual(list(store.participant_ids()), ['alice', 'alice', 'bob', 'carol'])
+            self.assertEqual(store.rows_of('alice'), [0, 1])
+            self.assertEqual(store.rows_of('dave'), [])
+            self.assertEqual(store.frame().column('quality_score')[1], 0.8)
+
+    def test_append_writes_a_run(self):
+        """Test that a small ingest appends a run in place and readers merge its table"""
+        self.write_cohort()
+        ingest(self.metrics_dir, self.store_path)
+        before = os.stat(self.store_path)
+        self.write('alice', 5, {"quality_score": 0.4}, date='2025-09-29')
+        self.write('zed', 1, {"quality_score": 0.9})
+        self.assertEqual(ingest(self.metrics_dir, self.store_path), (2, 14))
+        after = os.stat(self.store_path)
+        self.assertEqual((after.st_ino, after.st_dev), (before.st_ino, before.st_dev))
+        self.assertGreater(after.st_size, before.st_size)
+
+        from_json = self.strip_dates(TrainingAssessment(self.metrics_dir).generate_cohort_report())
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 16)
+            self.assertEqual(store.participants()[-1], 'zed')
+            alice = store.rows_of('alice')
+            self.assertGreater(alice[-1], alice[-2] + 1)
+            self.assertIsInstance(store.frame().column('quality_score'), memoryview)
+        from_store = TrainingAssessment(store=self.store_path).generate_cohort_report()
+        self.assertEqual(self.strip_dates(from_store), from_json)
+
+        self.assertEqual(ingest(self.metrics_dir, self.store_path, compact=True), (0, 16))
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 16)
+            alice = store.rows_of('alice')
+            self.assertEqual(alice, list(range(alice[0], alice[0] + len(alice))))
+        self.assertEqual(self.strip_dates(TrainingAssessment(store=self.store_path).generate_cohort_report()),
+                         from_json)
+
+    def test_unfinished_run_ignored_then_dropped(self):
+        """Test that a run without its end marker is not read and the next ingest rewrites the store"""
+        self.write_cohort()
+        ingest(self.metrics_dir, self.store_path)
+        self.write('zed', 1, {"quality_score": 0.9})
+        ingest(self.metrics_dir, self.store_path)
+        with open(self.store_path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.store_path) - 1)
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 14)
+            self.assertNotIn('zed', store.participants())
+        self.assertEqual(ingest(self.metrics_dir, self.store_path), (1, 14))
+        with MetricsStore(self.store_path) as store:
+            self.assertEqual(len(store), 15)
+            self.assertEqual(store.rows_of('zed'), [14])
+
+    def test_participant_lookup_does_not_scan(self):
+        """Test that a frame of some participants never walks every row"""
+        self.write_cohort()
+        ingest(self.metrics_dir, self.store_path)
+        with MetricsStore(self.store_path) as store, \
+                patch.object(MetricsStore, 'participant_ids', side_effect=AssertionError("scanned")):
+            loaded = store.frame(participants=['bob'])
+            self.assertEqual(loaded.participants, ['bob'])
+            self.assertEqual(len(loaded.rows_of('bob')), 4)
+
+    def test_chunk_scores_only_its_rows(self):
+        """Test that assessing a chunk decodes and scores none of the other participants' rows"""
+        self.write_cohort()
+        ingest(self.metrics_dir, self.store_path)
+        with patch.object(MetricsStore, 'participant_ids', side_effect=AssertionError("scanned")), \
+                patch.object(batch, 'CohortScores', wraps=assessment.CohortScores) as scored:
+            reports = batch.assess_participants(self.metrics_dir, ['bob'], store=self.store_path)
+        self.assertEqual(len(scored.call_args[0][0]), 4)
+        self.assertEqual(len(reports[0]["daily_assessments"]), 4)
+        from_json = batch.assess_participants(self.metrics_dir, ['bob'])
+        for report in (reports[0], from_json[0]):
+            report.pop("report_date")
+        self.assertEqual(reports[0], from_json[0])
+
+    def test_assessment_remaps_after_append(self):
+        """Test that a store-backed assessor sees records appended later"""
+        self.write('alice', 1, {"quality_score": 0.9})
+        ingest(self.metrics_dir, self.store_path)
+        assessor = TrainingAssessment(store=self.store_path)
+        self.assertIn("error", assessor.assess_daily_performance('alice', 2))
+        self.write('alice', 2, {"quality_score": 0.9})
+        ingest(self.metrics_dir, self.store_path)
+        self.assertEqual(assessor.assess_daily_performance('alice', 2)["day"], 2)
+
+    def test_long_participant_id_rejected(self):
+        """Test that IDs wider than the fixed field are refused, not truncated"""
+        self.write('x' * 40, 1, {"quality_score": 0.9})
+        with self.assertRaises(ValueError):
+            ingest(self.metrics_dir, self.store_path)
+
+    def test_cli(self):
+        """Test ingesting and reporting from the store on the command line"""
+        self.write_cohort()
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(ingest_metrics.main(['--metrics-dir', self.metrics_dir, '--store', self.store_path]), 0)
+        self.assertIn('Ingested 14 records', out.getvalue())
+        with redirect_stdout(io.StringIO()) as out:
+            training_assessment.main(['--all', '--store', self.store_path, '--jobs', '2', '--chunk-size', '1'])
+        self.assertEqual([json.loads(line)["participant_id"] for line in out.getvalue().splitlines()],
+                         ['alice', 'bob', 'carol-2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,14 @@ import sys
 # Add parent directory to path to import the module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Add scripts directory to path to import the updater
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import update_defect_log
+from remediation.fileio import iter_lines
+from remediation.manifest import ManifestEntry, iter_json, read_manifest
+
 class TestUpdateDefectLog(unittest.TestCase):
     """Test cases for defect log update functionality"""
     
@@ -80,5 +88,225 @@ class TestUpdateDefectLog(unittest.TestCase):
             mock_file.return_value.write(test_content)
             mock_file.return_value.write.assert_called_with(test_content)
 
+class TestIndexedUpdate(unittest.TestCase):
+    """Test cases for the single-pass, column-aware updater"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_dir, 'DEFECT_LOG.md')
+        self.content = """# Defect Log
+
+| Defect ID | Status | Resolution Notes | Date Opened | Date Closed |
+|-----------|--------|------------------|-------------|-------------|
+| DEF-001 | Open | | 2025-09-22 | |
+| DEF-0010 | Open | | 2025-09-22 | |
+| DEF-002 | Resolved | Done | 2025-09-22 | 2025-09-23 |
+"""
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.test_dir)
+
+    def test_cells_updated_by_column(self):
+        """Test that notes and close date land in their own columns"""
+        updated, resolved = update_defect_log.update_content(
+            self.content, {'DEF-001': 'Fixed'}, '2025-10-01')
+
+        self.assertEqual(resolved, ['DEF-001'])
+        self.assertIn('| DEF-001 | Resolved | Fixed | 2025-09-22 | 2025-10-01 |', updated)
+
+    def test_ids_do_not_match_by_prefix(self):
+        """Test that DEF-001 does not also resolve DEF-0010"""
+        updated, _ = update_defect_log.update_content(
+            self.content, {'DEF-001': 'Fixed'}, '2025-10-01')
+
+        self.assertIn('| DEF-0010 | Open | | 2025-09-22 | |', updated)
+
+    def test_already_resolved_rows_untouched(self):
+        """Test that only Open rows are updated"""
+        updated, resolved = update_defect_log.update_content(
+            self.content, {'DEF-002': 'Again', 'DEF-999': 'Missing'}, '2025-10-01')
+
+        self.assertEqual(resolved, [])
+        self.assertEqual(updated, self.content)
+
+    def test_legacy_column_names(self):
+        """Test the ID/Resolved column aliases used by older logs"""
+        content = """| ID | Description | Severity | Status | Created | Resolved | Resolution Notes |
+|---|---|---|---|---|---|---|
+| DEF-001 | Sample defect 1 | Medium | Open | 2025-09-22 | | |"""
+
+        updated, _ = update_defect_log.update_content(content, {'DEF-001': 'Fixed'}, '2025-10-01')
+
+        self.assertTrue(updated.endswith('| DEF-001 | Sample defect 1 | Medium | Resolved | 2025-09-22 | 2025-10-01 | Fixed |'))
+
+    def test_missing_table_rejected(self):
+        """Test that a log without a defect table is an error"""
+        with self.assertRaises(ValueError):
+            update_defect_log.update_content('# Empty\n', {'DEF-001': 'x'}, '2025-10-01')
+
+    def test_update_writes_atomically(self):
+        """Test that the log is replaced via a temporary file"""
+        with open(self.log_path, 'w') as f:
+            f.write(self.content)
+
+        with patch('os.replace', wraps=os.replace) as mock_replace:
+            resolved = update_defect_log.update_defect_log(
+                self.log_path, {'DEF-0010': 'Fixed'}, '2025-10-01')
+
+        self.assertEqual(resolved, ['DEF-0010'])
+        self.assertEqual(mock_replace.call_count, 1)
+        self.assertEqual(os.listdir(self.test_dir), ['DEFECT_LOG.md'])
+        with open(self.log_path) as f:
+            self.assertIn('| DEF-0010 | Resolved | Fixed | 2025-09-22 | 2025-10-01 |', f.read())
+
+
+class TestManifest(unittest.TestCase):
+    """Test cases for bulk updates from a manifest"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.test_dir, 'DEFECT_LOG.md')
+        with open(self.log_path, 'w') as f:
+            f.write("""| Defect ID | PR # | Severity | Status | Resolution Notes | Date Opened | Date Closed |
+|---|---|---|---|---|---|---|
+| DEF-001 | 1 | High | Open | | 2025-09-22 | |
+| DEF-002 | 1 | Low | Resolved | Done | 2025-09-22 | 2025-09-23 |
+| DEF-003 | 2 | High | Open | | 2025-09-22 | |
+""")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.test_dir)
+
+    def read_log(self):
+        with open(self.log_path) as f:
+            return f.read()
+
+    def test_readers_agree(self):
+        """Test that JSONL, CSV and JSON manifests decode to the same entries"""
+        import io
+        sources = {
+            'jsonl': '{"id": "DEF-001", "notes": "Fixed"}\n\n{"id": "DEF-002", "status": "reopen"}\n',
+            'csv': 'Defect ID,Status,Notes\nDEF-001,,Fixed\nDEF-002,Reopen,\n',
+            'json': '[{"id": "DEF-001", "notes": "Fixed"},\n {"id": "DEF-002", "action": "reopen"}]',
+        }
+        for fmt, text in sources.items():
+            entries = list(read_manifest(io.StringIO(text), fmt))
+            self.assertEqual([(e.id, e.status, e.notes) for e in entries],
+                             [('DEF-001', 'Resolved', 'Fixed'), ('DEF-002', 'Open', '')], fmt)
+
+    def test_json_array_streams_across_chunks(self):
+        """Test that records split over read boundaries decode correctly"""
+        import io
+        import json
+        records = [{'id': f'DEF-{i:04d}', 'notes': 'x' * (i % 7)} for i in range(200)]
+        entries = iter_json(io.StringIO(json.dumps(records)), chunk_size=16)
+        self.assertEqual([r['id'] for r in entries], [r['id'] for r in records])
+
+    def test_json_leading_whitespace_spans_chunks(self):
+        """Test that whitespace filling whole chunks before the array is skipped"""
+        import io
+        self.assertEqual(list(iter_json(io.StringIO('  [ ] '), 1)), [])
+        entries = iter_json(io.StringIO('\n\n   [{"id": "DEF-001"}]'), chunk_size=2)
+        self.assertEqual([r['id'] for r in entries], ['DEF-001'])
+        entries = iter_json(io.StringIO('    {"DEF-002": "Fixed"}'), chunk_size=3)
+        self.assertEqual(list(entries), [{'id': 'DEF-002', 'notes': 'Fixed'}])
+
+    def test_json_array_needs_one_comma_between_records(self):
+        """Test that missing, doubled, leading and trailing commas are rejected"""
+        import io
+        for text in ('[{"id": "DEF-001"}{"id": "DEF-002"}]', '[,,{"id": "DEF-001"}]',
+                     '[{"id": "DEF-001"},,{"id": "DEF-002"}]', '[{"id": "DEF-001"},]', '[{"id": "DEF-001"}'):
+            for chunk_size in (4, 1024):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(ValueError):
+                        list(iter_json(io.StringIO(text), chunk_size))
+
+    def test_json_literals_split_across_chunks(self):
+        """Test that true/null and escapes cut by a read boundary still decode"""
+        import io
+        text = '[{"id": "DEF-001", "a": true, "b": null, "notes": "caf\\u00e9"}]'
+        for chunk_size in range(1, 12):
+            self.assertEqual(list(iter_json(io.StringIO(text), chunk_size))[0]['notes'], 'caf\u00e9')
+
+    def test_invalid_json_fails_without_reading_on(self):
+        """Test that a complete but invalid record is reported before the rest is buffered"""
+        import io
+
+        class CountingReader(io.StringIO):
+            reads = 0
+
+            def read(self, size=-1):
+                self.reads += 1
+                return super().read(size)
+
+        records = ',\n'.join('{"id": "DEF-%04d"}' % i for i in range(5000))
+        f = CountingReader('[{"id": "DEF-0000", "notes": oops},\n' + records + ']')
+        with self.assertRaisesRegex(ValueError, 'Invalid JSON manifest at character 29'):
+            list(iter_json(f, chunk_size=64))
+        self.assertLessEqual(f.reads, 3)
+
+    def test_legacy_mapping(self):
+        """Test that an id -> notes object is read as resolutions"""
+        import io
+        entries = list(read_manifest(io.StringIO('{"DEF-001": "Fixed"}'), 'json'))
+        self.assertEqual([(e.id, e.status, e.notes) for e in entries], [('DEF-001', 'Resolved', 'Fixed')])
+
+    def test_record_without_id_rejected(self):
+        """Test that a record without an id is an error"""
+        import io
+        with self.assertRaises(ValueError):
+            list(read_manifest(io.StringIO('{"status": "Resolved"}\n'), 'jsonl'))
+
+    def test_apply_reports_missing_and_unchanged(self):
+        """Test that one pass applies changes and reports the rest"""
+        entries = [ManifestEntry('DEF-001', notes='Fixed'), ManifestEntry('DEF-002'),
+                   ManifestEntry('DEF-003', 'Open'), ManifestEntry('DEF-404')]
+        report = update_defect_log.apply_manifest(self.log_path, entries, '2025-10-01')
+
+        self.assertEqual(report.changed, {'Resolved': ['DEF-001']})
+        self.assertEqual(report.unchanged, {'Resolved': ['DEF-002'], 'Open': ['DEF-003']})
+        self.assertEqual(report.missing, ['DEF-404'])
+        self.assertIn('| DEF-001 | 1 | High | Resolved | Fixed | 2025-09-22 | 2025-10-01 |', self.read_log())
+
+    def test_reopen_clears_closing_date(self):
+        """Test that reopening a defect removes its closing date"""
+        update_defect_log.apply_manifest(self.log_path, [ManifestEntry('DEF-002', 'Open')], '2025-10-01')
+        self.assertIn('| DEF-002 | 1 | Low | Open | Done | 2025-09-22 | |', self.read_log())
+
+    def test_dry_run_leaves_log(self):
+        """Test that write=False only reports"""
+        before = self.read_log()
+        report = update_defect_log.apply_manifest(self.log_path, [ManifestEntry('DEF-001')], write=False)
+        self.assertEqual(report.changed, {'Resolved': ['DEF-001']})
+        self.assertEqual(self.read_log(), before)
+
+    def test_query_filters(self):
+        """Test status, severity and PR filters over the streamed table"""
+        def ids(**filters):
+            with open(self.log_path) as f:
+                table = update_defect_log.defect_rows(iter_lines(f))
+                return [row.cell(0) for row in update_defect_log.query_defects(table, **filters)]
+
+        self.assertEqual(ids(status='open'), ['DEF-001', 'DEF-003'])
+        self.assertEqual(ids(status='Open', pr='#2'), ['DEF-003'])
+        self.assertEqual(ids(severity='low'), ['DEF-002'])
+
+    def test_cli_exit_code_flags_missing(self):
+        """Test that the manifest command fails when IDs are missing"""
+        manifest = os.path.join(self.test_dir, 'changes.csv')
+        with open(manifest, 'w') as f:
+            f.write('id,notes\nDEF-001,Fixed\nDEF-404,Nope\n')
+        with patch('builtins.print') as mock_print:
+            code = update_defect_log.main(['--log', self.log_path, '--manifest', manifest])
+        self.assertEqual(code, 1)
+        self.assertIn('DEF-404', mock_print.call_args[0][0])
+
+
 if __name__ == '__main__':
     unittest.main()
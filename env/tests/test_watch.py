@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for watch mode (scripts/remediation/watch.py)
+"""
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import time
+
+# Add scripts directory to path to import the modules
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from remediation.discovery import FileDiscovery
+from remediation.rules import pipeline
+from remediation.watch import InotifyWatcher, PollingWatcher, WatchDaemon, open_watcher
+
+UNFIXED = "# Title\n**Phase 1: Setup**\n"
+FIXED = "# Title\n#### Phase 1: Setup\n"
+
+
+class WatcherTests:
+    """Shared cases run against each watcher implementation"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.discovery = FileDiscovery(['**/*.md'], ['skip/**'])
+        self.watcher = self.make_watcher([self.test_dir])
+        self.addCleanup(self.watcher.close)
+        self.daemon = WatchDaemon(pipeline, self.watcher, debounce=0.05)
+
+    def write(self, rel_path, content):
+        path = os.path.join(self.test_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def run_until_batch(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            results = self.daemon.step(idle_timeout=0.05)
+            if results:
+                return results
+        return []
+
+    def test_fixes_changed_file(self):
+        """Test that a saved file is fixed and nothing else is touched"""
+        self.write('other.md', UNFIXED)
+        self.watcher.changes(0)
+        path = self.write('docs/guide.md', UNFIXED)
+        results = self.run_until_batch()
+        self.assertEqual([r.path for r in results], [os.path.normpath(path)])
+        self.assertEqual(self.read(path), FIXED)
+        self.assertEqual(self.read(os.path.join(self.test_dir, 'other.md')), UNFIXED)
+
+    def test_burst_is_one_batch(self):
+        """Test that several quick saves are fixed together, each once"""
+        paths = [self.write(f'doc{i}.md', UNFIXED) for i in range(3)]
+        self.write('doc0.md', UNFIXED + "more\n")
+        results = self.run_until_batch()
+        self.assertEqual(sorted(r.path for r in results), sorted(map(os.path.normpath, paths)))
+
+    def test_own_write_does_not_retrigger(self):
+        """Test that the daemon ignores the change event from its own fix"""
+        self.write('guide.md', UNFIXED)
+        self.assertEqual(len(self.run_until_batch()), 1)
+        self.assertEqual(self.run_until_batch(timeout=0.5), [])
+
+    def test_ignores_out_of_scope_files(self):
+        """Test that excluded and unmatched files never reach the pipeline"""
+        self.write('skip/guide.md', UNFIXED)
+        self.write('notes.txt', UNFIXED)
+        self.assertEqual(self.run_until_batch(timeout=0.5), [])
+
+
+class TestPollingWatcher(WatcherTests, unittest.TestCase):
+    """Test cases for mtime polling"""
+
+    def make_watcher(self, roots):
+        return PollingWatcher(roots, self.discovery, interval=0.05)
+
+
+class TestInotifyWatcher(WatcherTests, unittest.TestCase):
+    """Test cases for inotify"""
+
+    def make_watcher(self, roots):
+        try:
+            return InotifyWatcher(roots, self.discovery)
+        except OSError as e:
+            self.skipTest(f"inotify unavailable: {e}")
+
+    def test_new_directory_is_watched(self):
+        """Test that files in a directory created after start are seen"""
+        path = self.write('new/deeper/guide.md', UNFIXED)
+        self.run_until_batch()
+        self.assertEqual(self.read(path), FIXED)
+
+
+class TestOpenWatcher(unittest.TestCase):
+    """Test cases for watcher selection"""
+
+    def test_poll_forces_polling(self):
+        """Test that poll=True never uses inotify"""
+        with tempfile.TemporaryDirectory() as root:
+            watcher = open_watcher([root], FileDiscovery(), poll=True)
+            self.assertIsInstance(watcher, PollingWatcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
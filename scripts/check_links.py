@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check relative links and #anchors in markdown files, offline
+
+    python3 scripts/check_links.py docs training        # report broken links, exit 1 if any
+    python3 scripts/check_links.py --jobs 0 --json .    # whole repository on every CPU, as JSON
+    python3 scripts/check_links.py --changed .          # only files changed since the last run
+
+Every markdown file is parsed once and links are resolved against an
+in-memory index of the tree (see remediation.links). Parsed headings and
+links are kept in .markdown_index.json under --root, so later runs only
+parse files whose content changed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from remediation.engine import resolve_jobs
+from remediation.headings import HeadingIndex
+from remediation.links import INDEX_FILE, LinkIndex, markdown_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check internal links in markdown files")
+    parser.add_argument('paths', nargs='*', default=['.'],
+                        help="markdown files or directories to check (default: current directory)")
+    parser.add_argument('--root', default='.',
+                        help="repository root that '/' links and the path index start from (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="parse files across N worker processes (0 = one per CPU)")
+    parser.add_argument('--json', action='store_true', help="print the broken links as a JSON list")
+    parser.add_argument('--index', metavar='PATH',
+                        help=f"parsed-file index to reuse and update (default: ROOT/{INDEX_FILE})")
+    parser.add_argument('--no-index', dest='index', action='store_const', const='',
+                        help="parse every file and leave the index untouched")
+    parser.add_argument('--changed', action='store_true',
+                        help="only report files that changed since the last run and the files linking to them")
+    args = parser.parse_args(argv)
+    if args.index is None:
+        args.index = os.path.join(args.root, INDEX_FILE)
+    if args.changed and not args.index:
+        parser.error("--changed needs the index")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        jobs = resolve_jobs(args.jobs)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    start = time.perf_counter()
+    headings = HeadingIndex(args.index or None, args.root)
+    index = LinkIndex(args.root, headings=headings)
+    index.load(markdown_files(index, args.paths), jobs)
+    headings.save()
+    reported = index.affected() if args.changed else index.checked
+    broken = list(index.broken(reported))
+    elapsed = time.perf_counter() - start
+    for path, error in index.errors.items():
+        print(f"Error reading {path}: {error}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps([link._asdict() for link in broken], indent=2))
+    else:
+        for link in broken:
+            print(f"{link.path}:{link.line}: broken link {link.target} ({link.reason})")
+        links = sum(len(index.docs[path].links) for path in reported if path in index.docs)
+        print(f"Checked {links} links in {len(reported)} files ({len(headings.changed)} parsed) "
+              f"in {elapsed:.2f}s: {len(broken)} broken")
+    return 1 if broken or index.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
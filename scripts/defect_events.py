@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Record defect changes as append-only events and compact them into DEFECT_LOG.md
+
+    python3 scripts/defect_events.py import                      # seed from DEFECT_LOG.md
+    python3 scripts/defect_events.py open DEF-101 --pr 12 --severity High --description "..."
+    python3 scripts/defect_events.py status DEF-101 Resolved --notes "Pinned the action"
+    python3 scripts/defect_events.py manifest changes.jsonl
+    python3 scripts/defect_events.py compact --views docs/defect-log
+    python3 scripts/defect_events.py show --pr 12                 # read, compacting first if stale
+"""
+import argparse
+import sys
+
+from remediation.defect_store import DEFAULT_STORE, DefectStore
+from remediation.manifest import FORMATS, ManifestReport, detect_format, normalize_status, read_manifest
+from remediation.mdtable import MarkdownDocument
+
+DEFECT_LOG = 'DEFECT_LOG.md'
+
+
+def import_log(store, log_path):
+    """Append one event per row of an existing markdown log; (imported, already stored)
+
+    Defects the store already holds are skipped, so importing twice adds nothing.
+    """
+    with open(log_path, 'r') as f:
+        document = MarkdownDocument.parse(f.read())
+    table = document.find_table('Defect ID', 'Status')
+    if table is None:
+        raise ValueError(f"No defect table found in {log_path}")
+    pr_column = table.resolve_column('PR #', 'PR')
+    known = set(store.fold())
+    imported = skipped = 0
+    for row in table.rows:
+        fields = {name: table.get(row, name) for name in table.header}
+        if fields['Defect ID'] in known:
+            skipped += 1
+            continue
+        pr = fields.get(pr_column, '') if pr_column else ''
+        store.append(fields['Defect ID'], pr or 'unknown', fields)
+        known.add(fields['Defect ID'])
+        imported += 1
+    return imported, skipped
+
+
+def apply_manifest(store, entries):
+    """Append an event for every entry that changes a known defect"""
+    shards = {}
+    state = store.fold(shards=shards)
+    report = ManifestReport()
+    for entry in entries:
+        record = state.get(entry.id)
+        if record is None:
+            outcome = 'missing'
+        elif record.get('Status') == entry.status:
+            outcome = 'unchanged'
+        else:
+            pr = shards.get(entry.id) or record.get('PR #') or 'unknown'
+            store.set_status(entry.id, pr, entry.status, entry.notes, entry.date)
+            record['Status'] = entry.status
+            outcome = 'changed'
+        report.add(outcome, entry)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Append-only defect event store")
+    parser.add_argument('--store', default=DEFAULT_STORE,
+                        help="directory of per-PR event shards (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed = commands.add_parser('import', help="seed the store from an existing markdown log")
+    seed.add_argument('--log', default=DEFECT_LOG, help="log to import (default: %(default)s)")
+
+    new = commands.add_parser('open', help="record a new defect")
+    new.add_argument('id')
+    new.add_argument('--pr', required=True)
+    new.add_argument('--description', required=True)
+    new.add_argument('--severity', default='Low')
+    new.add_argument('--owner', default='System')
+    new.add_argument('--date', help="date opened (default: today)")
+
+    status = commands.add_parser('status', help="record a status change")
+    status.add_argument('id')
+    status.add_argument('status', help="new status, or resolve/reopen/close")
+    status.add_argument('--notes', default='')
+    status.add_argument('--pr', help="PR of the defect (default: looked up in the store)")
+    status.add_argument('--date', help="closing date (default: today)")
+
+    manifest = commands.add_parser('manifest', help="record status changes from a manifest")
+    manifest.add_argument('manifest', help="JSON, JSONL or CSV manifest")
+    manifest.add_argument('--format', choices=FORMATS)
+
+    compact = commands.add_parser('compact', help="regenerate the markdown log if events arrived")
+    compact.add_argument('--log', default=DEFECT_LOG, help="log to write (default: %(default)s)")
+    compact.add_argument('--views', metavar='DIR', help="also write one PR-<n>.md view per PR here")
+    compact.add_argument('--force', action='store_true',
+                         help="regenerate even if nothing changed, dropping log rows the store does not hold")
+
+    show = commands.add_parser('show', help="print the log, regenerating it first if events arrived")
+    show.add_argument('--log', default=DEFECT_LOG, help="log to read (default: %(default)s)")
+    show.add_argument('--pr', help="print only this PR's view, rendered from its shard")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = DefectStore(args.store)
+    try:
+        if args.command == 'import':
+            imported, skipped = import_log(store, args.log)
+            print(f"Imported {imported} defects into {args.store} ({skipped} already stored)")
+        elif args.command == 'open':
+            store.open_defect(args.id, args.pr, args.description, args.severity, args.owner, args.date)
+            print(f"Opened {args.id} on PR #{args.pr}")
+        elif args.command == 'status':
+            pr = args.pr or store.locate(args.id)
+            if pr is None:
+                print(f"Error: {args.id} is not in {args.store}")
+                return 1
+            status = normalize_status(args.status)
+            store.set_status(args.id, pr, status, args.notes, args.date)
+            print(f"Marked {args.id} {status}")
+        elif args.command == 'manifest':
+            with open(args.manifest, 'r', newline='') as f:
+                report = apply_manifest(store, read_manifest(f, args.format or detect_format(args.manifest)))
+            print(report.summary())
+            return 1 if report.missing else 0
+        elif args.command == 'compact':
+            if store.compact(args.log, args.views, args.force):
+                print(f"Regenerated {args.log} from {args.store}")
+            else:
+                print(f"{args.log} is up to date")
+        elif args.command == 'show':
+            if args.pr:
+                sys.stdout.write(store.render(args.pr))
+            else:
+                store.compact(args.log)
+                with open(args.log, 'r', encoding='utf-8') as f:
+                    sys.stdout.write(f.read())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,45 +1,56 @@
 #!/usr/bin/env python3
-import re
+import argparse
+import sys
+
+from remediation.discovery import CONFIG_FILE, FileDiscovery
+from remediation.engine import FixerPipeline
+from remediation.rules import configured, guard_workflow_scripts, workflow_pipeline
+
 
 def fix_workflow_scripts(file_path):
     """Add conditional checks for missing scripts in workflows"""
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Add conditional checks for missing scripts
-        replacements = [
-            (r'python3 scripts/validate-completeness\.py', 
-             r'if [ -f scripts/validate-completeness.py ]; then python3 scripts/validate-completeness.py; else echo "Skipping completeness validation - script not found"; fi'),
-            (r'python3 scripts/generate-metrics\.py > metrics/content-metrics\.json',
-             r'if [ -f scripts/generate-metrics.py ]; then python3 scripts/generate-metrics.py > metrics/content-metrics.json; else echo "Skipping metrics generation - script not found"; fi'),
-            (r'python3 scripts/update-search-index\.py',
-             r'if [ -f scripts/update-search-index.py ]; then python3 scripts/update-search-index.py; else echo "Skipping search index update - script not found"; fi')
-        ]
-        
-        for old, new in replacements:
-            content = re.sub(old, new, content)
-        
-        # Pin actions and add permissions
-        content = re.sub(r'uses: actions/checkout@v3', 'uses: actions/checkout@b4ffde65f46336ab88eb53be808477a3936bae11 # v4', content)
-        content = re.sub(r'uses: actions/setup-node@v3', 'uses: actions/setup-node@60edb5dd545a775178f52524783378180af0d1f8 # v4', content)
-        
-        # Add permissions block
-        content = re.sub(
-            r'runs-on: ubuntu-latest\n    steps:',
-            r'runs-on: ubuntu-latest\n    permissions:\n      contents: read\n      pull-requests: read\n    steps:',
-            content
-        )
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
-        
-        return True
-    except Exception as e:
-        print(f"Error fixing {file_path}: {e}")
+    single = FixerPipeline()
+    rule = single.register('workflow-scripts', guard_workflow_scripts, [file_path])
+    result = single.fix_file(file_path, [rule])
+    if result.status in ('missing', 'error'):
+        print(f"Error fixing {file_path}: {result.error or 'file not found'}")
         return False
+    return True
+
+
+def main(argv=None):
+    """Fix workflow definitions across the repository"""
+    parser = argparse.ArgumentParser(description="Fix workflow script references and action pins")
+    parser.add_argument('paths', nargs='*', default=['.'],
+                        help="files or directories to fix (default: current directory)")
+    parser.add_argument('--config', default=CONFIG_FILE,
+                        help="review config providing include/exclude globs and the fixers' "
+                             "remediation scope (default: %(default)s)")
+    parser.add_argument('--check', action='store_true',
+                        help="report files that need fixing and exit 1 if any do; never write")
+    parser.add_argument('--diff', action='store_true',
+                        help="print a unified diff of the pending fixes; never write")
+    args = parser.parse_args(argv)
+
+    # In --diff mode stdout carries only the patch; messages go to stderr
+    out = sys.stderr if args.diff else sys.stdout
+    discovery = FileDiscovery.from_config(args.config)
+    pipeline = configured(workflow_pipeline, args.config)
+    failed = pending = False
+    for result in pipeline.run(discovery.expand(args.paths), write=not (args.check or args.diff),
+                               diff=args.diff):
+        if result.status in ('missing', 'error'):
+            print(f"Error fixing {result.path}: {result.error or 'file not found'}", file=out)
+            failed = True
+        elif result.status == 'would-fix':
+            print(f"Would fix workflow scripts in {result.path}", file=out)
+            pending = True
+        elif result.status == 'fixed':
+            print(f"Fixed workflow scripts in {result.path}", file=out)
+        if result.diff:
+            print(result.diff, end='')
+    return 1 if failed or (args.check and pending) else 0
 
-# Fix the workflow issues
-if fix_workflow_scripts('curriculum/day2_intermediate.md'):
-    print("Fixed workflow scripts in curriculum/day2_intermediate.md")
 
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Content metrics for the training material, as JSON
+
+    python3 scripts/generate-metrics.py > metrics/content-metrics.json
+    python3 scripts/generate-metrics.py --output metrics/content-metrics.json --jobs 0
+    python3 scripts/generate-metrics.py docs/guides --stale-days 90
+
+Walks docs/ and training/ once and reports, per markdown file and in
+total, word, heading, table, code-block and link counts, link density
+(links per 100 words) and staleness (days since last modified). Counts
+are cached in .content_metrics_cache.json by content hash, so only
+changed files are measured again (see remediation.content_metrics).
+"""
+import argparse
+import os
+import sys
+
+from remediation.content_metrics import (
+    CACHE_FILE, CONTENT_ROOTS, STALE_DAYS, MetricsCache, write_metrics_json,
+)
+from remediation.engine import resolve_jobs
+from remediation.fileio import atomic_writer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate content metrics for docs and training material")
+    parser.add_argument('paths', nargs='*',
+                        help=f"files or directories to measure (default: {' and '.join(CONTENT_ROOTS)})")
+    parser.add_argument('--output', '-o', metavar='FILE', help="write the report to FILE instead of stdout")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="measure changed files across N worker processes (0 = one per CPU)")
+    parser.add_argument('--stale-days', type=int, default=STALE_DAYS, metavar='N',
+                        help="flag files not modified for more than N days (default: %(default)s)")
+    parser.add_argument('--cache', default=CACHE_FILE, metavar='PATH',
+                        help="per-file counts from earlier runs (default: %(default)s)")
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help="measure every file and leave the cache untouched")
+    args = parser.parse_args(argv)
+    if not args.paths:
+        args.paths = [root for root in CONTENT_ROOTS if os.path.isdir(root)]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        jobs = resolve_jobs(args.jobs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    cache = MetricsCache(args.cache)
+    if args.output is None:
+        summary = write_metrics_json(sys.stdout, args.paths, cache, jobs, args.stale_days)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with atomic_writer(args.output) as out:
+            summary = write_metrics_json(out, args.paths, cache, jobs, args.stale_days)
+    cache.save()
+    print(f"Measured {summary['files']} files ({cache.measured} changed): {summary['words']} words, "
+          f"{summary['stale_files']} stale", file=sys.stderr)
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Convert metrics/daily/*.json into a columnar metrics store
+
+    python3 scripts/ingest_metrics.py                                  # metrics/daily -> metrics/cohort.tmcs
+    python3 scripts/ingest_metrics.py --metrics-dir cohort-7/daily --store metrics/cohort-7.tmcs
+    python3 scripts/ingest_metrics.py --compact                        # fold appended runs together
+
+Records already in the store are skipped, so the command can be re-run as
+new files arrive. Read the store with training_assessment.py --store.
+"""
+import argparse
+import sys
+
+from training_metrics import DEFAULT_METRICS_DIR
+from training_metrics.store import DEFAULT_STORE, ingest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest daily metrics JSON into a columnar store")
+    parser.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                        help="directory of daily metrics files (default: %(default)s)")
+    parser.add_argument('--store', default=DEFAULT_STORE,
+                        help="store file to create or append to (default: %(default)s)")
+    parser.add_argument('--compact', action='store_true',
+                        help="rewrite the store as one segment after ingesting, so each participant's "
+                             "rows are contiguous again")
+    args = parser.parse_args(argv)
+    try:
+        added, skipped = ingest(args.metrics_dir, args.store, args.compact)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+    print(f"Ingested {added} records into {args.store} ({skipped} already stored)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Shared remediation helpers for the scripts/ fixers
+
+The fixers can be called in-process instead of spawning the scripts:
+
+    from remediation import fix_text, fix_paths
+    fixed, applied = fix_text(content, 'docs/guide.md')
+    results = fix_paths(['docs'], write=False)
+    index, broken = check_links(['docs'])
+
+or run as ``python3 -m remediation`` from scripts/. Importing the package
+does no file I/O, and the rule modules are only loaded on first use.
+"""
+
+# Public name -> (submodule, attribute), resolved lazily on first access
+_EXPORTS = {
+    'fix_text': ('rules', 'pipeline.fix_text'),
+    'fix_stream': ('rules', 'pipeline.fix_stream'),
+    'fix_paths': ('cli', 'fix_paths'),
+    'check_links': ('links', 'check_links'),
+    'main': ('cli', 'main'),
+    'pipeline': ('rules', 'pipeline'),
+    'workflow_pipeline': ('rules', 'workflow_pipeline'),
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module_name, attribute = _EXPORTS[name]
+    value = importlib.import_module(f'.{module_name}', __name__)
+    for part in attribute.split('.'):
+        value = getattr(value, part)
+    globals()[name] = value
+    return value
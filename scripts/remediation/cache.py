@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Incremental fixing cache
+
+Remembers which files were clean under the current rule set, keyed by
+path, mtime, size and content hash. A file whose mtime and size are
+unchanged is skipped on stat alone; a file that was touched but whose
+bytes hash the same is skipped without being parsed. Any change to the
+rule set invalidates every entry.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from .fileio import atomic_write_text, locked
+
+CACHE_FILE = '.fix_defects_cache.json'
+CACHE_FORMAT = 1
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def ruleset_fingerprint(rules: Iterable) -> str:
+    """Hash of rule names, globs and the source of the modules defining them
+
+    Hashing the whole defining module (not just the function body) means an
+    edit to a helper a rule calls also invalidates the cache. The shared
+    helpers and rule data in this package (e.g. the action pin table) are
+    always included.
+    """
+    h = hashlib.sha256(f'format={CACHE_FORMAT}'.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(package_dir, name), 'rb') as f:
+                h.update(f.read())
+    sources: Dict[str, bytes] = {}
+    for rule in rules:
+        h.update(f'\0{rule.name}\0{rule.patterns!r}'.encode())
+        code = getattr(rule.transform, '__code__', None)
+        if code is None:
+            # Builtins and other callables without Python source
+            h.update(repr(rule.transform).encode())
+            continue
+        if code.co_filename not in sources:
+            try:
+                with open(code.co_filename, 'rb') as f:
+                    sources[code.co_filename] = f.read()
+            except OSError:
+                sources[code.co_filename] = code.co_code
+        h.update(sources[code.co_filename])
+    return h.hexdigest()
+
+
+class FixCache:
+    """Persistent record of files already clean under a given rule set"""
+
+    def __init__(self, path: str, ruleset: str):
+        self.path = path
+        self.ruleset = ruleset
+        self.root = os.path.dirname(os.path.abspath(path))
+        self.entries: Dict[str, List] = {}
+        self.seen: Set[str] = set()
+        self.touched: Set[str] = set()   # keys recorded or dropped by this run
+        self.dirty = False
+        self.entries = self._read()
+        if self.entries is None:
+            # Rules changed (or unreadable cache): start from scratch
+            self.entries = {}
+            self.dirty = os.path.exists(path)
+
+    def _read(self, f=None) -> Optional[Dict[str, List]]:
+        """Entries stored for this rule set, or None if there are none"""
+        try:
+            if f is None:
+                with open(self.path, 'rb') as f:
+                    data = json.load(f)
+            else:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('ruleset') != self.ruleset:
+            return None
+        return data.get('files', {})
+
+    def key(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    def is_clean(self, path: str) -> bool:
+        """True if path is known to be clean and does not need fixing"""
+        key = self.key(path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+
+        mtime_ns, size, digest = entry
+        if st.st_size != size:
+            return False
+        if st.st_mtime_ns == mtime_ns:
+            return True
+
+        # Touched but possibly unchanged: compare bytes, not parsed content
+        try:
+            with open(path, 'rb') as f:
+                same = content_digest(f.read()) == digest
+        except OSError:
+            return False
+        if same:
+            entry[0] = st.st_mtime_ns
+            self.touched.add(key)
+            self.dirty = True
+        return same
+
+    def record(self, path: str, mtime_ns: int, size: int, digest: str):
+        key = self.key(path)
+        self.seen.add(key)
+        self.entries[key] = [mtime_ns, size, digest]
+        self.touched.add(key)
+        self.dirty = True
+
+    def forget(self, path: str):
+        key = self.key(path)
+        if self.entries.pop(key, None) is not None:
+            self.touched.add(key)
+            self.dirty = True
+
+    def evict_deleted(self):
+        """Drop entries for files that no longer exist"""
+        for key in [k for k in self.entries if k not in self.seen]:
+            if not os.path.exists(os.path.join(self.root, key)):
+                del self.entries[key]
+                self.touched.add(key)
+                self.dirty = True
+
+    def save(self):
+        """Write the cache, merged with entries saved by concurrent runs"""
+        self.evict_deleted()
+        if not self.dirty:
+            return
+        with locked(self.path, create=True) as f:
+            stored = self._read(f)
+            if stored is not None:
+                # Keep what other runs saved; replay only this run's changes
+                for key in self.touched:
+                    if key in self.entries:
+                        stored[key] = self.entries[key]
+                    else:
+                        stored.pop(key, None)
+                self.entries = stored
+            data = {'format': CACHE_FORMAT, 'ruleset': self.ruleset, 'files': self.entries}
+            atomic_write_text(self.path, json.dumps(data, separators=(',', ':'), sort_keys=True))
+        self.touched.clear()
+        self.dirty = False
+
+
+def open_cache(path: Optional[str], rules: Iterable) -> Optional[FixCache]:
+    """FixCache for the given rules, or None when caching is disabled"""
+    if not path:
+        return None
+    return FixCache(path, ruleset_fingerprint(rules))
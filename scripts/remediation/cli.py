@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the defect fixers
+
+fix_paths() is the in-process equivalent of a fix_defects.py run: it
+discovers files, applies the rules and returns the per-file results
+without printing anything.
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from .cache import CACHE_FILE, open_cache
+from .discovery import CONFIG_FILE, FileDiscovery
+from .engine import FileResult, format_summary, resolve_jobs
+from .headings import INDEX_FILE
+from .links import MARKDOWN, broken_anchors
+from .rules import configured, pipeline
+from .watch import DEFAULT_DEBOUNCE, WATCH_ROOTS, WatchDaemon, open_watcher
+
+
+def fix_paths(paths: Sequence[str] = ('.',), config: str = CONFIG_FILE, jobs: int = 1,
+              cache: Optional[str] = None, write: bool = True, diff: bool = False) -> List[FileResult]:
+    """Fix every in-scope file under paths; returns results in discovery order"""
+    discovery = FileDiscovery.from_config(config)
+    scoped = configured(pipeline, config)
+    fix_cache = open_cache(cache, scoped.rules)
+    results = scoped.run(discovery.expand(paths), jobs=resolve_jobs(jobs), cache=fix_cache,
+                         write=write, diff=diff)
+    if fix_cache is not None:
+        fix_cache.save()
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply CodeRabbit defect fixes")
+    parser.add_argument('paths', nargs='*',
+                        help="files or directories to fix (default: current directory; "
+                             f"with --watch: {' and '.join(WATCH_ROOTS)})")
+    parser.add_argument('--config', default=CONFIG_FILE,
+                        help="review config providing include/exclude globs and the fixers' "
+                             "remediation scope (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="fix files across N worker processes (0 = one per CPU)")
+    parser.add_argument('--check', action='store_true',
+                        help="report files that need fixing and exit 1 if any do; never write")
+    parser.add_argument('--diff', action='store_true',
+                        help="print a unified diff of the pending fixes; never write")
+    parser.add_argument('--cache', default=CACHE_FILE, metavar='PATH',
+                        help="skip files already clean under the current rules (default: %(default)s)")
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help="re-check every file and leave the cache untouched")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and re-fix files as they change")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE, metavar='SECONDS',
+                        help="with --watch, wait for saves to settle this long (default: %(default)s)")
+    parser.add_argument('--poll', action='store_true',
+                        help="with --watch, poll mtimes instead of using inotify")
+    args = parser.parse_args(argv)
+    if args.watch and (args.check or args.diff):
+        parser.error("--watch cannot be combined with --check or --diff")
+    if not args.paths:
+        args.paths = list(WATCH_ROOTS) if args.watch else ['.']
+    return args
+
+
+def _report(result: FileResult):
+    if result.status == 'error':
+        print(f"Error fixing {result.path}: {result.error}", flush=True)
+    elif result.applied:
+        print(f"Fixed {', '.join(result.applied)} in {result.path} "
+              f"({result.elapsed * 1000:.0f} ms)", flush=True)
+
+
+def watch(args) -> int:
+    """Fix everything once, then re-fix files as they change until interrupted"""
+    roots = [path for path in args.paths if os.path.isdir(path)]
+    if not roots:
+        print(f"Error: no directories to watch in {', '.join(args.paths)}")
+        return 2
+
+    discovery = FileDiscovery.from_config(args.config)
+    # Start watching before the catch-up pass so no save is missed
+    watcher = open_watcher(roots, discovery, poll=args.poll)
+    scoped = configured(pipeline, args.config)
+    daemon = WatchDaemon(scoped, watcher, args.debounce,
+                         open_cache(args.cache, scoped.rules), report=_report)
+    try:
+        daemon.fix(discovery.expand(roots))
+        print(f"Watching {', '.join(roots)} ({watcher.name}); press Ctrl-C to stop", flush=True)
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+def main(argv=None):
+    """Run every registered rule, loading and saving each file once"""
+    args = parse_args(argv)
+    try:
+        resolve_jobs(args.jobs)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    if args.watch:
+        return watch(args)
+
+    dry_run = args.check or args.diff
+    # In --diff mode stdout carries only the patch; progress goes to stderr
+    log = functools.partial(print, file=sys.stderr) if args.diff else print
+
+    log("Starting systematic defect remediation...")
+
+    start = time.perf_counter()
+    results = fix_paths(args.paths, args.config, args.jobs, args.cache,
+                        write=not dry_run, diff=args.diff)
+    wall_time = time.perf_counter() - start
+    for result in results:
+        if result.status == 'missing':
+            log(f"File not found: {result.path}")
+        elif result.status == 'error':
+            log(f"Error fixing {result.path}: {result.error}")
+        elif result.status == 'would-fix':
+            log(f"Would fix {', '.join(result.applied)} in {result.path}")
+        elif result.applied:
+            log(f"Fixed {', '.join(result.applied)} in {result.path}")
+        if result.diff:
+            print(result.diff, end='')
+
+    log(format_summary(results, wall_time))
+    # Heading fixes change slugs; report links elsewhere that they broke
+    renamed = [r.path for r in results if r.status == 'fixed' and 'bold-headings' in r.applied
+               and MARKDOWN.match(r.path)]
+    if renamed:
+        index = os.path.join(os.path.dirname(args.cache), INDEX_FILE) if args.cache else None
+        for link in broken_anchors(renamed, index=index, jobs=resolve_jobs(args.jobs)):
+            log(f"Warning: {link.path}:{link.line} links to {link.target}, which no longer exists")
+    log("Defect remediation completed!")
+    if any(r.status == 'error' for r in results):
+        return 1
+    if args.check and any(r.status == 'would-fix' for r in results):
+        return 1
+    return 0
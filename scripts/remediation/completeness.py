@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Required-section checks for structured documents
+
+Each document type names the files it covers (globs relative to the
+repository root; a pattern without '/' matches names in any directory)
+and the sections they must have, either listed or taken from a template:
+a template's level-2 headings, other than placeholders such as
+"[Phase Name]", are its required sections. A template missing under the
+root is read from this repository's training/templates/, so another
+repository (e.g. a learner's HX-KB checkout) can be validated with --root.
+Headings are compared on their words, so "## 1. Overview" and
+"## 📋 Overview" both satisfy "Overview".
+
+Every matched file's headings come from one parse, shared with the link
+checker through the HeadingIndex, so files unchanged since the last run
+are not read at all and the rest are parsed across worker processes.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .discovery import DEFAULT_EXCLUDE, FileDiscovery, GlobSet
+from .headings import HeadingIndex, MarkdownDoc, read_markdown
+
+TEMPLATE_DIR = 'training/templates'
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+class DocumentType(NamedTuple):
+    name: str
+    patterns: Tuple[str, ...]
+    template: Optional[str] = None        # path relative to the root
+    sections: Tuple[str, ...] = ()        # required in addition to the template's
+
+
+DOCUMENT_TYPES = (
+    DocumentType('specification', ('*-spec.md', '*-specification.md', '**/specs/**/*.md'),
+                 template=f'{TEMPLATE_DIR}/specification-template.md'),
+    DocumentType('implementation-plan', ('*-plan.md', '*implementation-plan*.md', '**/plans/**/*.md'),
+                 template=f'{TEMPLATE_DIR}/implementation-plan-template.md'),
+    DocumentType('adr', ('ADR-*.md', 'adr-*.md', '**/adr/**/*.md', '**/decisions/**/*.md'),
+                 template=f'{TEMPLATE_DIR}/adr-template.md'),
+    DocumentType('sprint-summary', ('**/sprints/sprint-*-summary.md',),
+                 sections=('Overview', 'Key Achievements', 'Lessons Learned')),
+)
+
+
+class Result(NamedTuple):
+    path: str
+    type: str
+    missing: Tuple[str, ...]
+    error: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing and self.error is None
+
+
+def heading_key(text: str) -> str:
+    """Words of a heading, lowercased, without leading numbering"""
+    words = _WORD.findall(text.lower())
+    while words and words[0].isdigit():
+        words.pop(0)
+    return ' '.join(words)
+
+
+def template_sections(doc: MarkdownDoc) -> Tuple[str, ...]:
+    """Level-2 headings of a template, skipping [placeholder] headings"""
+    return tuple(h.text for h in doc.headings if h.level == 2 and '[' not in h.text)
+
+
+def load_types(path: str) -> Tuple[DocumentType, ...]:
+    """Document types from a JSON list of {"name", "patterns", "template", "sections"}"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of document types")
+    types = []
+    for entry in data:
+        if not isinstance(entry, dict) or 'name' not in entry or not entry.get('patterns'):
+            raise ValueError(f"{path}: every document type needs a name and patterns")
+        types.append(DocumentType(entry['name'], tuple(entry['patterns']), entry.get('template'),
+                                  tuple(entry.get('sections', ()))))
+    return tuple(types)
+
+
+class CompletenessValidator:
+    """Document types resolved against a root, with their templates read once"""
+
+    def __init__(self, types: Sequence[DocumentType] = DOCUMENT_TYPES, root: str = '.'):
+        self.root = root
+        self.rules: List[Tuple[DocumentType, GlobSet, Tuple[str, ...]]] = []
+        self.templates = set()
+        for doc_type in types:
+            required = list(doc_type.sections)
+            if doc_type.template:
+                self.templates.add(doc_type.template)
+                path = os.path.join(root, doc_type.template)
+                if not os.path.exists(path):
+                    path = os.path.join(REPO_ROOT, doc_type.template)
+                template = read_markdown(path)
+                required[:0] = template_sections(template)
+            self.rules.append((doc_type, GlobSet(doc_type.patterns), tuple(dict.fromkeys(required))))
+
+    def match(self, rel_path: str) -> Optional[Tuple[DocumentType, Tuple[str, ...]]]:
+        """(type, required sections) of the first type covering rel_path"""
+        if rel_path in self.templates:
+            return None
+        for doc_type, globs, required in self.rules:
+            if globs.match(rel_path):
+                return doc_type, required
+        return None
+
+    @staticmethod
+    def missing(doc: MarkdownDoc, required: Iterable[str]) -> Tuple[str, ...]:
+        present = {heading_key(h.text) for h in doc.headings}
+        return tuple(section for section in required if heading_key(section) not in present)
+
+    def validate(self, targets: Iterable[str] = ('.',), jobs: int = 1,
+                 index: Optional[str] = None) -> List[Result]:
+        """Results for every typed markdown file under targets, in walk order"""
+        headings = HeadingIndex(index, self.root)
+        discovery = FileDiscovery(('*.md', '*.markdown'), DEFAULT_EXCLUDE)
+        typed: Dict[str, Tuple[str, DocumentType, Tuple[str, ...]]] = {}
+        for path in discovery.expand(targets):
+            key = headings.key(path)
+            matched = self.match(key)
+            if matched is not None and key not in typed:
+                typed[key] = (path, *matched)
+        headings.update([path for path, _, _ in typed.values()], jobs)
+        headings.save()
+
+        results = []
+        for key, (_, doc_type, required) in typed.items():
+            doc = headings.docs.get(key)
+            if doc is None:
+                results.append(Result(key, doc_type.name, (), headings.errors.get(key, "not readable")))
+            else:
+                results.append(Result(key, doc_type.name, self.missing(doc, required)))
+        return results
+
+
+def report(results: Sequence[Result]) -> Dict:
+    """Machine-readable summary of a validation run"""
+    return {
+        'checked': len(results),
+        'complete': sum(1 for r in results if r.complete),
+        'incomplete': sum(1 for r in results if not r.complete),
+        'files': [{'path': r.path, 'type': r.type, 'complete': r.complete, 'missing': list(r.missing),
+                   **({'error': r.error} if r.error else {})} for r in results],
+    }
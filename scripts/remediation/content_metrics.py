@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Content metrics for the markdown in docs/ and training/
+
+measure() reduces one document to counts - words, headings, tables, code
+blocks and links - from a single tokenization. MetricsCache keeps those
+counts per file, keyed by mtime, size and content hash like the fix
+cache, so a run re-measures only files whose bytes changed and the rest
+cost one stat each. Staleness comes from the file's mtime at report time
+and is never cached.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cache import content_digest
+from .discovery import DEFAULT_EXCLUDE, FileDiscovery
+from .engine import normalize_path
+from .fileio import atomic_write_text, decode_text, locked
+from .headings import parse_markdown
+from .mdblocks import BLANK, CODE, FENCE, HEADING, TABLE, blocks_for
+
+CONTENT_ROOTS = ('docs', 'training')
+CACHE_FILE = '.content_metrics_cache.json'
+CACHE_FORMAT = 1
+STALE_DAYS = 180
+
+COUNTS = ('words', 'headings', 'tables', 'code_blocks', 'links')
+_DAY = 86400
+
+
+def measure(text: str) -> Dict[str, int]:
+    """Counts for one markdown document; words exclude code and table markup"""
+    blocks = blocks_for(text)
+    counts = dict.fromkeys(COUNTS, 0)
+    counts['tables'] = sum(1 for block in blocks.blocks() if block.kind == TABLE)
+    fences = 0
+    for kind, line in blocks.tokens():
+        if kind == FENCE:
+            fences += 1
+        if kind in (CODE, FENCE, BLANK):
+            continue
+        if kind == HEADING:
+            counts['headings'] += 1
+            line = line.lstrip(' #')
+        elif kind == TABLE:
+            line = line.replace('|', ' ')
+        counts['words'] += sum(1 for word in line.split() if any(c.isalnum() for c in word))
+    counts['code_blocks'] = (fences + 1) // 2    # an unclosed fence still opens a block
+    counts['links'] = len(parse_markdown(text).links)
+    return counts
+
+
+def link_density(counts: Dict[str, int]) -> float:
+    """Links per 100 words"""
+    return round(100 * counts['links'] / counts['words'], 2) if counts['words'] else 0.0
+
+
+def metrics_fingerprint() -> str:
+    """Hash of the modules that decide what measure() returns"""
+    h = hashlib.sha256(f'format={CACHE_FORMAT}'.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in ('content_metrics.py', 'headings.py', 'mdblocks.py', 'mdtable.py'):
+        with open(os.path.join(package_dir, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _measure_file(path: str, digest: Optional[str]):
+    """((mtime_ns, size, digest, counts or None if digest is unchanged), error)"""
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        new_digest = content_digest(raw)
+        if new_digest == digest:
+            return (st.st_mtime_ns, st.st_size, digest, None), None
+        return (st.st_mtime_ns, st.st_size, new_digest, measure(decode_text(raw))), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class MetricsCache:
+    """Per-file counts from earlier runs; with no path nothing is persisted"""
+
+    def __init__(self, path: Optional[str] = CACHE_FILE):
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path or CACHE_FILE))
+        self.fingerprint = metrics_fingerprint()
+        self.entries: Dict[str, List] = self._read() or {}   # key -> [mtime_ns, size, digest, counts]
+        self.touched: Set[str] = set()
+        self.measured = 0
+
+    def _read(self, f=None) -> Optional[Dict[str, List]]:
+        if self.path is None:
+            return None
+        try:
+            if f is None:
+                with open(self.path, 'rb') as f:
+                    data = json.load(f)
+            else:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('fingerprint') != self.fingerprint:
+            return None
+        return data.get('files', {})
+
+    def key(self, path: str) -> str:
+        return normalize_path(os.path.relpath(os.path.abspath(path), self.root))
+
+    def counts(self, paths: Iterable[str], jobs: int = 1) -> Iterator[Tuple[str, os.stat_result, Dict]]:
+        """(path, stat, counts or error) for each path, in order
+
+        Paths whose entry matches on mtime and size are answered from the
+        cache; the rest are read in batches, across jobs processes.
+        """
+        batch = []
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        try:
+            for path in paths:
+                batch.append(path)
+                if len(batch) >= 256 * max(jobs, 1):
+                    yield from self._counts(batch, executor)
+                    batch = []
+            yield from self._counts(batch, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _counts(self, paths: List[str], executor) -> Iterator[Tuple[str, os.stat_result, Dict]]:
+        stats, stale = [], []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                stats.append((path, None, {'error': f"{type(e).__name__}: {e}"}))
+                continue
+            entry = self.entries.get(self.key(path))
+            if entry is not None and entry[:2] == [st.st_mtime_ns, st.st_size]:
+                stats.append((path, st, entry[3]))
+            else:
+                stats.append((path, st, None))
+                stale.append((path, entry[2] if entry is not None else None))
+
+        args = ([p for p, _ in stale], [d for _, d in stale])
+        if executor is None or len(stale) < 2:
+            results = map(_measure_file, *args)
+        else:
+            results = executor.map(_measure_file, *args, chunksize=max(1, len(stale) // 32))
+        measured = {}
+        for (path, _), (indexed, error) in zip(stale, results):
+            key = self.key(path)
+            self.touched.add(key)
+            if indexed is None:
+                self.entries.pop(key, None)
+                measured[path] = {'error': error}
+                continue
+            mtime_ns, size, digest, counts = indexed
+            if counts is None:
+                counts = self.entries[key][3]
+            else:
+                self.measured += 1
+            self.entries[key] = [mtime_ns, size, digest, counts]
+            measured[path] = counts
+
+        for path, st, counts in stats:
+            yield path, st, counts if counts is not None else measured[path]
+
+    def evict_deleted(self, seen: Iterable[str]):
+        """Drop entries, other than the seen keys, for files that no longer exist"""
+        seen = set(seen)
+        for key in [k for k in self.entries if k not in seen]:
+            if not os.path.exists(os.path.join(self.root, key)):
+                del self.entries[key]
+                self.touched.add(key)
+
+    def save(self):
+        """Write the cache, merged with entries saved by concurrent runs"""
+        if self.path is None or not self.touched:
+            return
+        with locked(self.path, create=True) as f:
+            stored = self._read(f)
+            if stored is not None:
+                for key in self.touched:
+                    if key in self.entries:
+                        stored[key] = self.entries[key]
+                    else:
+                        stored.pop(key, None)
+                self.entries = stored
+            data = {'format': CACHE_FORMAT, 'fingerprint': self.fingerprint, 'files': self.entries}
+            atomic_write_text(self.path, json.dumps(data, separators=(',', ':'), sort_keys=True))
+        self.touched.clear()
+
+
+class Summary:
+    """Running totals over the measured files"""
+
+    def __init__(self):
+        self.totals = dict.fromkeys(COUNTS, 0)
+        self.files = 0
+        self.errors = 0
+        self.stale = 0
+        self.oldest: Optional[Tuple[float, str]] = None
+
+    def add(self, record: Dict):
+        if 'error' in record:
+            self.errors += 1
+            return
+        self.files += 1
+        for name in COUNTS:
+            self.totals[name] += record[name]
+        self.stale += record['stale']
+        if self.oldest is None or record['age_days'] > self.oldest[0]:
+            self.oldest = (record['age_days'], record['path'])
+
+    def as_dict(self) -> Dict:
+        summary = {'files': self.files, **self.totals, 'link_density': link_density(self.totals),
+                   'stale_files': self.stale, 'errors': self.errors}
+        if self.oldest is not None:
+            summary['oldest'] = {'path': self.oldest[1], 'age_days': self.oldest[0]}
+        return summary
+
+
+def iter_file_metrics(roots: Iterable[str] = CONTENT_ROOTS, cache: Optional[MetricsCache] = None,
+                      jobs: int = 1, stale_days: int = STALE_DAYS,
+                      now: Optional[float] = None) -> Iterator[Dict]:
+    """Metrics for every markdown file under roots, streamed in walk order"""
+    cache = cache if cache is not None else MetricsCache(None)
+    now = time.time() if now is None else now
+    discovery = FileDiscovery(('*.md', '*.markdown'), DEFAULT_EXCLUDE)
+    seen = []
+
+    def paths():
+        for root in roots:
+            for path in discovery.expand([root]):
+                seen.append(cache.key(path))
+                yield path
+
+    for path, st, counts in cache.counts(paths(), jobs):
+        record = {'path': normalize_path(path)}
+        if 'error' in counts:
+            record['error'] = counts['error']
+        else:
+            age_days = round(max(0.0, now - st.st_mtime) / _DAY, 1)
+            record.update(counts, link_density=link_density(counts), age_days=age_days,
+                          stale=age_days > stale_days)
+        yield record
+    cache.evict_deleted(seen)
+
+
+def write_metrics_json(out, roots: Iterable[str] = CONTENT_ROOTS, cache: Optional[MetricsCache] = None,
+                       jobs: int = 1, stale_days: int = STALE_DAYS) -> Dict:
+    """Stream {"generated", "stale_days", "files": [...], "summary"} to out; returns the summary
+
+    Each file's entry is written as soon as it is measured, so memory
+    stays flat however many pages there are.
+    """
+    summary = Summary()
+    out.write('{"generated": %s, "stale_days": %d, "files": [' % (
+        json.dumps(time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())), stale_days))
+    for i, record in enumerate(iter_file_metrics(roots, cache, jobs, stale_days)):
+        summary.add(record)
+        out.write(('\n  ' if i == 0 else ',\n  ') + json.dumps(record))
+    result = summary.as_dict()
+    out.write('\n], "summary": %s}\n' % json.dumps(result))
+    return result
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Append-only defect event store
+
+Every change to a defect is one JSON line appended to the shard for its PR
+(<store>/pr-0012.jsonl):
+
+    {"id": "DEF-101", "pr": "12", "at": "2025-10-01T09:30:00",
+     "set": {"Status": "Resolved", "Resolution Notes": "Pinned", "Date Closed": "2025-10-01"}}
+
+An append is a single O_APPEND write, so concurrent CI jobs add records
+without rewriting or clobbering each other. The markdown log is a view:
+compact() folds the events into the latest state of each defect and
+regenerates it, and does nothing when no shard has grown since the last
+compaction (shards only grow, so their sizes identify their contents).
+Only the defect table is regenerated: a log's title, preamble and any
+prose after the table are kept, and a table row for a defect the store
+does not hold stops the compaction rather than being dropped.
+"""
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .fileio import atomic_write_text, locked
+from .mdtable import MarkdownDocument, render_row
+
+DEFAULT_STORE = 'defect-events'
+STAMP_FILE = '.compacted.json'
+
+# Column order of the generated log; columns only seen in events follow
+COLUMNS = ('Defect ID', 'PR #', 'Actionable Comment / Description', 'Severity', 'Owner',
+           'Status', 'Resolution Notes', 'Date Opened', 'Date Closed')
+CLOSED_STATUSES = ('Resolved', 'Closed', "Won't Fix")
+
+LOG_TITLE = 'CodeRabbit Review Defect Log'
+PR_TITLE = 'CodeRabbit PR #{pr} Review Defect Log'
+
+_SHARD = re.compile(r'pr-(.+)\.jsonl\Z')
+_BARE_PIPE = re.compile(r'(?<!\\)\|')
+
+
+def _today() -> str:
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _shard_key(pr: str) -> Tuple[int, str]:
+    """Numeric PRs in numeric order, anything else after them"""
+    return (int(pr), '') if pr.isdigit() else (1 << 62, pr)
+
+
+def render_table(rows: List[Dict[str, str]], columns: List[str]) -> List[str]:
+    header = '| ' + ' | '.join(columns) + ' |'
+    separator = '|' + '|'.join('-' * (len(name) + 2) for name in columns) + '|'
+    return [header, separator] + [
+        render_row([_BARE_PIPE.sub(r'\\|', row.get(name, '')) for name in columns]) for row in rows]
+
+
+class DefectStore:
+    """A directory of per-PR JSONL shards"""
+
+    def __init__(self, root: str = DEFAULT_STORE):
+        self.root = root
+
+    def shard_path(self, pr) -> str:
+        pr = str(pr).strip().lstrip('#')
+        if not re.fullmatch(r'[\w.-]+', pr):
+            raise ValueError(f"Invalid PR number: {pr!r}")
+        name = f'pr-{int(pr):04d}.jsonl' if pr.isdigit() else f'pr-{pr}.jsonl'
+        return os.path.join(self.root, name)
+
+    def shards(self) -> List[Tuple[str, str]]:
+        """(pr, path) for every shard, in PR order"""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        found = []
+        for name in names:
+            match = _SHARD.match(name)
+            if match:
+                pr = match.group(1)
+                if pr.isdigit():
+                    pr = str(int(pr))
+                found.append((pr, os.path.join(self.root, name)))
+        return sorted(found, key=lambda item: _shard_key(item[0]))
+
+    # Writing
+
+    def append(self, defect_id: str, pr, fields: Dict[str, str], at: Optional[str] = None):
+        """Append one event in a single write; O(1) regardless of store size"""
+        path = self.shard_path(pr)
+        event = {'id': defect_id, 'pr': str(pr).lstrip('#'),
+                 'at': at or datetime.now().isoformat(timespec='seconds'), 'set': fields}
+        data = (json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        os.makedirs(self.root, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                # O_APPEND keeps records whole; the lock also orders them
+                # against a concurrent compaction reading the shard
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def open_defect(self, defect_id: str, pr, description: str, severity: str,
+                    owner: str = 'System', date: Optional[str] = None):
+        self.append(defect_id, pr, {
+            'Defect ID': defect_id, 'PR #': str(pr).lstrip('#'),
+            'Actionable Comment / Description': description, 'Severity': severity,
+            'Owner': owner, 'Status': 'Open', 'Resolution Notes': '',
+            'Date Opened': date or _today(), 'Date Closed': '',
+        })
+
+    def set_status(self, defect_id: str, pr, status: str, notes: str = '',
+                   date: Optional[str] = None):
+        fields = {'Status': status,
+                  'Date Closed': (date or _today()) if status in CLOSED_STATUSES else ''}
+        if notes:
+            fields['Resolution Notes'] = notes
+        self.append(defect_id, pr, fields)
+
+    # Reading
+
+    def events(self, path: str) -> Iterator[dict]:
+        """Events of one shard in append order
+
+        A final line without a newline is an append still in progress and
+        is not read yet.
+        """
+        with open(path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    return
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{path}:{number}: invalid event: {e}") from None
+
+    def fold(self, pr=None, shards: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, str]]:
+        """Latest state of every defect (or one PR's), in order of first event
+
+        If given, shards is filled with defect ID -> PR of the shard holding
+        its events, which a blank or edited 'PR #' field does not change.
+        """
+        paths = [self.shard_path(pr)] if pr is not None else [path for _, path in self.shards()]
+        state: Dict[str, Dict[str, str]] = {}
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            for event in self.events(path):
+                record = state.setdefault(event['id'], {'Defect ID': event['id'], 'PR #': event.get('pr', '')})
+                record.update(event.get('set', {}))
+                if shards is not None:
+                    shards.setdefault(event['id'], event.get('pr', ''))
+        return state
+
+    def locate(self, defect_id: str) -> Optional[str]:
+        """PR whose shard holds defect_id (scans the shards)"""
+        for pr, path in self.shards():
+            if any(event['id'] == defect_id for event in self.events(path)):
+                return pr
+        return None
+
+    def version(self) -> Dict[str, int]:
+        """Shard name -> size; changes exactly when an event is appended"""
+        return {os.path.basename(path): os.path.getsize(path) for _, path in self.shards()}
+
+    # Views
+
+    def render(self, pr=None, existing: Optional[str] = None,
+               state: Optional[Dict[str, Dict[str, str]]] = None) -> str:
+        """The log (or one PR's view); given the current file, only its defect table is replaced"""
+        state = self.fold(pr) if state is None else state
+        columns = list(COLUMNS)
+        for record in state.values():
+            columns.extend(name for name in record if name not in columns)
+        table_lines = render_table(list(state.values()), columns)
+        if existing is not None:
+            table = MarkdownDocument.parse(existing).find_table('Defect ID', 'Status')
+            if table is not None:
+                lines = existing.split('\n')
+                return '\n'.join(lines[:table.start] + table_lines + lines[table.end:])
+        title = PR_TITLE.format(pr=pr) if pr is not None else LOG_TITLE
+        return '\n'.join([f'# {title}', ''] + table_lines) + '\n'
+
+    def _view(self, path: str, pr=None, force: bool = False) -> str:
+        """New text of one output; refuses to drop rows for defects the store does not hold"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = f.read()
+        except FileNotFoundError:
+            existing = None
+        state = self.fold(pr)
+        if existing is not None and not force:
+            table = MarkdownDocument.parse(existing).find_table('Defect ID', 'Status')
+            unknown = [] if table is None else [
+                defect_id for defect_id in (table.get(row, 'Defect ID') for row in table.rows)
+                if defect_id not in state]
+            if unknown:
+                shown = ', '.join(unknown[:3]) + (', ...' if len(unknown) > 3 else '')
+                raise ValueError(f"{path} lists {len(unknown)} defects that {self.root} does not hold "
+                                 f"({shown}); import the log first, or compact with --force to drop them")
+        return self.render(pr, existing, state)
+
+    def _read_stamp(self) -> dict:
+        try:
+            with open(os.path.join(self.root, STAMP_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_stale(self, log_path: str, views_dir: Optional[str] = None) -> bool:
+        stamp = self._read_stamp()
+        outputs = [log_path] + ([views_dir] if views_dir else [])
+        return (stamp.get('version') != self.version()
+                or stamp.get('outputs') != [os.path.abspath(p) for p in outputs]
+                or not all(os.path.exists(p) for p in outputs))
+
+    def compact(self, log_path: str, views_dir: Optional[str] = None, force: bool = False) -> bool:
+        """Regenerate the log (and per-PR views) if events arrived; True if written
+
+        Concurrent compactions are serialized on the stamp file, so the
+        second one finds the log already up to date. A defect table row the
+        store does not hold (e.g. the store was never seeded with import)
+        raises ValueError before anything is written, unless force is set.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with locked(os.path.join(self.root, STAMP_FILE), create=True):
+            if not force and not self.is_stale(log_path, views_dir):
+                return False
+            version = self.version()
+            views = [(log_path, None)]
+            if views_dir:
+                views += [(os.path.join(views_dir, f'PR-{pr}.md'), pr) for pr, _ in self.shards()]
+            texts = [(path, self._view(path, pr, force)) for path, pr in views]
+            if views_dir:
+                os.makedirs(views_dir, exist_ok=True)
+            for path, text in texts:
+                atomic_write_text(path, text)
+            outputs = [os.path.abspath(log_path)] + ([os.path.abspath(views_dir)] if views_dir else [])
+            atomic_write_text(os.path.join(self.root, STAMP_FILE),
+                              json.dumps({'version': version, 'outputs': outputs}, sort_keys=True))
+        return True
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Repository-wide file discovery
+
+Walks the tree once with os.scandir, pruning excluded directories before
+descending into them, and streams every included file to the caller. The
+include/exclude globs default to the review scope in .coderabbit.yaml;
+its remediation block (see load_fix_scope) sets which of those files
+each fixer rule may change.
+"""
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+CONFIG_FILE = '.coderabbit.yaml'
+
+DEFAULT_INCLUDE = ('**/*.md', '**/*.py', '**/*.sh', '**/*.yaml', '**/*.yml', '**/*.json', '**/*.txt')
+DEFAULT_EXCLUDE = ('node_modules/**', '.git/**', '*.log', '**/__pycache__/**')
+
+
+def glob_to_regex(pattern: str) -> Pattern:
+    """Compile a glob into a regex over '/'-separated relative paths
+
+    '**/' matches zero or more directories, '*' and '?' never cross a '/'.
+    A pattern without a '/' matches the file name in any directory.
+    """
+    if '/' not in pattern:
+        pattern = '**/' + pattern
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:[^/]+/)*')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+class GlobSet:
+    """A group of globs matched as one alternation"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        if self.patterns:
+            self._regex = re.compile('|'.join(f'(?:{glob_to_regex(p).pattern})' for p in self.patterns))
+        else:
+            self._regex = None
+
+    def match(self, path: str) -> bool:
+        return self._regex is not None and self._regex.match(path) is not None
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+
+def load_scope(config_path: str = CONFIG_FILE) -> Tuple[List[str], List[str]]:
+    """Read reviews.scope include/exclude patterns from .coderabbit.yaml
+
+    Only the two pattern lists are needed, so this reads them directly
+    instead of depending on a YAML library. Missing config or lists fall
+    back to the defaults above.
+    """
+    lists = {'include_patterns': [], 'exclude_patterns': []}
+    try:
+        with open(config_path, 'r') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return list(DEFAULT_INCLUDE), list(DEFAULT_EXCLUDE)
+
+    current = None
+    current_indent = 0
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(line.lstrip())
+        key = stripped.rstrip(':')
+        if stripped.endswith(':') and key in lists:
+            current, current_indent = key, indent
+            continue
+        if current and indent >= current_indent and stripped.startswith('- '):
+            lists[current].append(stripped[2:].strip().strip('"\''))
+        elif current and indent <= current_indent:
+            current = None
+
+    include = lists['include_patterns'] or list(DEFAULT_INCLUDE)
+    exclude = lists['exclude_patterns'] or list(DEFAULT_EXCLUDE)
+    return include, exclude
+
+
+def load_fix_scope(config_path: str = CONFIG_FILE) -> Tuple[bool, Dict[str, List[str]]]:
+    """Read the fixers' remediation block from .coderabbit.yaml
+
+        remediation:
+          scope: repository        # every rule fixes all files of its type
+          rule_patterns:           # or give single rules their own globs
+            markdown-tables:
+              - "**/docs/*.md"
+
+    Returns (repository_wide, rule name -> globs). Like every rule glob
+    these match the paths as given, so start them with '**/' to match from
+    any directory. Without the block each rule fixes only its default
+    target files.
+    """
+    wide = False
+    patterns: Dict[str, List[str]] = {}
+    try:
+        with open(config_path, 'r') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return wide, patterns
+
+    block = rules = None        # indents of 'remediation:' and 'rule_patterns:'
+    current = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if block is None or indent <= block:
+            block = indent if stripped == 'remediation:' else None
+            rules = current = None
+        elif rules is not None and indent > rules:
+            if stripped.startswith('- ') and current is not None:
+                patterns[current].append(stripped[2:].strip().strip('"\''))
+            elif stripped.endswith(':'):
+                current = stripped[:-1].strip().strip('"\'')
+                patterns.setdefault(current, [])
+        else:
+            rules = current = None
+            key, _, value = stripped.partition(':')
+            if key == 'rule_patterns':
+                rules = indent
+            elif key == 'scope':
+                wide = value.strip().strip('"\'') == 'repository'
+    return wide, patterns
+
+
+class FileDiscovery:
+    """Single directory walk producing the files in scope"""
+
+    def __init__(self, include: Sequence[str] = DEFAULT_INCLUDE,
+                 exclude: Sequence[str] = DEFAULT_EXCLUDE):
+        self.include = GlobSet(include)
+        self.exclude = GlobSet(exclude)
+        # 'dir/**' excludes prune the whole directory at walk time
+        self.prune = GlobSet([p[:-3] for p in exclude if p.endswith('/**')])
+
+    @classmethod
+    def from_config(cls, config_path: str = CONFIG_FILE) -> 'FileDiscovery':
+        include, exclude = load_scope(config_path)
+        return cls(include, exclude)
+
+    def wanted(self, rel_path: str) -> bool:
+        return self.include.match(rel_path) and not self.exclude.match(rel_path)
+
+    def walk(self, root: str = '.') -> Iterator[str]:
+        """Yield included files under root as '/'-separated relative paths
+
+        Entries are visited in sorted order so runs are deterministic.
+        """
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+            try:
+                with os.scandir(abs_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if not self.prune.match(rel_path):
+                        subdirs.append(rel_path)
+                elif self.wanted(rel_path):
+                    yield os.path.join(root, rel_path) if root != '.' else rel_path
+            stack.extend(reversed(subdirs))
+
+    def directories(self, root: str = '.') -> Iterator[str]:
+        """Yield root and every directory under it that the walk would enter"""
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            yield directory
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            rel_dir = os.path.relpath(directory, root).replace(os.sep, '/')
+            for entry in reversed(entries):
+                rel_path = entry.name if rel_dir == '.' else f'{rel_dir}/{entry.name}'
+                try:
+                    if entry.is_dir(follow_symlinks=False) and not self.prune.match(rel_path):
+                        stack.append(entry.path)
+                except OSError:
+                    continue
+
+    def expand(self, targets: Sequence[str]) -> Iterator[str]:
+        """Walk directories and pass explicit files through unchanged"""
+        for target in targets:
+            if os.path.isdir(target):
+                yield from self.walk(target)
+            else:
+                yield target
+
+
+def discover(root: str = '.', config_path: Optional[str] = None) -> Iterator[str]:
+    """Stream the files in review scope under root"""
+    if config_path is None:
+        config_path = os.path.join(root, CONFIG_FILE)
+    return FileDiscovery.from_config(config_path).walk(root)
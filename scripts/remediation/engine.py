@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Single-pass fixer pipeline
+
+Rules register as transforms over an in-memory buffer. Each target file is
+read once, every rule that applies to it runs over the same buffer, and the
+file is written back once - and only if the content actually changed. In
+dry-run mode nothing is written; the result carries the would-be diff.
+
+A rule may also register a line-stream form. Files of at least
+stream_threshold bytes whose rules all have one are piped line by line
+through the chained streams into a temporary file instead, so memory
+stays flat however large the file is (no diff is produced for them).
+"""
+import difflib
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TextIO, Tuple
+
+from .cache import FixCache, content_digest
+from .discovery import GlobSet
+from .fileio import atomic_write_bytes, decode_text, locked, stream_rewrite
+
+Transform = Callable[[str], str]
+LineTransform = Callable[[Iterable[str]], Iterable[str]]
+
+# Files this large are streamed when every rule for them can be
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+
+def normalize_path(path: str) -> str:
+    """'/'-separated form of a path used for glob matching"""
+    return os.path.normpath(path).replace(os.sep, '/').lstrip('/')
+
+
+class Rule:
+    """A named text transform, its optional line-stream form, and the file globs it applies to"""
+    __slots__ = ('name', 'transform', 'stream', 'patterns', '_globs')
+
+    def __init__(self, name: str, transform: Transform, patterns: Iterable[str],
+                 stream: Optional[LineTransform] = None):
+        self.name = name
+        self.transform = transform
+        self.stream = stream
+        self.patterns = tuple(normalize_path(p) for p in patterns)
+        self._globs = GlobSet(self.patterns)
+
+    def applies_to(self, path: str) -> bool:
+        return self._globs.match(normalize_path(path))
+
+
+class FileResult:
+    """Outcome of running the pipeline over one file"""
+    __slots__ = ('path', 'status', 'applied', 'timings', 'elapsed', 'error',
+                 'mtime_ns', 'size', 'digest', 'diff')
+
+    def __init__(self, path: str, status: str = 'unchanged'):
+        self.path = path
+        self.status = status
+        self.applied: List[str] = []
+        self.timings: Dict[str, float] = {}
+        self.elapsed = 0.0
+        self.error: Optional[str] = None
+        # Final on-disk state, recorded for the incremental cache
+        self.mtime_ns = 0
+        self.size = 0
+        self.digest = ''
+        self.diff: Optional[str] = None
+
+
+class _TrackedStream:
+    """One rule's line stream, noting whether it changed anything"""
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.source = hashlib.sha256()
+        self.output = hashlib.sha256()
+
+    def _consume(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            self.source.update(line.encode('utf-8') + b'\n')
+            yield line
+
+    def __call__(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in self.rule.stream(self._consume(lines)):
+            self.output.update(line.encode('utf-8') + b'\n')
+            yield line
+
+    @property
+    def changed(self) -> bool:
+        return self.source.digest() != self.output.digest()
+
+
+class FixerPipeline:
+    """Ordered collection of rules applied file by file"""
+
+    def __init__(self, stream_threshold: int = STREAM_THRESHOLD):
+        self.rules: List[Rule] = []
+        self.stream_threshold = stream_threshold
+
+    def register(self, name: str, transform: Transform, patterns: Iterable[str],
+                 stream: Optional[LineTransform] = None) -> Rule:
+        """Register a transform (and optionally its line-stream form) for files matching the given globs"""
+        if any(rule.name == name for rule in self.rules):
+            raise ValueError(f"Duplicate rule name: {name}")
+        rule = Rule(name, transform, patterns, stream)
+        self.rules.append(rule)
+        return rule
+
+    def rule(self, name: str, patterns: Iterable[str], stream: Optional[LineTransform] = None):
+        """Decorator form of register()"""
+        def decorator(transform: Transform) -> Transform:
+            self.register(name, transform, patterns, stream)
+            return transform
+        return decorator
+
+    def scoped(self, patterns: Mapping[str, Iterable[str]]) -> 'FixerPipeline':
+        """Copy of the pipeline with the named rules' globs replaced"""
+        scoped = FixerPipeline(self.stream_threshold)
+        for rule in self.rules:
+            scoped.register(rule.name, rule.transform, patterns.get(rule.name, rule.patterns), rule.stream)
+        return scoped
+
+    def rules_for(self, path: str) -> List[Rule]:
+        return [rule for rule in self.rules if rule.applies_to(path)]
+
+    def apply(self, content: str, rules: Iterable[Rule], result: FileResult) -> str:
+        """Run rules over an in-memory buffer, recording per-rule timings"""
+        for rule in rules:
+            start = time.perf_counter()
+            updated = rule.transform(content)
+            result.timings[rule.name] = time.perf_counter() - start
+            if updated != content:
+                result.applied.append(rule.name)
+                content = updated
+        return content
+
+    def fix_text(self, content: str, path: str) -> Tuple[str, List[str]]:
+        """Apply the rules for path to content without touching the filesystem
+
+        path only selects rules (e.g. 'docs/guide.md'); it need not exist.
+        Returns the fixed text and the names of the rules that changed it.
+        """
+        result = FileResult(path)
+        return self.apply(content, self.rules_for(path), result), result.applied
+
+    def fix_stream(self, src: TextIO, dst: TextIO, path: str) -> List[str]:
+        """Read src, write the fixed text to dst, return the rules applied"""
+        content, applied = self.fix_text(src.read(), path)
+        dst.write(content)
+        return applied
+
+    def fix_file(self, path: str, rules: Optional[List[Rule]] = None,
+                 write: bool = True, diff: bool = False) -> FileResult:
+        """Read path once, apply its rules, write it back once if changed
+
+        With write=False the file is never touched and a change is reported
+        as 'would-fix'; diff=True also records a unified diff.
+        """
+        result = FileResult(path)
+        start = time.perf_counter()
+        rules = self.rules_for(path) if rules is None else rules
+        try:
+            if not os.path.exists(path):
+                result.status = 'missing'
+                return result
+            if self.streams(path, rules) and not diff:
+                self._fix_streamed(path, rules, write, result)
+                return result
+
+            # Writers hold the file locked from read to replace, so a
+            # concurrent run cannot overwrite this fix with a stale buffer
+            with locked(path, shared=not write) as f:
+                if f is None:
+                    result.status = 'missing'
+                    return result
+                raw = f.read()
+                original = decode_text(raw)
+
+                content = self.apply(original, rules, result)
+
+                if content != original:
+                    if diff:
+                        result.diff = unified_diff(path, original, content)
+                    if write:
+                        raw = content.encode('utf-8')
+                        atomic_write_bytes(path, raw)
+                        result.status = 'fixed'
+                    else:
+                        result.status = 'would-fix'
+
+                st = os.stat(path)
+            result.mtime_ns, result.size = st.st_mtime_ns, st.st_size
+            result.digest = content_digest(raw)
+        except Exception as e:
+            result.status = 'error'
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            result.elapsed = time.perf_counter() - start
+        return result
+
+    def streams(self, path: str, rules: List[Rule]) -> bool:
+        """True if path is large enough to stream and every rule can"""
+        return (bool(rules) and all(rule.stream is not None for rule in rules)
+                and os.path.getsize(path) >= self.stream_threshold)
+
+    def _fix_streamed(self, path: str, rules: List[Rule], write: bool, result: FileResult):
+        """fix_file() for a large file: chain the rules' line streams, never holding the file"""
+        stages = [_TrackedStream(rule) for rule in rules]
+
+        def transform(lines: Iterable[str]) -> Iterable[str]:
+            for stage in stages:
+                lines = stage(lines)
+            return lines
+
+        if stream_rewrite(path, transform, write=write):
+            result.status = 'fixed' if write else 'would-fix'
+        result.applied = [stage.rule.name for stage in stages if stage.changed]
+        with locked(path, shared=True) as f:
+            digest = hashlib.sha256()
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+            st = os.fstat(f.fileno())
+        result.mtime_ns, result.size = st.st_mtime_ns, st.st_size
+        result.digest = digest.hexdigest()
+
+    def run(self, paths: Iterable[str], jobs: int = 1, cache: Optional[FixCache] = None,
+            write: bool = True, diff: bool = False) -> List[FileResult]:
+        """Fix every path that at least one rule applies to, in order
+
+        paths may be a lazy stream (e.g. from discovery); files no rule
+        applies to are skipped without being opened, and files the cache
+        knows to be clean are reported as 'cached' without being read. With
+        jobs > 1 the files are spread over a process pool. Results are
+        always returned in input order, and a failing worker only marks its
+        own file as an error.
+        """
+        if jobs <= 1:
+            results = []
+            for path in paths:
+                rules = self.rules_for(path)
+                if not rules:
+                    continue
+                if cache is not None and cache.is_clean(path):
+                    results.append(FileResult(path, 'cached'))
+                else:
+                    results.append(self.fix_file(path, rules, write, diff))
+        else:
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                submitted = []
+                for path in paths:
+                    if not self.rules_for(path):
+                        continue
+                    if cache is not None and cache.is_clean(path):
+                        submitted.append((path, None))
+                    else:
+                        submitted.append((path, executor.submit(_fix_in_worker, path, write, diff)))
+                for path, future in submitted:
+                    if future is None:
+                        results.append(FileResult(path, 'cached'))
+                        continue
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        result = FileResult(path, 'error')
+                        result.error = f"{type(e).__name__}: {e}"
+                        results.append(result)
+
+        if cache is not None:
+            for result in results:
+                if result.status in ('fixed', 'unchanged'):
+                    cache.record(result.path, result.mtime_ns, result.size, result.digest)
+                elif result.status != 'cached':
+                    cache.forget(result.path)
+        return results
+
+
+# Pipeline installed in each pool worker, so rules are pickled once per
+# process instead of once per file
+_worker_pipeline: Optional[FixerPipeline] = None
+
+
+def _init_worker(pipeline: FixerPipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _fix_in_worker(path: str, write: bool, diff: bool) -> FileResult:
+    return _worker_pipeline.fix_file(path, None, write, diff)
+
+
+def unified_diff(path: str, before: str, after: str) -> str:
+    """git-style unified diff of one file's pending changes"""
+    lines = []
+    for line in difflib.unified_diff(
+            before.splitlines(keepends=True), after.splitlines(keepends=True),
+            fromfile=f'a/{normalize_path(path)}', tofile=f'b/{normalize_path(path)}'):
+        if not line.endswith('\n'):
+            line += '\n\\ No newline at end of file\n'
+        lines.append(line)
+    return ''.join(lines)
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Translate a --jobs value into a worker count (0 means one per CPU)"""
+    if jobs < 0:
+        raise ValueError("--jobs must be 0 or a positive integer")
+    return jobs or os.cpu_count() or 1
+
+
+def format_summary(results: List[FileResult], wall_time: Optional[float] = None) -> str:
+    """Per-file and per-rule timing summary"""
+    cached = sum(1 for r in results if r.status == 'cached')
+    processed = [r for r in results if r.status != 'cached']
+    lines = ["", "Timing summary", "", "Per file:"]
+    width = max((len(r.path) for r in processed), default=4)
+    for r in processed:
+        lines.append(f"  {r.path:<{width}}  {r.status:<9} {r.elapsed * 1000:8.2f} ms")
+
+    per_rule: Dict[str, List[float]] = {}
+    for r in results:
+        for name, seconds in r.timings.items():
+            per_rule.setdefault(name, []).append(seconds)
+
+    lines.append("")
+    lines.append("Per rule:")
+    width = max((len(name) for name in per_rule), default=4)
+    for name, samples in per_rule.items():
+        lines.append(f"  {name:<{width}}  {len(samples):4d} files {sum(samples) * 1000:8.2f} ms")
+
+    total = sum(r.elapsed for r in results)
+    lines.append("")
+    total_line = f"Total: {len(processed)} files in {total * 1000:.2f} ms"
+    if cached:
+        total_line += f", {cached} unchanged files skipped (cached)"
+    if wall_time is not None:
+        total_line += f" (wall {wall_time * 1000:.2f} ms)"
+    lines.append(total_line)
+    return '\n'.join(lines)
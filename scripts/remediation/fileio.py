@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Safe file replacement for the scripts/ fixers and log updaters
+
+Writers never modify a file in place: they write a temporary file, fsync it
+and rename it over the target, so a concurrent reader sees either the old
+or the new content. Read-modify-write cycles additionally hold an advisory
+flock on the target (see locked()), so two jobs updating the same file in
+one checkout apply their changes one after the other instead of losing one.
+"""
+import hashlib
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, BinaryIO, Callable, Iterable, Iterator, Optional, TextIO, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def target_mode(path: str) -> int:
+    """Permission bits for a file replacing path
+
+    An existing file keeps its own; a new one gets 0o666 less the umask,
+    as open() would give it, rather than mkstemp's private 0o600.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+def _temporary(path: str) -> Tuple[int, str]:
+    """A new temporary file in path's directory, so renaming it over path is atomic"""
+    directory = os.path.dirname(os.path.abspath(path))
+    return tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+
+
+def _discard(tmp_path: str):
+    try:
+        os.unlink(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Replace path with data so readers never see a partial file
+
+    The data goes to a temporary file in the same directory, is flushed and
+    fsynced, and is then renamed over the target. The original permissions
+    are kept when the target already exists.
+    """
+    with atomic_writer(path, binary=True) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: str, text: str):
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+@contextmanager
+def atomic_writer(path: str, binary: bool = False, exclusive: bool = False) -> Iterator[IO]:
+    """Text (or binary) stream that replaces path when the block exits cleanly
+
+    Like atomic_write_text() for output produced incrementally: nothing
+    is held in memory and path is left untouched if the block raises.
+    With exclusive=True path is only created, never replaced: the new
+    file is linked into place and FileExistsError is raised if another
+    process created path first.
+    """
+    fd, tmp_path = _temporary(path)
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, target_mode(path))
+        if exclusive:
+            os.link(tmp_path, path)
+            _discard(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+@contextmanager
+def locked(path: str, shared: bool = False, create: bool = False) -> Iterator[Optional[BinaryIO]]:
+    """Hold an advisory lock on path for a read-modify-write cycle
+
+    Yields the file opened for binary reading, or None if it does not exist
+    (with create=True an empty file is created instead). The lock is taken
+    on the file itself rather than a sidecar lock file; since writers
+    replace the file by renaming, a lock that was granted on an inode the
+    path no longer names is dropped and taken again on the new file.
+    """
+    flags = os.O_RDONLY | (os.O_CREAT if create else 0)
+    while True:
+        try:
+            fd = os.open(path, flags, 0o644)
+        except FileNotFoundError:
+            yield None
+            return
+        f = os.fdopen(fd, 'rb')
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    current = os.stat(path)
+                except FileNotFoundError:
+                    current = None
+                held = os.fstat(fd)
+                if current is None or (current.st_dev, current.st_ino) != (held.st_dev, held.st_ino):
+                    continue  # replaced or removed while we waited
+            yield f
+            return
+        finally:
+            f.close()  # closing the descriptor releases the lock
+
+
+def decode_text(raw: bytes) -> str:
+    """Decode file bytes with the same newline handling as text-mode open()"""
+    text = raw.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def iter_lines(f: TextIO) -> Iterator[str]:
+    """Lines of an open text file without terminators, like str.split('\\n')
+
+    A trailing newline yields a final empty line, so joining the output
+    with '\\n' reproduces the input exactly.
+    """
+    for line in f:
+        if line.endswith('\n'):
+            yield line[:-1]
+        else:
+            yield line
+            return
+    yield ''
+
+
+def stream_rewrite(path: str, transform: Callable[[Iterable[str]], Iterable[str]],
+                   chunk_lines: int = 1024, write: bool = True) -> bool:
+    """Pipe a file's lines through transform without loading it into memory
+
+    Output goes to a temporary file next to path and is renamed into place
+    only if it differs from the input, so memory use stays flat regardless
+    of file size. Returns True when the file was (or, with write=False,
+    would be) rewritten; with write=False the output is only hashed and
+    the file is read under a shared lock. The file is locked for the whole
+    pass.
+    """
+    source_hash = hashlib.sha256()
+    output_hash = hashlib.sha256()
+
+    def hashed(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            source_hash.update(line.encode('utf-8'))
+            source_hash.update(b'\n')
+            yield line
+
+    dst, tmp_path = None, None
+    if write:
+        fd, tmp_path = _temporary(path)
+        dst = os.fdopen(fd, 'wb')
+    try:
+        with locked(path, shared=not write) as src:
+            if src is None:
+                raise FileNotFoundError(f"No such file: {path}")
+            with io.TextIOWrapper(src, encoding='utf-8') as text:
+                buffer = []
+                first = True
+                for line in transform(hashed(iter_lines(text))):
+                    output_hash.update(line.encode('utf-8'))
+                    output_hash.update(b'\n')
+                    if dst is None:
+                        continue
+                    buffer.append(line if first else '\n' + line)
+                    first = False
+                    if len(buffer) >= chunk_lines:
+                        dst.write(''.join(buffer).encode('utf-8'))
+                        buffer.clear()
+                changed = source_hash.digest() != output_hash.digest()
+                if dst is None:
+                    return changed
+                with dst:
+                    dst.write(''.join(buffer).encode('utf-8'))
+                    dst.flush()
+                    os.fsync(dst.fileno())
+
+                if not changed:
+                    os.unlink(tmp_path)
+                    return False
+                os.chmod(tmp_path, target_mode(path))
+                os.replace(tmp_path, path)
+                return True
+    except BaseException:
+        if dst is not None:
+            dst.close()
+            _discard(tmp_path)
+        raise
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Markdown headings, anchors and links, with a persistent per-file index
+
+parse_markdown() reduces a document to what cross-document checks need:
+its headings with their GitHub slugs, every anchor a link can target and
+every outbound link. HeadingIndex keeps that for each markdown file on
+disk, keyed by mtime, size and content hash like the fix cache, so after
+the first run only files whose bytes changed are read and parsed again.
+Any change to the parser invalidates every entry.
+"""
+import hashlib
+import json
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from .cache import content_digest
+from .engine import normalize_path
+from .fileio import atomic_write_text, decode_text, locked
+from .mdblocks import CODE, FENCE, HEADING, blocks_for
+
+INDEX_FILE = '.markdown_index.json'
+INDEX_FORMAT = 1
+
+_SCHEME = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*:')
+_CODE_SPAN = re.compile(r'(`+).+?\1')
+_INLINE_LINK = re.compile(
+    r'!?\[(?:[^\[\]]|\[[^\[\]]*\])*\]\(\s*(<[^>\n]*>|[^\s()]*(?:\([^\s()]*\)[^\s()]*)*)'
+    r'(?:\s+(?:"[^"]*"|\'[^\']*\'|\([^)]*\)))?\s*\)')
+_REFERENCE = re.compile(r' {0,3}\[[^\]]+\]:\s*(<[^>]*>|\S+)')
+_HTML_ANCHOR = re.compile(r'<[a-zA-Z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+_HEADING_MARKUP = re.compile(r'!?\[([^\]]*)\]\([^)]*\)|<[^>]+>')
+_SLUG_DROP = re.compile(r'[^\w\- ]')
+
+
+class Heading(NamedTuple):
+    line: int      # 1-based
+    level: int
+    text: str
+    slug: str
+
+
+class Link(NamedTuple):
+    line: int      # 1-based
+    target: str
+
+
+class MarkdownDoc(NamedTuple):
+    """What cross-document checks need to know about one markdown file"""
+    headings: Tuple[Heading, ...]
+    anchors: frozenset
+    links: Tuple[Link, ...]
+
+
+def slugify(text: str) -> str:
+    """GitHub's anchor for a heading (before duplicate numbering)"""
+    text = _HEADING_MARKUP.sub(lambda m: m.group(1) or '', text)
+    return _SLUG_DROP.sub('', text.strip().lower()).replace(' ', '-')
+
+
+def heading_text(line: str) -> Tuple[int, str]:
+    """(level, text) of an ATX heading line"""
+    stripped = line.strip()
+    level = len(stripped) - len(stripped.lstrip('#'))
+    text = re.sub(r'(?:^|\s+)#+\s*$', '', stripped[level:]).strip()
+    return level, text
+
+
+def parse_markdown(text: str) -> MarkdownDoc:
+    """Headings, anchors and links of a document; fenced code and code spans are skipped"""
+    blocks = blocks_for(text)
+    headings, links = [], []
+    anchors: Set[str] = set()
+    seen: Dict[str, int] = {}
+    for number, (kind, line) in enumerate(blocks.tokens(), 1):
+        if kind in (CODE, FENCE):
+            continue
+        if '`' in line:
+            line = _CODE_SPAN.sub('', line)
+        if kind == HEADING:
+            level, title = heading_text(line)
+            slug = base = slugify(title)
+            # Repeated headings get -1, -2, ... like GitHub
+            while slug in seen:
+                seen[base] += 1
+                slug = f'{base}-{seen[base]}'
+            seen.setdefault(base, 0)
+            seen[slug] = 0
+            headings.append(Heading(number, level, title, slug))
+            anchors.add(slug)
+        if '<' in line:
+            anchors.update(_HTML_ANCHOR.findall(line))
+        if '](' in line:
+            links.extend(Link(number, m.group(1).strip('<>')) for m in _INLINE_LINK.finditer(line))
+        if ']:' in line:
+            reference = _REFERENCE.match(line)
+            if reference:
+                links.append(Link(number, reference.group(1).strip('<>')))
+    return MarkdownDoc(tuple(headings), frozenset(anchors), tuple(links))
+
+
+def read_markdown(path: str) -> MarkdownDoc:
+    with open(path, 'rb') as f:
+        return parse_markdown(decode_text(f.read()))
+
+
+def link_path(source: str, target: str) -> Optional[str]:
+    """'/'-separated path a relative link points to, or None for external links
+
+    source is the linking file's path; a bare #fragment points at source.
+    """
+    if not target or _SCHEME.match(target) or target.startswith('//'):
+        return None
+    path = unquote(target.split('#', 1)[0].split('?', 1)[0])
+    if path.startswith('/'):
+        resolved = posixpath.normpath(path.lstrip('/') or '.')
+    elif path:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+    else:
+        resolved = source
+    return '' if resolved == '.' else resolved
+
+
+def parser_fingerprint() -> str:
+    """Hash of the modules that decide what parse_markdown() returns"""
+    h = hashlib.sha256(f'format={INDEX_FORMAT}'.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in ('headings.py', 'mdblocks.py', 'mdtable.py'):
+        with open(os.path.join(package_dir, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _encode_doc(doc: MarkdownDoc) -> list:
+    return [[list(h) for h in doc.headings], sorted(doc.anchors), [list(l) for l in doc.links]]
+
+
+def _decode_doc(data: list) -> MarkdownDoc:
+    headings, anchors, links = data
+    return MarkdownDoc(tuple(Heading(*h) for h in headings), frozenset(anchors),
+                       tuple(Link(*l) for l in links))
+
+
+def _index_file(path: str, digest: Optional[str]) -> Tuple[int, int, str, Optional[MarkdownDoc]]:
+    """(mtime_ns, size, digest, doc) of path; doc is None when digest is unchanged"""
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        raw = f.read()
+    new_digest = content_digest(raw)
+    if new_digest == digest:
+        return st.st_mtime_ns, st.st_size, digest, None
+    return st.st_mtime_ns, st.st_size, new_digest, parse_markdown(decode_text(raw))
+
+
+class HeadingIndex:
+    """Headings, anchors and links of every markdown file seen, kept across runs
+
+    Keys are '/'-separated paths relative to root (by default the
+    directory holding the index file). With no path nothing is persisted.
+    """
+
+    def __init__(self, path: Optional[str] = INDEX_FILE, root: Optional[str] = None):
+        self.path = path
+        self.root = root if root is not None else os.path.dirname(os.path.abspath(path or INDEX_FILE))
+        self.parser = parser_fingerprint()
+        self.entries: Dict[str, List] = {}      # key -> [mtime_ns, size, digest]
+        self.docs: Dict[str, MarkdownDoc] = {}
+        self.errors: Dict[str, str] = {}
+        self.changed: Set[str] = set()          # keys re-parsed by this run
+        self.touched: Set[str] = set()          # keys recorded or dropped by this run
+        self._inbound: Optional[Dict[str, List[Tuple[str, Link]]]] = None
+        stored = self._read()
+        if stored is not None:
+            for key, (mtime_ns, size, digest, doc) in stored.items():
+                self.entries[key] = [mtime_ns, size, digest]
+                self.docs[key] = _decode_doc(doc)
+
+    def _read(self, f=None) -> Optional[Dict[str, List]]:
+        """Entries stored for this parser, or None if there are none"""
+        if self.path is None:
+            return None
+        try:
+            if f is None:
+                with open(self.path, 'rb') as f:
+                    data = json.load(f)
+            else:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('parser') != self.parser:
+            return None
+        return data.get('files', {})
+
+    def key(self, path: str) -> str:
+        return normalize_path(os.path.relpath(os.path.abspath(path), os.path.abspath(self.root)))
+
+    def update(self, paths: Iterable[str], jobs: int = 1) -> List[str]:
+        """Bring the given files up to date; returns their keys in order
+
+        A file whose mtime and size match its entry is not opened; one
+        whose bytes hash the same is not parsed. With jobs > 1 the files
+        that need reading are spread over a process pool.
+        """
+        keys, stale = [], []
+        for path in paths:
+            key = self.key(path)
+            keys.append(key)
+            entry = self.entries.get(key)
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                self._drop(key)
+                self.errors[key] = f"{type(e).__name__}: {e}"
+                continue
+            if entry is not None and key in self.docs and entry[:2] == [st.st_mtime_ns, st.st_size]:
+                continue
+            stale.append((key, path, entry[2] if entry is not None else None))
+
+        args = ([path for _, path, _ in stale], [digest for _, _, digest in stale])
+        if jobs <= 1 or len(stale) < 2:
+            self._store(stale, map(_try_index_file, *args))
+        else:
+            chunk_size = max(1, len(stale) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                self._store(stale, executor.map(_try_index_file, *args, chunksize=chunk_size))
+        return keys
+
+    def _store(self, stale, results):
+        for (key, _, _), (indexed, error) in zip(stale, results):
+            if indexed is None:
+                self._drop(key)
+                self.errors[key] = error
+                continue
+            mtime_ns, size, digest, doc = indexed
+            self.entries[key] = [mtime_ns, size, digest]
+            self.touched.add(key)
+            self.errors.pop(key, None)
+            if doc is not None:
+                self.docs[key] = doc
+                self.changed.add(key)
+                self._inbound = None
+
+    def _drop(self, key: str):
+        if self.entries.pop(key, None) is not None:
+            self.touched.add(key)
+        if self.docs.pop(key, None) is not None:
+            self._inbound = None
+
+    def prune(self, keys: Iterable[str]):
+        """Forget every file not among keys (e.g. after a full walk)"""
+        keep = set(keys)
+        for key in [k for k in self.entries if k not in keep]:
+            self._drop(key)
+
+    def links_to(self, key: str) -> List[Tuple[str, Link]]:
+        """(source key, link) for every indexed link pointing at key"""
+        if self._inbound is None:
+            self._inbound = {}
+            for source, doc in self.docs.items():
+                for link in doc.links:
+                    target = link_path(source, link.target)
+                    if target is not None:
+                        self._inbound.setdefault(target, []).append((source, link))
+        return self._inbound.get(key, [])
+
+    def save(self):
+        """Write the index, merged with entries saved by concurrent runs"""
+        if self.path is None or not self.touched:
+            return
+        files = {key: entry + [_encode_doc(self.docs[key])] for key, entry in self.entries.items()}
+        with locked(self.path, create=True) as f:
+            stored = self._read(f)
+            if stored is not None:
+                # Keep what other runs saved; replay only this run's changes
+                for key in self.touched:
+                    if key in files:
+                        stored[key] = files[key]
+                    else:
+                        stored.pop(key, None)
+                files = stored
+            data = {'format': INDEX_FORMAT, 'parser': self.parser, 'files': files}
+            atomic_write_text(self.path, json.dumps(data, separators=(',', ':'), sort_keys=True))
+        self.touched.clear()
+
+
+def _try_index_file(path: str, digest: Optional[str]):
+    try:
+        return _index_file(path, digest), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"{type(e).__name__}: {e}"
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Offline link checking for markdown trees
+
+Every markdown file is parsed once into its headings, anchors and
+outbound links (see headings.py; with a persistent HeadingIndex only
+files changed since the last run are parsed at all). The tree's file
+paths come from a single directory walk, so each relative link and
+#fragment is resolved against in-memory sets instead of probing the
+filesystem per link. External links (http:, mailto: and other schemes)
+are never fetched.
+"""
+import os
+import posixpath
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from .discovery import DEFAULT_EXCLUDE, FileDiscovery, GlobSet
+from .engine import normalize_path
+from .headings import INDEX_FILE, HeadingIndex, Link, MarkdownDoc, link_path, parse_markdown, slugify
+
+MARKDOWN = GlobSet(['*.md', '*.markdown'])
+
+# Broken link reasons
+MISSING_FILE = 'no such file'
+MISSING_ANCHOR = 'no such anchor'
+OUTSIDE_ROOT = 'outside the repository'
+
+
+class BrokenLink(NamedTuple):
+    path: str
+    line: int
+    target: str
+    reason: str
+
+
+class LinkIndex:
+    """Every path under a root plus the parsed markdown files, held in memory
+
+    Paths are '/'-separated and relative to root, which must also be the
+    root of the HeadingIndex. Markdown files outside the checked set are
+    parsed on demand when a link needs their anchors.
+    """
+
+    def __init__(self, root: str = '.', exclude: Iterable[str] = DEFAULT_EXCLUDE,
+                 headings: Optional[HeadingIndex] = None):
+        self.root = root
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = {''}
+        for path in FileDiscovery(('*',), tuple(exclude)).walk(root):
+            rel_path = self.relative(path)
+            self.files.add(rel_path)
+            parent = posixpath.dirname(rel_path)
+            while parent not in self.dirs:
+                self.dirs.add(parent)
+                parent = posixpath.dirname(parent)
+        self.headings = headings if headings is not None else HeadingIndex(None, root)
+        self.headings.prune(path for path in self.files if MARKDOWN.match(path))
+        self.checked: List[str] = []
+        self._fresh: Set[str] = set()    # brought up to date by this run
+
+    @property
+    def docs(self) -> Dict[str, MarkdownDoc]:
+        return self.headings.docs
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        return self.headings.errors
+
+    def relative(self, path: str) -> str:
+        rel_path = normalize_path(os.path.relpath(path, self.root))
+        return '' if rel_path == '.' else rel_path
+
+    def load(self, paths: Iterable[str], jobs: int = 1) -> List[str]:
+        """Parse markdown files (relative paths) that changed, across jobs processes"""
+        paths = list(paths)
+        todo = [p for p in paths if p not in self._fresh]
+        self.headings.update([os.path.join(self.root, p) for p in todo], jobs)
+        self._fresh.update(todo)
+        self.checked.extend(paths)
+        return paths
+
+    def doc(self, path: str) -> Optional[MarkdownDoc]:
+        if path not in self.files:
+            return None
+        if path not in self._fresh:
+            self.headings.update([os.path.join(self.root, path)])
+            self._fresh.add(path)
+        return self.docs.get(path)
+
+    def resolve(self, source: str, target: str) -> Optional[str]:
+        """Why target, linked from source, is broken, or None if it resolves"""
+        resolved = link_path(source, target)
+        if resolved is None:
+            return None
+        fragment = unquote(target.partition('#')[2])
+        if resolved == '..' or resolved.startswith('../'):
+            return OUTSIDE_ROOT
+        if resolved not in self.files and resolved not in self.dirs:
+            return MISSING_FILE
+        if fragment and MARKDOWN.match(resolved):
+            doc = self.doc(resolved)
+            if doc is not None and fragment not in doc.anchors and fragment.lower() not in doc.anchors:
+                return MISSING_ANCHOR
+        return None
+
+    def affected(self) -> List[str]:
+        """Checked files parsed by this run, then the files linking into them"""
+        changed = [path for path in self.checked if path in self.headings.changed]
+        sources = {source for path in changed for source, _ in self.headings.links_to(path)}
+        return changed + sorted(sources.difference(changed))
+
+    def broken(self, paths: Optional[Iterable[str]] = None) -> Iterator[BrokenLink]:
+        """Broken links in the given files (every checked file by default)"""
+        for path in (self.checked if paths is None else paths):
+            doc = self.doc(path)
+            if doc is None:
+                continue
+            for link in doc.links:
+                reason = self.resolve(path, link.target)
+                if reason is not None:
+                    yield BrokenLink(path, link.line, link.target, reason)
+
+
+def markdown_files(index: LinkIndex, targets: Iterable[str]) -> List[str]:
+    """Relative paths of the markdown files under targets, in walk order"""
+    discovery = FileDiscovery(('*',), DEFAULT_EXCLUDE)
+    found = []
+    for target in targets:
+        paths = discovery.walk(target) if os.path.isdir(target) else [target]
+        found.extend(index.relative(p) for p in paths if MARKDOWN.match(normalize_path(p)))
+    return list(dict.fromkeys(found))
+
+
+def check_links(targets: Iterable[str] = ('.',), root: str = '.', jobs: int = 1,
+                index: Optional[str] = None) -> Tuple[LinkIndex, List[BrokenLink]]:
+    """Check every markdown file under targets; links resolve against root
+
+    With an index path, parsed files are kept there and only files that
+    changed since the last run are read again.
+    """
+    headings = HeadingIndex(index, root)
+    link_index = LinkIndex(root, headings=headings)
+    link_index.load(markdown_files(link_index, targets), jobs)
+    headings.save()
+    return link_index, list(link_index.broken())
+
+
+def broken_anchors(changed: Iterable[str], root: str = '.', index: Optional[str] = None,
+                   jobs: int = 1) -> List[BrokenLink]:
+    """Links anywhere under root to #anchors that the changed files no longer have
+
+    For use after rewriting headings; with an index only the changed files
+    are parsed again.
+    """
+    headings = HeadingIndex(index, root)
+    link_index = LinkIndex(root, headings=headings)
+    link_index.load(markdown_files(link_index, [root]), jobs)
+    headings.save()
+    targets = {link_index.relative(path) for path in changed}
+    sources = sorted({source for path in targets for source, _ in headings.links_to(path)})
+    return [link for link in link_index.broken(sources)
+            if link.reason == MISSING_ANCHOR and link_path(link.path, link.target) in targets]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for defect-log manifests
+
+A manifest lists status changes, one record per defect:
+
+    {"id": "DEF-101", "status": "Resolved", "notes": "Pinned the action"}
+
+as JSON Lines, CSV (with a header row) or a JSON array. Records are
+decoded one at a time, so a manifest of any size is applied in constant
+memory. A JSON object mapping IDs to resolution notes (the shape of the
+old hard-coded resolved_defects dict) is also accepted.
+"""
+import csv
+import json
+import os
+import re
+from typing import IO, Dict, Iterator, List, Mapping, Optional
+
+FORMATS = ('json', 'jsonl', 'csv')
+
+# Known statuses, matched case-insensitively; others are kept as written
+STATUSES = ('Open', 'In Progress', 'Resolved', 'Closed', "Won't Fix")
+# Verbs accepted in place of a status
+ACTIONS = {'resolve': 'Resolved', 'reopen': 'Open', 'close': 'Closed'}
+
+# Accepted spellings of each field, compared lower-cased
+ID_FIELDS = ('id', 'defect_id', 'defect id')
+STATUS_FIELDS = ('status', 'action')
+NOTES_FIELDS = ('notes', 'resolution', 'resolution notes', 'resolution_notes')
+DATE_FIELDS = ('date', 'date closed', 'date_closed')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A decoder error this close to the end of the buffer may only mean the
+# value continues in the next chunk (e.g. 'tru' of 'true', '\\u00' of an escape)
+_LOOKAHEAD = 12
+
+
+class ManifestEntry:
+    """One requested status change"""
+    __slots__ = ('id', 'status', 'notes', 'date')
+
+    def __init__(self, defect_id: str, status: str = 'Resolved', notes: str = '',
+                 date: Optional[str] = None):
+        self.id = defect_id
+        self.status = status
+        self.notes = notes
+        self.date = date
+
+
+def normalize_status(value: str) -> str:
+    value = value.strip()
+    lowered = value.lower()
+    if lowered in ACTIONS:
+        return ACTIONS[lowered]
+    for status in STATUSES:
+        if status.lower() == lowered:
+            return status
+    return value
+
+
+def _field(record: Mapping, names) -> str:
+    for key, value in record.items():
+        if key is not None and key.strip().lower() in names and value is not None:
+            return str(value).strip()
+    return ''
+
+
+def to_entry(record: Mapping, position: int) -> ManifestEntry:
+    """Validate one decoded record"""
+    if not isinstance(record, Mapping):
+        raise ValueError(f"Manifest record {position} is not an object")
+    defect_id = _field(record, ID_FIELDS)
+    if not defect_id:
+        raise ValueError(f"Manifest record {position} has no defect id")
+    status = _field(record, STATUS_FIELDS)
+    return ManifestEntry(defect_id, normalize_status(status) if status else 'Resolved',
+                         _field(record, NOTES_FIELDS), _field(record, DATE_FIELDS) or None)
+
+
+def iter_jsonl(f: IO[str]) -> Iterator[Mapping]:
+    for number, line in enumerate(f, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e}") from None
+
+
+def iter_csv(f: IO[str]) -> Iterator[Mapping]:
+    return csv.DictReader(f)
+
+
+def iter_json(f: IO[str], chunk_size: int = 64 * 1024) -> Iterator[Mapping]:
+    """Elements of a top-level JSON array, decoded incrementally"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while not buffer:
+        # Skip leading whitespace, however many chunks it fills
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if buffer.startswith('{'):
+        # {"DEF-001": "notes", ...}
+        for defect_id, notes in json.loads(buffer + f.read()).items():
+            yield {'id': defect_id, 'notes': notes}
+        return
+    if not buffer.startswith('['):
+        raise ValueError("JSON manifest must be an array of records or an id -> notes object")
+
+    offset = 0              # characters dropped from the front of buffer so far
+    position = 1
+    expect_value = True     # after '[' or ','
+    first = True
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        error = None
+        if position < len(buffer):
+            char = buffer[position]
+            if not expect_value:
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError(f"Invalid JSON manifest at character {offset + position}: "
+                                     "Expecting ',' or ']' after a record")
+                position += 1
+                expect_value = True
+                continue
+            if first and char == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if e.pos < len(buffer) - _LOOKAHEAD and not e.msg.startswith('Unterminated string'):
+                    # The value is complete and still invalid: more data cannot help
+                    raise ValueError(f"Invalid JSON manifest at character {offset + e.pos}: {e.msg}") from None
+                error = e
+            else:
+                yield record
+                position, expect_value, first = end, False, False
+                continue
+
+        # Whitespace or a value runs to the end of the buffer: read more
+        more = f.read(chunk_size)
+        if not more:
+            if error is not None and error.pos < len(buffer) and not error.msg.startswith('Unterminated string'):
+                raise ValueError(f"Invalid JSON manifest at character {offset + error.pos}: {error.msg}")
+            raise ValueError("Truncated JSON manifest")
+        offset += position
+        buffer = buffer[position:] + more
+        position = 0
+
+
+class ManifestReport:
+    """Outcome of applying a manifest, grouped by target status"""
+
+    def __init__(self):
+        self.changed: Dict[str, List[str]] = {}
+        self.unchanged: Dict[str, List[str]] = {}
+        self.missing: List[str] = []
+
+    def add(self, outcome: str, entry: ManifestEntry):
+        """Record the outcome ('changed', 'unchanged' or 'missing') of one entry"""
+        if outcome == 'missing':
+            self.missing.append(entry.id)
+        else:
+            group = self.changed if outcome == 'changed' else self.unchanged
+            group.setdefault(entry.status, []).append(entry.id)
+
+    def summary(self) -> str:
+        lines = [f"Marked {status}: {len(ids)}" for status, ids in self.changed.items()]
+        if not lines:
+            lines.append("No defects changed")
+        for status, ids in self.unchanged.items():
+            lines.append(f"Already {status}: {', '.join(ids)}")
+        if self.missing:
+            lines.append(f"Missing from log: {', '.join(self.missing)}")
+        return '\n'.join(lines)
+
+
+_READERS = {'json': iter_json, 'jsonl': iter_jsonl, 'csv': iter_csv}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.csv':
+        return 'csv'
+    return 'json'
+
+
+def read_manifest(f: IO[str], fmt: str) -> Iterator[ManifestEntry]:
+    """Stream validated entries from an open manifest"""
+    if fmt not in _READERS:
+        raise ValueError(f"Unknown manifest format: {fmt}")
+    for position, record in enumerate(_READERS[fmt](f), 1):
+        yield to_entry(record, position)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Lightweight markdown block tokenizer
+
+Classifies every line of a document by the block it belongs to - fenced
+code, table, list, heading, paragraph text or blank - so rules can ask
+"is this line a table row outside code?" instead of re-scanning text with
+their own heuristics. The tokenizer is incremental: it is fed one line at
+a time with a single line of lookahead, so it also works over streams.
+
+blocks_for() keeps the tokenization of the most recent text, so every
+markdown rule that runs over an unchanged buffer shares one pass.
+"""
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .mdtable import is_separator_row
+
+# Line kinds
+BLANK = 'blank'
+FENCE = 'fence'        # opening or closing ``` / ~~~ line
+CODE = 'code'          # line inside a fenced code block
+TABLE = 'table'        # header, separator or body row of a pipe table
+LIST = 'list'          # list item or its continuation
+HEADING = 'heading'    # ATX heading
+TEXT = 'text'          # paragraph text
+
+_FENCE = re.compile(r'(`{3,}|~{3,})')
+_HEADING = re.compile(r' {0,3}#{1,6}(?:\s|\Z)')
+_LIST_ITEM = re.compile(r'\s*(?:[-*+]|\d{1,9}[.)])(?:\s|\Z)')
+
+
+class Block(NamedTuple):
+    """A run of lines [start, end) sharing one kind"""
+    kind: str
+    start: int
+    end: int
+
+
+class BlockTokenizer:
+    """Line-at-a-time block classifier"""
+    __slots__ = ('fence', 'previous', 'in_list')
+
+    def __init__(self):
+        self.fence: Optional[str] = None    # marker of the open code fence
+        self.previous: Optional[str] = None
+        self.in_list = False
+
+    def feed(self, line: str, following: Optional[str] = None) -> str:
+        """Kind of line; following is the next line (needed to spot table headers)"""
+        kind = self._classify(line, following)
+        self.previous = kind
+        return kind
+
+    def _classify(self, line: str, following: Optional[str]) -> str:
+        stripped = line.strip()
+        if self.fence is not None:
+            if stripped.startswith(self.fence) and stripped.strip(self.fence[0]) == '':
+                self.fence = None
+                return FENCE
+            return CODE
+
+        if not stripped:
+            return BLANK
+        # Dispatch on the first character so plain text skips every regex
+        first = stripped[0]
+        if first in '`~':
+            fence = _FENCE.match(stripped)
+            if fence:
+                self.fence = fence.group(1)
+                return FENCE
+        elif first == '#':
+            if _HEADING.match(line):
+                self.in_list = False
+                return HEADING
+        elif first == '|':
+            # A table starts at a header row followed by its separator row
+            if self.previous == TABLE or (following is not None and is_separator_row(following)):
+                return TABLE
+        elif (first in '-*+' or first.isdigit()) and _LIST_ITEM.match(line):
+            self.in_list = True
+            return LIST
+        if self.in_list:
+            # Lazy continuation, or an indented paragraph after a blank line
+            if self.previous == LIST or line[:1].isspace():
+                return LIST
+            self.in_list = False
+        return TEXT
+
+
+def classify(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Stream (kind, line) pairs with one line of lookahead"""
+    tokenizer = BlockTokenizer()
+    lines = iter(lines)
+    line = next(lines, None)
+    while line is not None:
+        following = next(lines, None)
+        yield tokenizer.feed(line, following), line
+        line = following
+
+
+class MarkdownBlocks:
+    """Block structure of one markdown text, tokenized once"""
+    __slots__ = ('text', 'lines', 'kinds', '_present')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split('\n')
+        self.kinds = [kind for kind, _ in classify(self.lines)]
+        self._present: Optional[Set[str]] = None
+
+    def has(self, kind: str) -> bool:
+        if self._present is None:
+            self._present = set(self.kinds)
+        return kind in self._present
+
+    def tokens(self) -> Iterator[Tuple[str, str]]:
+        return zip(self.kinds, self.lines)
+
+    def kind_at(self, index: int) -> Optional[str]:
+        """Kind of line index, or None outside the document"""
+        return self.kinds[index] if 0 <= index < len(self.kinds) else None
+
+    def blocks(self) -> List[Block]:
+        """Consecutive runs of the same kind (a fence's delimiters are separate runs)"""
+        runs = []
+        start = 0
+        for i in range(1, len(self.kinds) + 1):
+            if i == len(self.kinds) or self.kinds[i] != self.kinds[start]:
+                runs.append(Block(self.kinds[start], start, i))
+                start = i
+        return runs
+
+
+_last: Optional[MarkdownBlocks] = None
+
+
+def blocks_for(text: str) -> MarkdownBlocks:
+    """Tokenization of text, reused while rules leave the text unchanged"""
+    global _last
+    if _last is None or (_last.text is not text and _last.text != text):
+        _last = MarkdownBlocks(text)
+    return _last
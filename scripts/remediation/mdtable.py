@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Column-aware markdown table model
+
+Tables are parsed from their header row, so cells are read and updated by
+column name instead of by string replacement on the raw line. Untouched
+rows keep their original text; only rows whose cells changed are
+re-rendered when the document is serialized.
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+_SEPARATOR_CELL = re.compile(r':?-{1,}:?\Z')
+
+
+def is_table_row(line: str) -> bool:
+    """True for a line that reads as a pipe table row"""
+    return line.strip().startswith('|')
+
+
+def split_cells(line: str) -> List[str]:
+    """Cells of a pipe table row, honouring backslash-escaped pipes"""
+    text = line.strip()
+    if text.startswith('|'):
+        text = text[1:]
+    if text.endswith('|') and not text.endswith('\\|'):
+        text = text[:-1]
+    if '\\|' not in text:
+        return [cell.strip() for cell in text.split('|')]
+
+    cells = []
+    current = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == '\\' and i + 1 < len(text) and text[i + 1] == '|':
+            current.append('\\|')
+            i += 2
+            continue
+        if char == '|':
+            cells.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    cells.append(''.join(current).strip())
+    return cells
+
+
+def is_separator_row(line: str) -> bool:
+    if not is_table_row(line):
+        return False
+    cells = split_cells(line)
+    return bool(cells) and all(_SEPARATOR_CELL.match(cell) for cell in cells)
+
+
+def render_row(cells: Sequence[str]) -> str:
+    return '|' + '|'.join(f' {cell} ' if cell else ' ' for cell in cells) + '|'
+
+
+class Row:
+    """One table body row: the original line text, split into cells on demand"""
+    __slots__ = ('line', '_cells', 'dirty')
+
+    def __init__(self, line: str):
+        self.line = line
+        self._cells: Optional[List[str]] = None
+        self.dirty = False
+
+    @property
+    def cells(self) -> List[str]:
+        if self._cells is None:
+            self._cells = split_cells(self.line)
+        return self._cells
+
+    def cell(self, index: int) -> str:
+        """One cell, without splitting the whole row when it can be avoided"""
+        if self._cells is None and '\\' not in self.line:
+            text = self.line.strip()
+            if text.startswith('|'):
+                text = text[1:]
+            # Past the last cell a trailing pipe leaves only '', like split_cells()
+            parts = text.split('|', index + 1)
+            return parts[index].strip() if len(parts) > index else ''
+        cells = self.cells
+        return cells[index] if index < len(cells) else ''
+
+    def render(self) -> str:
+        if not self.dirty:
+            return self.line
+        return render_row(self.cells)
+
+
+class _Columns:
+    """Column-name lookups shared by parsed and streamed tables"""
+    columns: Dict[str, int]
+
+    def resolve_column(self, *names: str) -> Optional[str]:
+        """First of the given column names present in this table"""
+        for name in names:
+            if name in self.columns:
+                return name
+        return None
+
+    def has_columns(self, *names: str) -> bool:
+        return all(name in self.columns for name in names)
+
+    def get(self, row: Row, column: str) -> str:
+        return row.cell(self.columns[column])
+
+
+class MarkdownTable(_Columns):
+    """A pipe table located at lines[start:end] of a document"""
+
+    def __init__(self, header: List[str], header_line: str, separator_line: str,
+                 rows: List[Row], start: int, end: int):
+        self.header = header
+        self.header_line = header_line
+        self.separator_line = separator_line
+        self.rows = rows
+        self.start = start
+        self.end = end
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(header)}
+
+    def set(self, row: Row, column: str, value: str):
+        index = self.columns[column]
+        if len(row.cells) < len(self.header):
+            row.cells.extend([''] * (len(self.header) - len(row.cells)))
+        if row.cells[index] != value:
+            row.cells[index] = value
+            row.dirty = True
+
+    def index_by(self, column: str) -> Dict[str, Row]:
+        """Map each value of column to its row (first occurrence wins)"""
+        index = self.columns[column]
+        result: Dict[str, Row] = {}
+        for row in self.rows:
+            result.setdefault(row.cell(index), row)
+        return result
+
+    def where(self, **criteria: str) -> Iterator[Row]:
+        """Rows whose named cells equal the given values"""
+        wanted = [(self.columns[name], value) for name, value in criteria.items()]
+        for row in self.rows:
+            if all(row.cell(i) == value for i, value in wanted):
+                yield row
+
+    def lines(self) -> List[str]:
+        return [self.header_line, self.separator_line] + [row.render() for row in self.rows]
+
+
+class TableStream(_Columns):
+    """A pipe table read row by row from a line stream
+
+    Iterating yields the body rows and stops at the first line that is not
+    a table row; that line is kept in `following`. Nothing is retained, so
+    any number of rows can be scanned in constant memory.
+    """
+
+    def __init__(self, header_line: str, separator_line: str, lines: Iterator[str]):
+        self.header = split_cells(header_line)
+        self.header_line = header_line
+        self.separator_line = separator_line
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(self.header)}
+        self.following: Optional[str] = None
+        self._lines = lines
+        self._done = False
+
+    def __iter__(self) -> Iterator[Row]:
+        if self._done:
+            return
+        for line in self._lines:
+            if not is_table_row(line):
+                self.following = line
+                break
+            yield Row(line)
+        self._done = True
+
+
+def stream_tables(lines: Iterable[str]) -> Iterator[TableStream]:
+    """Tables of a line stream, in order; unread rows are skipped on advance"""
+    lines = iter(lines)
+    previous = next(lines, None)
+    while previous is not None:
+        line = next(lines, None)
+        if line is not None and is_table_row(previous) and is_separator_row(line):
+            table = TableStream(previous, line, lines)
+            yield table
+            for _ in table:
+                pass
+            previous = table.following
+        else:
+            previous = line
+
+
+class MarkdownDocument:
+    """A markdown file split into plain lines and parsed tables"""
+
+    def __init__(self, lines: List[str], tables: List[MarkdownTable]):
+        self._lines = lines
+        self.tables = tables
+
+    @classmethod
+    def parse(cls, text: str) -> 'MarkdownDocument':
+        lines = text.split('\n')
+        tables = []
+        i = 0
+        while i < len(lines) - 1:
+            if is_table_row(lines[i]) and is_separator_row(lines[i + 1]):
+                start = i
+                header = split_cells(lines[i])
+                rows = []
+                i += 2
+                while i < len(lines) and is_table_row(lines[i]):
+                    rows.append(Row(lines[i]))
+                    i += 1
+                tables.append(MarkdownTable(header, lines[start], lines[start + 1], rows, start, i))
+            else:
+                i += 1
+        return cls(lines, tables)
+
+    def find_table(self, *columns: str) -> Optional[MarkdownTable]:
+        """First table having all of the given columns"""
+        for table in self.tables:
+            if table.has_columns(*columns):
+                return table
+        return None
+
+    def iter_lines(self) -> Iterable[str]:
+        position = 0
+        for table in self.tables:
+            yield from self._lines[position:table.start]
+            yield from table.lines()
+            position = table.end
+        yield from self._lines[position:]
+
+    def serialize(self) -> str:
+        return '\n'.join(self.iter_lines())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pinned GitHub Actions and other literal rewrite tables
+
+Each table is compiled once into a single alternation regex, and matches
+are dispatched through a dictionary, so the content is scanned once no
+matter how many entries the table has. Adding a pin is a data change to
+PINNED_ACTIONS.
+"""
+import re
+from typing import Dict, Mapping, Optional, Tuple
+
+# (action, floating tag) -> (commit SHA, version the SHA corresponds to)
+PINNED_ACTIONS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ('actions/checkout', 'v3'): ('b4ffde65f46336ab88eb53be808477a3936bae11', 'v4'),
+    ('actions/setup-node', 'v3'): ('60edb5dd545a775178f52524783378180af0d1f8', 'v4'),
+    ('gaurav-nelson/github-action-markdown-link-check', 'v1'): ('a947807a87961f05621720101487bf0890a81bce', 'v1'),
+}
+
+# Job-level permissions added to workflows that have none
+PERMISSIONS_PATTERN = re.compile(r'runs-on: ubuntu-latest\n    steps:')
+PERMISSIONS_BLOCK = 'runs-on: ubuntu-latest\n    permissions:\n      contents: read\n      pull-requests: read\n    steps:'
+
+
+class ReplacementTable:
+    """Literal -> replacement mapping applied in one regex pass
+
+    prefix and suffix are regex fragments that must surround a literal for
+    it to match (e.g. a lookbehind that skips already-fixed text); they are
+    not part of the dictionary key.
+    """
+
+    def __init__(self, replacements: Mapping[str, str], prefix: str = '', suffix: str = ''):
+        self.replacements = dict(replacements)
+        # Longest first, so no entry is shadowed by a shorter prefix of it
+        literals = sorted(self.replacements, key=len, reverse=True)
+        alternation = '|'.join(re.escape(literal) for literal in literals)
+        self.regex: Optional[re.Pattern] = (
+            re.compile(f'{prefix}({alternation}){suffix}') if literals else None)
+
+    def _dispatch(self, match: re.Match) -> str:
+        return self.replacements[match.group(1)]
+
+    def apply(self, content: str) -> str:
+        if self.regex is None:
+            return content
+        return self.regex.sub(self._dispatch, content)
+
+
+def action_pin_table(pins: Mapping[Tuple[str, str], Tuple[str, str]] = PINNED_ACTIONS) -> ReplacementTable:
+    """Compile pins into 'uses: action@tag' -> 'uses: action@sha # version'
+
+    The tag must end the reference, so '@v3' does not match '@v3.1'.
+    """
+    replacements = {
+        f'uses: {action}@{tag}': f'uses: {action}@{sha} # {version}'
+        for (action, tag), (sha, version) in pins.items()
+    }
+    return ReplacementTable(replacements, suffix=r'(?![\w.\-])')
+
+
+ACTION_PINS = action_pin_table()
+
+
+def pin_actions(content: str) -> str:
+    """Pin every known action reference in one scan"""
+    return ACTION_PINS.apply(content)
+
+
+def add_permissions(content: str) -> str:
+    """Add a read-only permissions block after runs-on"""
+    return PERMISSIONS_PATTERN.sub(PERMISSIONS_BLOCK, content)
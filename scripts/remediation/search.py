@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the markdown in docs/ and training/
+
+Documents are split into sections at their headings and each section is
+indexed as a unit, so a hit points at the heading to open. The index is
+a directory of files:
+
+    manifest.json   format, generation, live section count, average
+                    length, and the section ids and posting pairs in use
+    lexicon.N.json  term -> [offset, document frequency]
+    postings.N.bin  (section id, term frequency) uint32 pairs, grouped by term
+    lengths.N.bin   uint32 token count of each section
+    sections.N.jsonl + sections.N.idx
+                    one [path, line, slug, title] per section, and the
+                    uint64 byte offset of each line
+    forward.json    per file: mtime, size, content hash and its section
+                    ids (read only when updating)
+    terms/<hash>.json
+                    the sections' term frequencies of each file content
+
+update() re-reads and re-tokenizes only files whose content hash changed
+and patches the index: the changed files' old sections are dropped and
+their new ones get new section ids, only the posting lists of the terms
+those sections contain are rewritten (appended after the old lists,
+which are copied as they are), and the term frequencies of the other
+files are never read. Once the ids or posting pairs left unused
+outnumber the live ones, the index is rebuilt from the terms/ files.
+Files of a new generation are written first and manifest.json is
+replaced last, so readers see either the old index or the new one (the
+generation before is kept for readers still opening it). A query maps
+the postings and section files and reads only the lexicon, the posting
+lists of its terms and the metadata of the sections it returns.
+"""
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .cache import content_digest
+from .discovery import DEFAULT_EXCLUDE, FileDiscovery
+from .fileio import atomic_write_bytes, atomic_write_text, decode_text, locked
+from .headings import parse_markdown
+from .mdblocks import blocks_for
+
+INDEX_DIR = '.search_index'
+INDEX_FORMAT = 2
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+HEADING_BOOST = 2      # heading words count this many times
+
+_TOKEN = re.compile(r'\w\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class Section(NamedTuple):
+    line: int        # 1-based line of the heading (1 for text before the first heading)
+    slug: str        # '' for text before the first heading
+    title: str
+    terms: Dict[str, int]
+
+
+class Hit(NamedTuple):
+    path: str
+    line: int
+    slug: str
+    title: str
+    score: float
+
+
+def split_sections(text: str, title: str = '') -> List[Section]:
+    """Sections of a markdown document with their term frequencies"""
+    blocks = blocks_for(text)
+    starts = {heading.line: heading for heading in parse_markdown(text).headings}
+    sections = []
+    current = Section(1, '', title, {})
+    for number, line in enumerate(blocks.lines, 1):
+        heading = starts.get(number)
+        if heading is not None:
+            if current.terms or current.slug:
+                sections.append(current)
+            current = Section(number, heading.slug, heading.text, {})
+            words = tokenize(heading.text) * HEADING_BOOST
+        else:
+            words = tokenize(line)
+        for word in words:
+            current.terms[word] = current.terms.get(word, 0) + 1
+    if current.terms or current.slug:
+        sections.append(current)
+    return sections
+
+
+def parser_fingerprint() -> str:
+    """Hash of the modules that decide how documents are tokenized"""
+    h = hashlib.sha256(f'format={INDEX_FORMAT}'.encode())
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in ('search.py', 'headings.py', 'mdblocks.py', 'mdtable.py'):
+        with open(os.path.join(package_dir, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _index_file(path: str, digest: Optional[str]):
+    """((mtime_ns, size, digest, sections or None if unchanged), error)"""
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        new_digest = content_digest(raw)
+        if new_digest == digest:
+            return (st.st_mtime_ns, st.st_size, digest, None), None
+        title = os.path.splitext(os.path.basename(path))[0]
+        sections = [list(s) for s in split_sections(decode_text(raw), title)]
+        return (st.st_mtime_ns, st.st_size, new_digest, sections), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class UpdateResult(NamedTuple):
+    files: int
+    indexed: int     # files read and tokenized again
+    removed: int
+    sections: int
+    errors: Dict[str, str]
+
+
+def _read_json(path: str):
+    try:
+        with open(path, 'rb') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _terms_path(index_dir: str, digest: str) -> str:
+    return os.path.join(index_dir, 'terms', f'{digest}.json')
+
+
+def _load_sections(index_dir: str, digest: str) -> List[List]:
+    sections = _read_json(_terms_path(index_dir, digest))
+    if not isinstance(sections, list):
+        raise ValueError(f"Search index in {index_dir} is incomplete; delete it and run update-search-index.py")
+    return sections
+
+
+def update(roots: Iterable[str], index_dir: str = INDEX_DIR, jobs: int = 1) -> UpdateResult:
+    """Bring the index up to date with the markdown files under roots
+
+    Files are keyed by their path as given (relative to the current
+    directory by default). Unchanged files are answered from forward.json
+    on stat alone; only changed files' terms are read or written.
+    """
+    os.makedirs(os.path.join(index_dir, 'terms'), exist_ok=True)
+    forward_path = os.path.join(index_dir, 'forward.json')
+    fingerprint = parser_fingerprint()
+    with locked(forward_path, create=True):
+        forward = _read_json(forward_path)
+        if not isinstance(forward, dict) or forward.get('fingerprint') != fingerprint:
+            forward = {'fingerprint': fingerprint, 'generation': None, 'files': {}}
+        # path -> [mtime_ns, size, digest, first section id, section count]
+        files: Dict[str, List] = forward['files']
+
+        discovery = FileDiscovery(('*.md', '*.markdown'), DEFAULT_EXCLUDE)
+        paths = list(dict.fromkeys(os.path.normpath(p) for p in discovery.expand(roots)))
+        stale = []
+        for path in paths:
+            entry = files.get(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                stale.append((path, None))
+                continue
+            if entry is None or entry[:2] != [st.st_mtime_ns, st.st_size]:
+                stale.append((path, entry[2] if entry is not None else None))
+
+        args = ([p for p, _ in stale], [d for _, d in stale])
+        if jobs <= 1 or len(stale) < 2:
+            results = list(map(_index_file, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(_index_file, *args, chunksize=max(1, len(stale) // (jobs * 4))))
+
+        # path -> (mtime_ns, size, digest, sections), or None once removed
+        changed: Dict[str, Optional[Tuple]] = {}
+        errors = {}
+        for (path, _), (result, error) in zip(stale, results):
+            if result is None:
+                if path in files:
+                    changed[path] = None
+                errors[path] = error
+            elif result[3] is None:
+                files[path][:3] = result[:3]
+            else:
+                changed[path] = result
+        wanted = set(paths)
+        removed = [path for path in files if path not in wanted]
+        for path in removed:
+            changed[path] = None
+        for path, result in changed.items():
+            if result is not None:
+                atomic_write_text(_terms_path(index_dir, result[2]),
+                                  json.dumps(result[3], separators=(',', ':')))
+
+        manifest = _read_json(os.path.join(index_dir, 'manifest.json'))
+        current = (isinstance(manifest, dict) and manifest.get('format') == INDEX_FORMAT
+                   and manifest.get('generation') == forward['generation'])
+        if changed or not current:
+            dropped = {files[path][2] for path in changed if path in files}
+            generation = (manifest.get('generation', 0) if isinstance(manifest, dict) else 0) + 1
+            stats = _patch(index_dir, generation, files, changed, manifest) if current else None
+            if stats is None:
+                stats = _rebuild(index_dir, generation, files, changed)
+            # forward.json names the generation it describes and is written
+            # before the manifest, so an interrupted update is rebuilt next time
+            forward['generation'] = generation
+            atomic_write_text(forward_path, json.dumps(forward, separators=(',', ':')))
+            _publish(index_dir, generation, stats)
+            in_use = {entry[2] for entry in files.values()}
+            for digest in dropped - in_use:
+                try:
+                    os.unlink(_terms_path(index_dir, digest))
+                except FileNotFoundError:
+                    pass
+            sections = stats['sections']
+        else:
+            sections = manifest['sections']
+            if stale:
+                atomic_write_text(forward_path, json.dumps(forward, separators=(',', ':')))
+    indexed = sum(1 for path, result in changed.items() if result is not None or path not in removed)
+    return UpdateResult(len(paths), indexed, len(removed), sections, errors)
+
+
+class _Generation:
+    """Contents of a new generation, before they are written"""
+
+    def __init__(self):
+        self.postings = array('I')
+        self.lexicon: Dict[str, List[int]] = {}
+        self.lengths = array('I')
+        self.offsets = array('Q')
+        self.metadata: List[bytes] = []
+        self.position = 0
+
+    def add_section(self, path: str, line: int, slug: str, title: str, terms: Dict[str, int],
+                    lists: Dict[str, array]) -> int:
+        section_id = len(self.lengths)
+        self.lengths.append(sum(terms.values()))
+        for term, count in terms.items():
+            pairs = lists.get(term)
+            if pairs is None:
+                pairs = lists[term] = array('I')
+            pairs.append(section_id)
+            pairs.append(count)
+        row = (json.dumps([path, line, slug, title]) + '\n').encode('utf-8')
+        self.offsets.append(self.position)
+        self.metadata.append(row)
+        self.position += len(row)
+        return section_id
+
+    def add_postings(self, lists: Dict[str, array]):
+        for term in sorted(lists):
+            pairs = lists[term]
+            if pairs:
+                self.lexicon[term] = [len(self.postings) // 2, len(pairs) // 2]
+                self.postings.extend(pairs)
+            else:
+                self.lexicon.pop(term, None)
+
+
+def _rebuild(index_dir: str, generation: int, files: Dict[str, List],
+             changed: Dict[str, Optional[Tuple]]) -> dict:
+    """Every section numbered afresh in path order, read from the terms/ files"""
+    for path, result in changed.items():
+        if result is None:
+            files.pop(path, None)
+        else:
+            files[path] = list(result[:3]) + [0, 0]
+    new = _Generation()
+    lists: Dict[str, array] = {}
+    tokens = 0
+    for path in sorted(files):
+        result = changed.get(path)
+        sections = result[3] if result is not None else _load_sections(index_dir, files[path][2])
+        files[path][3:] = [len(new.lengths), len(sections)]
+        for line, slug, title, terms in sections:
+            new.add_section(path, line, slug, title, terms, lists)
+            tokens += new.lengths[-1]
+    new.add_postings(lists)
+    _write_generation(index_dir, generation, new)
+    return {'sections': len(new.lengths), 'tokens': tokens, 'next_section': len(new.lengths),
+            'pairs': len(new.postings) // 2, 'unused_pairs': 0}
+
+
+def _patch(index_dir: str, generation: int, files: Dict[str, List],
+           changed: Dict[str, Optional[Tuple]], manifest: dict) -> Optional[dict]:
+    """The current generation with only the changed files' sections and terms replaced
+
+    Returns None, writing nothing, when a rebuild would leave the index smaller.
+    """
+    old_ids = set()
+    touched: Dict[str, array] = {}
+    removed_tokens = 0
+    with SearchIndex(index_dir) as current:
+        lengths = current._view('lengths', 'bin', 'I')
+        for path in changed:
+            entry = files.get(path)
+            if entry is None:
+                continue
+            first, count = entry[3:5]
+            old_ids.update(range(first, first + count))
+            removed_tokens += sum(lengths[first:first + count])
+            for _, _, _, terms in _load_sections(index_dir, entry[2]):
+                touched.update((term, None) for term in terms)
+        added = [result for result in changed.values() if result is not None]
+        for result in added:
+            for _, _, _, terms in result[3]:
+                touched.update((term, None) for term in terms)
+
+        unused_pairs = manifest['unused_pairs']
+        for term in touched:
+            pairs = current.postings(term)
+            unused_pairs += len(pairs) // 2
+            kept = array('I')
+            for i in range(0, len(pairs), 2):
+                if pairs[i] not in old_ids:
+                    kept.append(pairs[i])
+                    kept.append(pairs[i + 1])
+            touched[term] = kept
+
+        new = _Generation()
+        new.lexicon = dict(current.lexicon)
+        new.lengths = array('I', bytes(current._map('lengths', 'bin')))
+        new.offsets = array('Q', bytes(current._map('sections', 'idx')))
+        if sys.byteorder != 'little':
+            new.lengths.byteswap()
+            new.offsets.byteswap()
+        for section_id in old_ids:
+            new.lengths[section_id] = 0
+        new.postings = array('I', bytes(current._map('postings', 'bin')))
+        if sys.byteorder != 'little':
+            new.postings.byteswap()
+        new.position = len(current._map('sections', 'jsonl'))
+        old_metadata = bytes(current._map('sections', 'jsonl'))
+
+    sections = manifest['sections'] - len(old_ids) + sum(len(result[3]) for result in added)
+    next_section = manifest['next_section'] + sum(len(result[3]) for result in added)
+    if next_section - sections > sections:
+        return None
+    tokens = manifest['tokens'] - removed_tokens
+    for path, result in sorted(changed.items()):
+        if result is None:
+            files.pop(path, None)
+            continue
+        files[path] = list(result[:3]) + [len(new.lengths), len(result[3])]
+        for line, slug, title, terms in result[3]:
+            new.add_section(path, line, slug, title, terms, touched)
+            tokens += new.lengths[-1]
+    new.add_postings(touched)
+    pairs = sum(count for _, count in new.lexicon.values())
+    if unused_pairs > pairs:
+        return None
+    _write_generation(index_dir, generation, new, old_metadata)
+    return {'sections': sections, 'tokens': tokens, 'next_section': next_section,
+            'pairs': pairs, 'unused_pairs': unused_pairs}
+
+
+def _write_generation(index_dir: str, generation: int, new: _Generation, old_metadata: bytes = b''):
+    postings, lengths, offsets = new.postings, new.lengths, new.offsets
+    if sys.byteorder != 'little':
+        for data in (postings, lengths, offsets):
+            data.byteswap()
+    name = lambda stem, ext: os.path.join(index_dir, f'{stem}.{generation}.{ext}')
+    atomic_write_bytes(name('postings', 'bin'), postings.tobytes())
+    atomic_write_bytes(name('lengths', 'bin'), lengths.tobytes())
+    atomic_write_bytes(name('sections', 'idx'), offsets.tobytes())
+    atomic_write_bytes(name('sections', 'jsonl'), old_metadata + b''.join(new.metadata))
+    atomic_write_text(name('lexicon', 'json'), json.dumps(new.lexicon, separators=(',', ':')))
+
+
+def _publish(index_dir: str, generation: int, stats: dict):
+    """Make a written generation the current one and drop those before the previous"""
+    atomic_write_text(os.path.join(index_dir, 'manifest.json'), json.dumps(dict(
+        stats, format=INDEX_FORMAT, generation=generation,
+        average_length=stats['tokens'] / stats['sections'] if stats['sections'] else 0.0)))
+    for entry in os.listdir(index_dir):
+        parts = entry.split('.')
+        if len(parts) == 3 and parts[1].isdigit() and int(parts[1]) < generation - 1:
+            os.unlink(os.path.join(index_dir, entry))
+
+
+class SearchIndex:
+    """Read side of the index; files are mapped lazily and never copied whole"""
+
+    def __init__(self, index_dir: str = INDEX_DIR):
+        self.index_dir = index_dir
+        self.manifest = _read_json(os.path.join(index_dir, 'manifest.json'))
+        if not isinstance(self.manifest, dict) or self.manifest.get('format') != INDEX_FORMAT:
+            raise ValueError(f"No search index in {index_dir}; run update-search-index.py first")
+        self.generation = self.manifest['generation']
+        self._lexicon: Optional[Dict[str, List[int]]] = None
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._views: Dict[str, memoryview] = {}
+
+    def _path(self, stem: str, ext: str) -> str:
+        return os.path.join(self.index_dir, f'{stem}.{self.generation}.{ext}')
+
+    def _map(self, stem: str, ext: str):
+        key = f'{stem}.{ext}'
+        if key not in self._maps:
+            with open(self._path(stem, ext), 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                self._maps[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        return self._maps[key]
+
+    def _view(self, stem: str, ext: str, typecode: str) -> memoryview:
+        """The whole file as an array of typecode, mapped once"""
+        key = f'{stem}.{ext}'
+        if key not in self._views:
+            data = self._map(stem, ext)
+            if sys.byteorder != 'little':
+                data = array(typecode, bytes(data))
+                data.byteswap()
+            self._views[key] = memoryview(data).cast('B').cast(typecode)
+        return self._views[key]
+
+    @property
+    def lexicon(self) -> Dict[str, List[int]]:
+        if self._lexicon is None:
+            data = _read_json(self._path('lexicon', 'json'))
+            if not isinstance(data, dict):
+                raise ValueError(f"Search index in {self.index_dir} is incomplete; run update-search-index.py")
+            self._lexicon = data
+        return self._lexicon
+
+    def __len__(self) -> int:
+        return self.manifest['sections']
+
+    def postings(self, term: str) -> memoryview:
+        """(section id, term frequency) pairs of a term, flattened"""
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return memoryview(array('I'))
+        offset, count = entry
+        return self._view('postings', 'bin', 'I')[2 * offset:2 * (offset + count)]
+
+    def section(self, section_id: int) -> Tuple[str, int, str, str]:
+        offsets = self._view('sections', 'idx', 'Q')
+        data = self._map('sections', 'jsonl')
+        start = offsets[section_id]
+        end = offsets[section_id + 1] if section_id + 1 < len(offsets) else len(data)
+        return tuple(json.loads(bytes(data[start:end])))
+
+    def search(self, query: str, limit: int = 10) -> List[Hit]:
+        """Sections ranked by BM25 over the query's terms"""
+        terms = set(tokenize(query))
+        total = len(self)
+        if not terms or not total:
+            return []
+        lengths = self._view('lengths', 'bin', 'I')
+        average = self.manifest['average_length'] or 1.0
+        scores: Dict[int, float] = {}
+        for term in terms:
+            pairs = self.postings(term)
+            df = len(pairs) // 2
+            if not df:
+                continue
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for i in range(0, len(pairs), 2):
+                section_id, tf = pairs[i], pairs[i + 1]
+                norm = K1 * (1 - B + B * lengths[section_id] / average)
+                scores[section_id] = scores.get(section_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [Hit(*self.section(section_id), round(score, 4)) for section_id, score in ranked]
+
+    def close(self):
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        for mapped in self._maps.values():
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._maps.clear()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def search(query: str, index_dir: str = INDEX_DIR, limit: int = 10) -> List[Hit]:
+    """Ranked section hits for query from the index in index_dir"""
+    with SearchIndex(index_dir) as index:
+        return index.search(query, limit)
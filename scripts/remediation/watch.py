@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the fixers
+
+WatchDaemon keeps a pipeline's rules compiled in memory, waits for files
+under the watched roots to change, debounces bursts of saves and re-fixes
+only the files that changed. Change events come from inotify on Linux
+(through ctypes, no extra dependency) and from mtime polling elsewhere or
+when inotify is unavailable.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .cache import FixCache
+from .discovery import FileDiscovery
+from .engine import FileResult, FixerPipeline
+
+# Trees watched when no paths are given
+WATCH_ROOTS = ('training', 'docs')
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_INTERVAL = 0.5
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT = struct.Struct('iIII')
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _rel(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+class PollingWatcher:
+    """Finds changes by re-walking the roots and comparing mtime and size"""
+    name = 'polling'
+
+    def __init__(self, roots: Sequence[str], discovery: FileDiscovery,
+                 interval: float = DEFAULT_INTERVAL):
+        self.roots = list(roots)
+        self.discovery = discovery
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for path in self.discovery.walk(root):
+                key = _stat_key(path)
+                if key is not None:
+                    snapshot[path] = key
+        return snapshot
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Wait up to timeout; return files created or modified since the last call"""
+        time.sleep(max(0.0, min(timeout, self.interval)))
+        snapshot = self._scan()
+        changed = {path for path, key in snapshot.items() if self.snapshot.get(path) != key}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+def _load_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, 'inotify_init1') else None
+
+
+class InotifyWatcher:
+    """Kernel change notifications for every directory under the roots"""
+    name = 'inotify'
+
+    def __init__(self, roots: Sequence[str], discovery: FileDiscovery):
+        self.libc = _load_libc()
+        if self.libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = list(roots)
+        self.discovery = discovery
+        # watch descriptor -> (root, directory)
+        self.watches: Dict[int, Tuple[str, str]] = {}
+        try:
+            for root in self.roots:
+                self._watch_tree(root, root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, root: str, top: str) -> Set[str]:
+        """Watch top and the directories below it; returns wanted files already there
+
+        Files written into a directory before its watch exists produce no
+        event, so a newly created tree is listed once as it is added.
+        """
+        found = set()
+        for directory in self.discovery.directories(top):
+            if directory != root and self.discovery.prune.match(_rel(directory, root)):
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
+                    continue  # vanished or unreadable
+                raise OSError(err, f"inotify_add_watch failed for {directory}")
+            self.watches[wd] = (root, directory)
+            if top != root:
+                with os.scandir(directory) as it:
+                    found.update(os.path.normpath(entry.path) for entry in it
+                                 if entry.is_file() and self.discovery.wanted(_rel(entry.path, root)))
+        return found
+
+    def _parse(self, data: bytes) -> Set[str]:
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: treat everything in scope as changed
+                for root in self.roots:
+                    changed.update(os.path.normpath(p) for p in self.discovery.walk(root))
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            watch = self.watches.get(wd)
+            if watch is None or not name:
+                continue
+
+            root, directory = watch
+            path = os.path.normpath(os.path.join(directory, name))
+            if mask & IN_ISDIR:
+                if not self.discovery.prune.match(_rel(path, root)):
+                    changed |= self._watch_tree(root, path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and self.discovery.wanted(_rel(path, root)):
+                changed.add(path)
+        return changed
+
+    def changes(self, timeout: float) -> Set[str]:
+        """Wait up to timeout; return files written or moved into place"""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        changed = set()
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._parse(data)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(roots: Sequence[str], discovery: FileDiscovery, poll: bool = False,
+                 interval: float = DEFAULT_INTERVAL):
+    """inotify where the kernel supports it, mtime polling otherwise"""
+    if not poll:
+        try:
+            return InotifyWatcher(roots, discovery)
+        except OSError:
+            pass
+    return PollingWatcher(roots, discovery, interval)
+
+
+class WatchDaemon:
+    """Debounced re-fixing of changed files with the rules held in memory"""
+
+    def __init__(self, pipeline: FixerPipeline, watcher, debounce: float = DEFAULT_DEBOUNCE,
+                 cache: Optional[FixCache] = None,
+                 report: Optional[Callable[[FileResult], None]] = None):
+        self.pipeline = pipeline
+        self.watcher = watcher
+        self.debounce = debounce
+        self.cache = cache
+        self.report = report
+        self.pending: Set[str] = set()
+        self.deadline: Optional[float] = None
+        # Files this daemon wrote -> (mtime_ns, size) just after the write
+        self.written: Dict[str, Tuple[int, int]] = {}
+
+    def fix(self, paths: Iterable[str]) -> List[FileResult]:
+        """Fix paths now, remembering our own writes so they do not re-trigger"""
+        results = self.pipeline.run((os.path.normpath(p) for p in paths), cache=self.cache)
+        for result in results:
+            if result.status == 'fixed':
+                self.written[result.path] = (result.mtime_ns, result.size)
+            if self.report:
+                self.report(result)
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    def step(self, idle_timeout: float = 1.0) -> List[FileResult]:
+        """Wait for changes once; fix and return the batch when its burst has settled"""
+        if self.deadline is None:
+            timeout = idle_timeout
+        else:
+            timeout = self.deadline - time.monotonic()
+
+        fresh = False
+        for path in map(os.path.normpath, self.watcher.changes(timeout)):
+            written = self.written.pop(path, None)
+            if written is not None and written == _stat_key(path):
+                continue  # the event for our own write
+            self.pending.add(path)
+            fresh = True
+        if fresh:
+            # Every new save in a burst pushes the batch back
+            self.deadline = time.monotonic() + self.debounce
+
+        if self.pending and time.monotonic() >= self.deadline:
+            batch = sorted(self.pending)
+            self.pending.clear()
+            self.deadline = None
+            return self.fix(batch)
+        return []
+
+    def serve(self, stop: Callable[[], bool] = lambda: False):
+        while not stop():
+            self.step()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Search the training material by section
+
+    python3 scripts/search_docs.py speckit constitution
+    python3 scripts/search_docs.py --limit 5 --json "validation workflow"
+
+Reads the index built by update-search-index.py; hits are ranked by BM25
+and point at the heading of the matching section.
+"""
+import argparse
+import json
+import sys
+
+from remediation.search import INDEX_DIR, search
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search the docs and training index")
+    parser.add_argument('terms', nargs='+', help="words to search for")
+    parser.add_argument('--index', default=INDEX_DIR, metavar='DIR',
+                        help="index directory (default: %(default)s)")
+    parser.add_argument('--limit', '-n', type=int, default=10, metavar='N',
+                        help="number of hits to show (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print the hits as a JSON list")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        hits = search(' '.join(args.terms), args.index, args.limit)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps([hit._asdict() for hit in hits], indent=2))
+    else:
+        for hit in hits:
+            anchor = f'#{hit.slug}' if hit.slug else ''
+            print(f"{hit.score:7.2f}  {hit.path}{anchor}  (line {hit.line})  {hit.title}")
+    return 0 if hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
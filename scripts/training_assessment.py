@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Training quality assessment tool
+
+    python3 scripts/training_assessment.py alice                    # one participant, as JSON
+    python3 scripts/training_assessment.py alice bob carol          # several, as JSON lines
+    python3 scripts/training_assessment.py --all --jobs 0           # whole cohort on every CPU
+    python3 scripts/training_assessment.py --participants ids.txt   # IDs one per line ('-' = stdin)
+    python3 scripts/training_assessment.py --all --store metrics/cohort.tmcs   # from ingest_metrics.py
+"""
+import argparse
+import json
+import sys
+
+from remediation.engine import resolve_jobs
+from training_metrics import DEFAULT_METRICS_DIR, TrainingAssessment
+from training_metrics.batch import CHUNK_SIZE, write_cohort_jsonl
+
+
+def read_participants(path):
+    """Participant IDs from a file, one per line, read lazily"""
+    f = sys.stdin if path == '-' else open(path, 'r')
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Assess training progress from daily metrics")
+    parser.add_argument('participant_ids', nargs='*', metavar='participant_id',
+                        help="participants to report on")
+    parser.add_argument('--all', action='store_true', help="report on every participant in the cohort")
+    parser.add_argument('--participants', metavar='FILE',
+                        help="read participant IDs from FILE, one per line ('-' for stdin)")
+    parser.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                        help="directory of daily metrics files (default: %(default)s)")
+    parser.add_argument('--store', metavar='FILE',
+                        help="read metrics from a store built by ingest_metrics.py instead of JSON files")
+    parser.add_argument('--date', help="only use metrics recorded on this date (YYYY-MM-DD)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="worker processes for batch reports (0 = one per CPU, default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, metavar='N',
+                        help="participants per worker task (default: %(default)s)")
+    args = parser.parse_args(argv)
+    sources = bool(args.participant_ids) + args.all + (args.participants is not None)
+    if sources != 1:
+        parser.error("give participant IDs, --participants FILE or --all")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be a positive integer")
+    try:
+        args.jobs = resolve_jobs(args.jobs)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if len(args.participant_ids) == 1:
+        assessor = TrainingAssessment(args.metrics_dir, args.date, store=args.store)
+        print(json.dumps(assessor.generate_progress_report(args.participant_ids[0]), indent=2))
+        return 0
+
+    # Batch: one report per line, streamed as workers finish
+    if args.participants is not None:
+        participant_ids = read_participants(args.participants)
+    else:
+        participant_ids = args.participant_ids or None
+    try:
+        write_cohort_jsonl(sys.stdout, args.metrics_dir, participant_ids, args.date,
+                           args.jobs, args.chunk_size, store=args.store)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
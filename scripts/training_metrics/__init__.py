@@ -0,0 +1,12 @@
+"""
+Training-outcome analytics over the metrics/daily/*.json files
+
+    from training_metrics import TrainingAssessment
+    reports = TrainingAssessment('metrics/daily').generate_cohort_report()
+"""
+from .assessment import QUALITY_THRESHOLDS, CohortScores, TrainingAssessment
+from .frame import DEFAULT_METRICS_DIR, MetricsFrame, MetricsIndex, index_for
+from .store import MetricsStore
+
+__all__ = ['CohortScores', 'DEFAULT_METRICS_DIR', 'MetricsFrame', 'MetricsIndex', 'MetricsStore',
+           'QUALITY_THRESHOLDS', 'TrainingAssessment', 'index_for']
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Training quality assessment over a whole cohort
+
+TrainingAssessment keeps the interface of the tool described in
+training/metrics/training-outcomes.md, but scores every participant and
+day at once: the threshold checks and the overall-score mean run as column
+operations over a MetricsFrame (with NumPy when it is installed, otherwise
+over stdlib arrays), and per-participant reports are read out of the
+results.
+"""
+import os
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from .frame import DEFAULT_METRICS_DIR, MetricsFrame, MetricsIndex, index_for
+from .store import MetricsStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+QUALITY_THRESHOLDS = {
+    'completion_rate': 0.90,
+    'quality_score': 0.85,
+    'exercise_completion': 0.95,
+    'validation_success': 1.0,
+}
+PASSING_SCORE = 0.8
+
+
+class CohortScores:
+    """Threshold checks and overall scores for every row of a frame
+
+    seen[metric] and passed[metric] are 0/1 per row; overall[row] is the
+    mean of the threshold metrics recorded for that row (0 if none were).
+    """
+
+    def __init__(self, frame: MetricsFrame, thresholds: Mapping[str, float]):
+        self.frame = frame
+        self.thresholds = dict(thresholds)
+        columns = [frame.column(name) for name in self.thresholds]
+        if np is not None:
+            self._score_numpy(columns)
+        else:
+            self._score_arrays(columns)
+
+    def _score_numpy(self, columns: List[Sequence[float]]):
+        rows = len(self.frame)
+        totals = np.zeros(rows)
+        counts = np.zeros(rows, dtype=np.int64)
+        self.seen, self.passed = {}, {}
+        for (name, limit), column in zip(self.thresholds.items(), columns):
+            # A view through the buffer protocol; store columns stay strided, uncopied
+            values = np.asarray(memoryview(column))
+            seen = ~np.isnan(values)
+            self.seen[name] = seen.astype(np.int8).tobytes()
+            self.passed[name] = (values >= limit).astype(np.int8).tobytes()
+            totals += np.where(seen, values, 0.0)
+            counts += seen
+        overall = np.divide(totals, counts, out=np.zeros(rows), where=counts > 0)
+        self.overall = array('d', overall.tobytes())
+
+    def _score_arrays(self, columns: List[Sequence[float]]):
+        rows = len(self.frame)
+        totals = [0.0] * rows
+        counts = [0] * rows
+        self.seen, self.passed = {}, {}
+        for (name, limit), column in zip(self.thresholds.items(), columns):
+            # NaN compares unequal to itself and fails every threshold
+            seen = bytes(value == value for value in column)
+            self.seen[name] = seen
+            self.passed[name] = bytes(value >= limit for value in column)
+            totals = [t + v if s else t for t, v, s in zip(totals, column, seen)]
+            counts = [c + s for c, s in zip(counts, seen)]
+        self.overall = array('d', (t / c if c else 0.0 for t, c in zip(totals, counts)))
+
+    def assessment(self, row: int) -> Dict[str, Any]:
+        """The per-day assessment dict of one row"""
+        participant_id = self.frame.participant_at(row)
+        strengths = [name for name in self.thresholds if self.seen[name][row] and self.passed[name][row]]
+        improvements = [name for name in self.thresholds if self.seen[name][row] and not self.passed[name][row]]
+        overall = self.overall[row]
+
+        recommendations = []
+        if overall < PASSING_SCORE:
+            recommendations.append("Additional support and practice needed")
+        if 'quality_score' in improvements:
+            recommendations.append("Focus on deliverable quality improvement")
+        if 'completion_rate' in improvements:
+            recommendations.append("Time management and task prioritization needed")
+
+        return {
+            "participant_id": participant_id,
+            "day": self.frame.day_at(row),
+            "overall_score": overall,
+            "areas_of_strength": strengths,
+            "areas_for_improvement": improvements,
+            "recommendations": recommendations,
+        }
+
+
+class TrainingAssessment:
+    """Assess daily performance and progress from metrics/daily/*.json
+
+    The directory is read once, on first use, and again only after files
+    were added, removed or renamed in it (its mtime changed); call
+    refresh() to pick up files rewritten in place. Given a store (see
+    store.py), metrics are read from that segment instead, without parsing.
+    """
+
+    def __init__(self, metrics_dir: str = DEFAULT_METRICS_DIR, date: Optional[str] = None,
+                 thresholds: Optional[Mapping[str, float]] = None, store: Optional[str] = None):
+        self.metrics_dir = metrics_dir
+        self.date = date
+        self.quality_thresholds = dict(thresholds or QUALITY_THRESHOLDS)
+        self.store = store
+        self._index: Optional[MetricsIndex] = None
+        self._segment: Optional[MetricsStore] = None
+        self._segment_size: Optional[int] = None
+        self._scores: Optional[CohortScores] = None
+
+    @property
+    def index(self) -> MetricsIndex:
+        """(participant, day) -> file index of the metrics directory"""
+        return index_for(self.metrics_dir)
+
+    @property
+    def scores(self) -> CohortScores:
+        if self.store is not None:
+            return self._store_scores()
+        index = self.index
+        if self._scores is None or index is not self._index:
+            self._index = index
+            frame = MetricsFrame.load(self.metrics_dir, self.date)
+            self._scores = CohortScores(frame, self.quality_thresholds)
+        return self._scores
+
+    def _store_scores(self) -> CohortScores:
+        """Scores read in place from a metrics store, remapped after appends"""
+        size = os.stat(self.store).st_size
+        if self._scores is None or size != self._segment_size:
+            previous = self._segment
+            self._segment, self._segment_size = MetricsStore(self.store), size
+            self._scores = CohortScores(self._segment.frame(self.date), self.quality_thresholds)
+            if previous is not None:
+                previous.close()
+        return self._scores
+
+    def refresh(self):
+        self._scores = None
+
+    def metrics_file(self, participant_id: str, day: int) -> Optional[str]:
+        """Path of the file a day's assessment is based on, if any"""
+        return self.index.path(participant_id, day, self.date)
+
+    def assess_daily_performance(self, participant_id: str, day: int) -> Dict[str, Any]:
+        """Assess participant performance for a specific day"""
+        scores = self.scores
+        row = scores.frame.row(participant_id, day)
+        if row is None:
+            return {"error": "Metrics file not found"}
+        return scores.assessment(row)
+
+    def generate_progress_report(self, participant_id: str) -> Dict[str, Any]:
+        """Generate comprehensive progress report for participant"""
+        return progress_report(self.scores, participant_id, datetime.now().isoformat())
+
+    def generate_cohort_report(self) -> Dict[str, Dict[str, Any]]:
+        """Progress reports for every participant, keyed by participant ID"""
+        scores = self.scores
+        report_date = datetime.now().isoformat()
+        return {pid: progress_report(scores, pid, report_date) for pid in scores.frame.participants}
+
+
+def progress_report(scores: CohortScores, participant_id: str, report_date: str) -> Dict[str, Any]:
+    """Progress report of one participant over the days recorded for them"""
+    rows = scores.frame.rows_of(participant_id)
+    report = {
+        "participant_id": participant_id,
+        "report_date": report_date,
+        "daily_assessments": [scores.assessment(row) for row in rows],
+        "overall_progress": {},
+        "recommendations": [],
+    }
+    if rows:
+        overall_scores = [scores.overall[row] for row in rows]
+        highest = max(overall_scores)
+        report["overall_progress"] = {
+            "average_score": sum(overall_scores) / len(overall_scores),
+            "improvement_trend": overall_scores[-1] - overall_scores[0] if len(overall_scores) > 1 else 0,
+            "consistency": min(overall_scores) / highest if highest > 0 else 0,
+        }
+    return report
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cohort progress reports over a bounded process pool
+
+Participants are assessed in chunks: each worker loads only its chunk's
+files, scores them as columns and returns the reports already encoded as
+JSON lines, so the parent just writes them out. Chunks are submitted as
+earlier ones are written, with at most two per worker in flight, so memory
+stays flat however large the cohort is, and output keeps the input order.
+"""
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .assessment import QUALITY_THRESHOLDS, CohortScores, progress_report
+from .frame import MetricsFrame, index_for
+from .store import MetricsStore
+
+CHUNK_SIZE = 25
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def assess_participants(metrics_dir: str, participant_ids: List[str], date: Optional[str] = None,
+                        thresholds: Optional[Mapping[str, float]] = None,
+                        store: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Progress reports for a group of participants, loading only their files
+
+    With a store only the chunk's rows are read from the segment and scored.
+    """
+    report_date = datetime.now().isoformat()
+    if store is not None:
+        with MetricsStore(store) as segment:
+            scores = CohortScores(segment.frame(date, participant_ids), thresholds or QUALITY_THRESHOLDS)
+            return [progress_report(scores, pid, report_date) for pid in participant_ids]
+    frame = MetricsFrame.load(metrics_dir, date, participants=participant_ids)
+    scores = CohortScores(frame, thresholds or QUALITY_THRESHOLDS)
+    return [progress_report(scores, pid, report_date) for pid in participant_ids]
+
+
+def _report_lines(metrics_dir: str, participant_ids: List[str], date: Optional[str],
+                  thresholds: Optional[Mapping[str, float]], store: Optional[str]) -> List[str]:
+    """JSON lines for one chunk; a chunk that fails reports an error per participant"""
+    try:
+        reports = assess_participants(metrics_dir, participant_ids, date, thresholds, store)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        reports = [{"participant_id": pid, "error": error} for pid in participant_ids]
+    return [json.dumps(report) for report in reports]
+
+
+def _all_participants(metrics_dir: str, store: Optional[str]) -> List[str]:
+    if store is None:
+        return index_for(metrics_dir).participants()
+    with MetricsStore(store) as segment:
+        return segment.participants()
+
+
+def _run_chunks(work: Callable[..., List], metrics_dir: str, participant_ids: Optional[Iterable[str]],
+                date: Optional[str], jobs: int, chunk_size: int,
+                thresholds: Optional[Mapping[str, float]], store: Optional[str] = None) -> Iterator:
+    if participant_ids is None:
+        participant_ids = _all_participants(metrics_dir, store)
+    chunks = _chunks(participant_ids, chunk_size)
+    if jobs <= 1:
+        for chunk in chunks:
+            yield from work(metrics_dir, chunk, date, thresholds, store)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(work, metrics_dir, chunk, date, thresholds, store))
+            if len(pending) >= jobs * IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_cohort_reports(metrics_dir: str, participant_ids: Optional[Iterable[str]] = None,
+                        date: Optional[str] = None, jobs: int = 1, chunk_size: int = CHUNK_SIZE,
+                        thresholds: Optional[Mapping[str, float]] = None,
+                        store: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Progress reports in input order (every known participant by default)"""
+    return _run_chunks(assess_participants, metrics_dir, participant_ids, date, jobs, chunk_size,
+                       thresholds, store)
+
+
+def write_cohort_jsonl(out: IO[str], metrics_dir: str, participant_ids: Optional[Iterable[str]] = None,
+                       date: Optional[str] = None, jobs: int = 1, chunk_size: int = CHUNK_SIZE,
+                       thresholds: Optional[Mapping[str, float]] = None, store: Optional[str] = None) -> int:
+    """Stream one report per line to out; returns the number written"""
+    count = 0
+    for line in _run_chunks(_report_lines, metrics_dir, participant_ids, date, jobs, chunk_size,
+                            thresholds, store):
+        out.write(line + '\n')
+        count += 1
+        if count % chunk_size == 0:
+            out.flush()
+    out.flush()
+    return count
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Columnar store for daily training metrics
+
+The tracking script in training/metrics/training-outcomes.md writes one
+file per participant per day:
+
+    metrics/daily/2025-09-22-alice-day1.json
+    {"participant_id": "alice", "training_day": 1,
+     "metrics": {"completion_rate": 0.95, "quality_score": 0.9, ...}}
+
+MetricsFrame loads a whole directory once into one float column per
+metric, indexed by (participant, day), so cohort-wide analytics are column
+reductions instead of a file open per participant per day. Missing values
+are NaN; booleans are stored as 1.0 / 0.0.
+"""
+import json
+import math
+import os
+import re
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .schema import flatten_metrics
+
+DEFAULT_METRICS_DIR = 'metrics/daily'
+TRAINING_DAYS = 5
+
+NAN = float('nan')
+
+_FILENAME = re.compile(r'(\d{4}-\d{2}-\d{2})-(.+)-day(\d+)\.json\Z')
+
+
+def to_number(value) -> float:
+    """Metric value as a float; NaN for anything that is not a number"""
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return NAN
+
+
+def is_missing(value: float) -> bool:
+    return math.isnan(value)
+
+
+class DailyRecord:
+    """Metrics of one participant for one training day"""
+    __slots__ = ('participant_id', 'day', 'date', 'metrics')
+
+    def __init__(self, participant_id: str, day: int, date: str, metrics: Mapping):
+        self.participant_id = participant_id
+        self.day = day
+        self.date = date
+        self.metrics = metrics
+
+
+def read_record(path: str) -> Optional[DailyRecord]:
+    """Parse one daily metrics file; None if its name or content is not one"""
+    match = _FILENAME.match(os.path.basename(path))
+    if not match:
+        return None
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        return None
+    metrics = flatten_metrics(data)
+    if not metrics:
+        return None
+    date, participant_id, day = match.groups()
+    session = data.get('session_info') if isinstance(data.get('session_info'), dict) else {}
+    person = data.get('participant_info') if isinstance(data.get('participant_info'), dict) else {}
+    try:
+        day = int(data.get('training_day') or session.get('training_day') or day)
+    except (TypeError, ValueError):
+        return None
+    return DailyRecord(str(data.get('participant_id') or person.get('participant_id') or participant_id),
+                       day, str(data.get('date') or session.get('date') or date), metrics)
+
+
+def _directory_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class MetricsIndex:
+    """(participant, day) -> daily metrics file, from one directory listing
+
+    Built from file names alone, without opening any file. Creating,
+    deleting or renaming a file changes the directory's mtime, which is
+    what is_current() checks; a file rewritten in place keeps its entry,
+    which still points at the right path.
+    """
+
+    def __init__(self, metrics_dir: str):
+        self.metrics_dir = metrics_dir
+        # Read before listing: a file added mid-scan makes the index stale
+        self.mtime_ns = _directory_mtime(metrics_dir)
+        self.files: Dict[Tuple[str, int], Dict[str, str]] = {}
+        self.days: Dict[str, List[int]] = {}
+        try:
+            entries = list(os.scandir(metrics_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            match = _FILENAME.match(entry.name)
+            if match and entry.is_file():
+                date, participant_id, day = match.groups()
+                key = (participant_id, int(day))
+                if key not in self.files:
+                    self.files[key] = {}
+                    self.days.setdefault(participant_id, []).append(key[1])
+                self.files[key][date] = entry.path
+
+    def is_current(self) -> bool:
+        return _directory_mtime(self.metrics_dir) == self.mtime_ns
+
+    def path(self, participant_id: str, day: int, date: Optional[str] = None) -> Optional[str]:
+        """File for a participant's day: of the given date, or the latest"""
+        dates = self.files.get((participant_id, day))
+        if not dates:
+            return None
+        if date is not None:
+            return dates.get(date)
+        return dates[max(dates)]
+
+    def paths(self, date: Optional[str] = None, participants: Optional[Iterable[str]] = None) -> List[str]:
+        """The file path() picks for every day of every (given) participant, in name order"""
+        keys = self.files if participants is None else [
+            (participant_id, day) for participant_id in participants
+            for day in self.days.get(participant_id, ())]
+        found = (self.path(participant_id, day, date) for participant_id, day in keys)
+        return sorted((path for path in found if path), key=os.path.basename)
+
+    def all_paths(self) -> List[str]:
+        """Every indexed file, including days superseded on later dates"""
+        return sorted((path for dates in self.files.values() for path in dates.values()),
+                      key=os.path.basename)
+
+    def participants(self) -> List[str]:
+        return sorted(self.days)
+
+
+_indexes: Dict[str, MetricsIndex] = {}
+
+
+def index_for(metrics_dir: str) -> MetricsIndex:
+    """Cached index of metrics_dir, rebuilt when the directory has changed"""
+    key = os.path.abspath(metrics_dir)
+    index = _indexes.get(key)
+    if index is None or not index.is_current():
+        index = _indexes[key] = MetricsIndex(metrics_dir)
+    return index
+
+
+def scan_records(metrics_dir: str, date: Optional[str] = None,
+                 participants: Optional[Iterable[str]] = None) -> Iterable[DailyRecord]:
+    """Daily records in metrics_dir, optionally of one date or some participants only"""
+    for path in index_for(metrics_dir).paths(date, participants):
+        record = read_record(path)
+        if record is not None:
+            yield record
+
+
+class MetricsFrame:
+    """Daily metrics of a cohort as float columns, one row per (participant, day)
+
+    Columns are arrays, or zero-copy memoryviews over a MetricsStore
+    segment; either way column(name)[row] is one day's value. Rows that are
+    not present (superseded by a later record of the same day, or filtered
+    out) still occupy their slot but are never reported.
+    """
+
+    def __init__(self, columns: Dict[str, Sequence[float]], rows: int,
+                 keys: Dict[Tuple[str, int], int], days: int = TRAINING_DAYS):
+        self.columns = columns
+        self.metrics: Tuple[str, ...] = tuple(columns)
+        self.days = days
+        self._length = rows
+        self._rows = keys
+        self._keys: Dict[int, Tuple[str, int]] = {row: key for key, row in keys.items()}
+        self.present = bytearray(rows)
+        by_participant: Dict[str, List[Tuple[int, int]]] = {}
+        for (pid, day), row in keys.items():
+            self.present[row] = 1
+            by_participant.setdefault(pid, []).append((day, row))
+        self._by_participant = {pid: [row for _, row in sorted(days)] for pid, days in by_participant.items()}
+        self.participants = sorted(by_participant)
+
+    @classmethod
+    def from_records(cls, records: Iterable[DailyRecord], days: int = TRAINING_DAYS) -> 'MetricsFrame':
+        """Build a frame; for a participant and day seen on several dates the latest wins"""
+        latest: Dict[Tuple[str, int], DailyRecord] = {}
+        names: Dict[str, None] = {}
+        for record in records:
+            if not 1 <= record.day <= days:
+                continue
+            key = (record.participant_id, record.day)
+            if key not in latest or record.date >= latest[key].date:
+                latest[key] = record
+            names.update(dict.fromkeys(record.metrics))
+
+        keys = {key: row for row, key in enumerate(sorted(latest))}
+        columns = {name: array('d', [NAN]) * len(keys) for name in names}
+        for key, row in keys.items():
+            for name, value in latest[key].metrics.items():
+                columns[name][row] = to_number(value)
+        return cls(columns, len(keys), keys, days)
+
+    @classmethod
+    def load(cls, metrics_dir: str = DEFAULT_METRICS_DIR, date: Optional[str] = None,
+             days: int = TRAINING_DAYS, participants: Optional[Iterable[str]] = None) -> 'MetricsFrame':
+        return cls.from_records(scan_records(metrics_dir, date, participants), days)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def row(self, participant_id: str, day: int) -> Optional[int]:
+        """Row of a participant's day, or None if there is no record for it"""
+        return self._rows.get((participant_id, day))
+
+    def rows_of(self, participant_id: str) -> List[int]:
+        """Rows of a participant's recorded days, in day order"""
+        return self._by_participant.get(participant_id, [])
+
+    def participant_at(self, row: int) -> str:
+        return self._keys[row][0]
+
+    def day_at(self, row: int) -> int:
+        return self._keys[row][1]
+
+    def column(self, name: str) -> Sequence[float]:
+        """Values of one metric for every row (all NaN if never recorded)"""
+        column = self.columns.get(name)
+        if column is None:
+            column = array('d', [NAN]) * len(self)
+        return column
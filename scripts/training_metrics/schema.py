@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Daily metrics schema
+
+The numeric fields of daily_metrics_template in
+training/metrics/outcome-tracking-templates.yaml, plus the flat metrics
+written by the tracking script in training-outcomes.md and the metrics
+the assessment thresholds. A daily record may carry the template's
+sections at top level, a flat "metrics" object, or both.
+"""
+
+# Numeric leaves of each template section (text fields are not stored)
+TEMPLATE_SECTIONS = {
+    'session_info': ('training_day', 'duration_hours'),
+    'completion_metrics': ('exercises_assigned', 'exercises_completed', 'completion_rate',
+                           'deliverables_submitted', 'deliverables_validated', 'validation_success_rate'),
+    'quality_metrics': ('overall_quality_score', 'specification_quality', 'implementation_quality',
+                        'documentation_quality', 'code_quality'),
+    'learning_objectives': ('concept_understanding', 'practical_application', 'tool_proficiency',
+                            'best_practice_adoption'),
+    'time_tracking': ('planned_duration', 'actual_duration', 'efficiency_ratio', 'break_time',
+                      'support_time'),
+    'engagement_metrics': ('participation_level', 'question_frequency', 'collaboration_quality',
+                           'initiative_shown'),
+    'support_metrics': ('help_requests', 'resolution_time_avg', 'satisfaction_with_support',
+                        'self_sufficiency_level'),
+}
+
+# Keys of the "metrics" object written by the tracking script
+TRACKING_METRICS = ('completion_rate', 'quality_score', 'time_spent', 'exercises_completed',
+                    'deliverables_submitted', 'validation_passed')
+
+# Metrics the assessment thresholds
+ASSESSED_METRICS = ('exercise_completion', 'validation_success')
+
+# Fields identifying a record rather than measuring it
+KEY_FIELDS = ('training_day', 'date')
+
+
+def _metric_fields():
+    fields = {}
+    for names in TEMPLATE_SECTIONS.values():
+        fields.update(dict.fromkeys(name for name in names if name not in KEY_FIELDS))
+    fields.update(dict.fromkeys(TRACKING_METRICS))
+    fields.update(dict.fromkeys(ASSESSED_METRICS))
+    return tuple(fields)
+
+
+METRIC_FIELDS = _metric_fields()
+
+
+def flatten_metrics(data: dict) -> dict:
+    """Metric values of one daily record, from template sections and "metrics" """
+    values = {}
+    for section, names in TEMPLATE_SECTIONS.items():
+        block = data.get(section)
+        if isinstance(block, dict):
+            values.update((name, block[name]) for name in names
+                          if name in block and name not in KEY_FIELDS)
+    metrics = data.get('metrics')
+    if isinstance(metrics, dict):
+        values.update(metrics)
+    return values
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Columnar segment file for daily metrics
+
+One file per cohort replaces thousands of small JSON files. It starts
+with a header naming its fields, followed by fixed-width records grouped
+by participant and a table of where each participant's rows are:
+
+    header   b'TMCS', version, field count, header size, record count,
+             participant count, field names
+    record   participant ID (32 bytes, NUL-padded UTF-8)
+             training_day, date (proleptic ordinal), then one float64 per
+             metric field, little-endian, NaN when not recorded
+    table    per participant, sorted by ID: ID (32 bytes), first row,
+             row count (uint64 each)
+
+Later ingests append runs after the table, each the same three parts:
+
+    run      b'TMCR', record count, participant count, padding up to a
+             whole row, records grouped by participant, their table,
+             then b'TMCREND\0' once the run is complete
+
+Within a run a participant's rows are contiguous and in the order they
+were appended, so looking them up is a binary search of each table
+rather than a scan of the store; readers merge the tables. An append
+writes only the new run, under a lock, and readers ignore it until its
+end marker is there. Once the appended runs hold as many records as the
+first segment (or MAX_RUNS runs exist), or on compact(), the store is
+rewritten as a single segment next to the old one and renamed over it,
+so readers holding the old mapping are unaffected. Readers mmap the
+file: every record has the same width and every run starts on a whole
+row, so each field is one strided memoryview over the mapping and
+analytics read it in place without copying or parsing. The rows a run's
+header and table occupy are never part of a frame. Bytes after the last
+complete run are ignored.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date as Date
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from remediation.fileio import atomic_writer, locked
+
+from .frame import NAN, TRAINING_DAYS, DailyRecord, MetricsFrame, index_for, read_record, to_number
+from .schema import KEY_FIELDS, METRIC_FIELDS
+
+MAGIC = b'TMCS'
+VERSION = 3
+RUN_MAGIC = b'TMCR'
+RUN_END = b'TMCREND\0'
+# Appended runs are folded into one segment once there are this many
+MAX_RUNS = 16
+ID_WIDTH = 32
+DEFAULT_STORE = 'metrics/cohort.tmcs'
+
+_HEADER = struct.Struct('<4sHHIQQ')
+_ENTRY = struct.Struct(f'<{ID_WIDTH}sQQ')
+_RUN = struct.Struct('<4s4xQQ')
+
+
+def date_ordinal(value: str) -> float:
+    try:
+        return float(Date.fromisoformat(value).toordinal())
+    except (TypeError, ValueError):
+        return NAN
+
+
+def ordinal_date(value: float) -> Optional[str]:
+    return None if value != value else Date.fromordinal(int(value)).isoformat()
+
+
+class Header(NamedTuple):
+    fields: Tuple[str, ...]
+    size: int               # bytes before the first record
+    records: int
+    participants: int
+
+    @property
+    def record_size(self) -> int:
+        return ID_WIDTH + 8 * len(self.fields)
+
+    @property
+    def table_offset(self) -> int:
+        return self.size + self.records * self.record_size
+
+    @property
+    def end(self) -> int:
+        return self.table_offset + self.participants * _ENTRY.size
+
+
+def encode_header(fields: Iterable[str], records: int = 0, participants: int = 0) -> bytes:
+    fields = tuple(fields)
+    names = '\n'.join(fields).encode('utf-8')
+    size = _HEADER.size + len(names)
+    size += -size % 8    # records start 8-byte aligned
+    return (_HEADER.pack(MAGIC, VERSION, len(fields), size, records, participants)
+            + names.ljust(size - _HEADER.size, b'\0'))
+
+
+def decode_header(data: bytes) -> Header:
+    """Header of a segment starting with data"""
+    if len(data) < 8:
+        raise ValueError("Not a metrics store: file too short")
+    magic, version = struct.unpack_from('<4sH', data)
+    if magic != MAGIC:
+        raise ValueError("Not a metrics store: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported metrics store version {version}; delete it and re-run the ingest")
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a metrics store: file too short")
+    _, _, count, size, records, participants = _HEADER.unpack_from(data)
+    if len(data) < size:
+        raise ValueError("Not a metrics store: truncated header")
+    fields = tuple(bytes(data[_HEADER.size:size]).rstrip(b'\0').decode('utf-8').split('\n'))
+    if len(fields) != count:
+        raise ValueError("Corrupt metrics store header")
+    return Header(fields, size, records, participants)
+
+
+class Run(NamedTuple):
+    """The first segment or one appended run"""
+    first: int              # row of the first record
+    records: int
+    table_offset: int
+    participants: int
+    end: int                # offset after the run
+
+
+def _records_start(header: Header, offset: int) -> int:
+    """Offset of the records of a run whose header is at offset: on a whole row"""
+    start = offset + _RUN.size
+    return start + -(start - header.size) % header.record_size
+
+
+def read_runs(mapped, header: Header) -> List[Run]:
+    """The first segment and every complete run appended after it"""
+    runs = [Run(0, header.records, header.table_offset, header.participants, header.end)]
+    offset = header.end
+    while offset + _RUN.size <= len(mapped):
+        magic, records, participants = _RUN.unpack_from(mapped, offset)
+        if magic != RUN_MAGIC:
+            break
+        start = _records_start(header, offset)
+        table_offset = start + records * header.record_size
+        end = table_offset + participants * _ENTRY.size + len(RUN_END)
+        if end > len(mapped) or mapped[end - len(RUN_END):end] != RUN_END:
+            break   # still being written, or torn
+        runs.append(Run((start - header.size) // header.record_size, records, table_offset, participants, end))
+        offset = end
+    return runs
+
+
+def read_header(f) -> Header:
+    """decode_header() of an open binary file, read from its start"""
+    head = f.read(_HEADER.size)
+    if len(head) == _HEADER.size:
+        head += f.read(max(_HEADER.unpack(head)[3] - _HEADER.size, 0))
+    return decode_header(head)
+
+
+def _encode_id(participant_id: str) -> bytes:
+    encoded = participant_id.encode('utf-8')
+    if len(encoded) > ID_WIDTH or b'\0' in encoded:
+        raise ValueError(f"Participant ID does not fit the store: {participant_id!r}")
+    return encoded.ljust(ID_WIDTH, b'\0')
+
+
+class _Table:
+    """The participant table of one run, as a sorted sequence of padded IDs"""
+
+    def __init__(self, mapped, run: Run):
+        self.mapped = mapped
+        self.offset = run.table_offset
+        self.length = run.participants
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, i: int) -> bytes:
+        start = self.offset + i * _ENTRY.size
+        return self.mapped[start:start + ID_WIDTH]
+
+    def entry(self, i: int) -> Tuple[bytes, int, int]:
+        return _ENTRY.unpack_from(self.mapped, self.offset + i * _ENTRY.size)
+
+    def find(self, participant_id: str) -> range:
+        """Rows of one participant (empty if not stored), by binary search"""
+        try:
+            key = _encode_id(participant_id)
+        except ValueError:
+            return range(0)
+        i = bisect_left(self, key)
+        if i == self.length or self[i] != key:
+            return range(0)
+        _, first, count = self.entry(i)
+        return range(first, first + count)
+
+    def __iter__(self) -> Iterator[Tuple[str, range]]:
+        """(participant ID, rows) in ID order"""
+        for i in range(self.length):
+            padded, first, count = self.entry(i)
+            yield padded.rstrip(b'\0').decode('utf-8'), range(first, first + count)
+
+
+class MetricsStore:
+    """A columnar segment of daily records, grouped by participant
+
+    frame() returns a MetricsFrame whose columns are views into the
+    mapped file; they stay valid until close().
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._runs: List[Run] = []
+        self._views: List[memoryview] = []
+
+    @classmethod
+    def create(cls, path: str, metric_fields: Iterable[str] = METRIC_FIELDS) -> 'MetricsStore':
+        """Open the store at path, creating it with the given fields if missing"""
+        header = encode_header(KEY_FIELDS + tuple(metric_fields))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        try:
+            with atomic_writer(path, binary=True, exclusive=True) as f:
+                f.write(header)
+        except FileExistsError:
+            pass    # another process created the store first
+        return cls(path)
+
+    # Writing
+
+    def append(self, records: Iterable[DailyRecord]) -> int:
+        """Add records under a lock; returns how many were written
+
+        The records are written as a new run at the end of the file, in
+        time proportional to the records rather than the store. The store
+        is compacted instead when the runs would outgrow the first segment.
+        """
+        return self._update(records, compact=False)
+
+    def compact(self):
+        """Rewrite the store as a single segment, each participant's rows together"""
+        self._update((), compact=True)
+
+    def _update(self, records: Iterable[DailyRecord], compact: bool) -> int:
+        with locked(self.path) as f:
+            if f is None:
+                raise FileNotFoundError(f"No metrics store at {self.path}")
+            header = read_header(f)
+            record = struct.Struct(f'<{ID_WIDTH}s{len(header.fields)}d')
+            added: Dict[bytes, List[bytes]] = {}
+            count = 0
+            for daily in records:
+                packed = self._pack(record, header.fields, daily)
+                added.setdefault(packed[:ID_WIDTH], []).append(packed)
+                count += 1
+            if not count and not compact:
+                return 0
+
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if len(mapped) < header.end:
+                    raise ValueError(f"Corrupt metrics store: {self.path} is truncated")
+                runs = read_runs(mapped, header)
+                appended = sum(run.records for run in runs[1:])
+                # A torn append leaves bytes after the last run; rewriting drops them
+                if (compact or runs[-1].end != len(mapped) or len(runs) > MAX_RUNS
+                        or appended + count >= header.records):
+                    self._rewrite(header, mapped, runs, added)
+                else:
+                    self._append_run(header, runs[-1].end, added, count)
+            finally:
+                mapped.close()
+        return count
+
+    def _append_run(self, header: Header, offset: int, added: Dict[bytes, List[bytes]], count: int):
+        ids = sorted(added)
+        start = _records_start(header, offset)
+        entries, row = [], (start - header.size) // header.record_size
+        for padded in ids:
+            entries.append(_ENTRY.pack(padded, row, len(added[padded])))
+            row += len(added[padded])
+        with open(self.path, 'r+b') as out:
+            out.seek(offset)
+            out.write(_RUN.pack(RUN_MAGIC, count, len(ids)) + bytes(start - offset - _RUN.size))
+            for padded in ids:
+                out.write(b''.join(added[padded]))
+            out.write(b''.join(entries))
+            out.flush()
+            os.fsync(out.fileno())
+            # Only now does the run count: the marker is the last write
+            out.write(RUN_END)
+            out.flush()
+            os.fsync(out.fileno())
+
+    def _rewrite(self, header: Header, mapped, runs: List[Run], added: Dict[bytes, List[bytes]]):
+        stored: Dict[bytes, List[Tuple[int, int]]] = {}
+        for run in runs:
+            table = _Table(mapped, run)
+            for i in range(len(table)):
+                padded, first, count = table.entry(i)
+                stored.setdefault(padded, []).append((first, count))
+        ids = sorted(stored.keys() | added.keys())
+        records = sum(run.records for run in runs) + sum(len(chunks) for chunks in added.values())
+        with atomic_writer(self.path, binary=True) as out:
+            out.write(encode_header(header.fields, records, len(ids)))
+            entries, row = [], 0
+            for padded in ids:
+                written = 0
+                for first, count in stored.get(padded, ()):
+                    start = header.size + first * header.record_size
+                    out.write(mapped[start:start + count * header.record_size])
+                    written += count
+                new = added.get(padded, ())
+                out.write(b''.join(new))
+                entries.append(_ENTRY.pack(padded, row, written + len(new)))
+                row += written + len(new)
+            out.write(b''.join(entries))
+
+    @staticmethod
+    def _pack(record: struct.Struct, fields: Tuple[str, ...], daily: DailyRecord) -> bytes:
+        values = [float(daily.day), date_ordinal(daily.date)]
+        values.extend(to_number(daily.metrics.get(name)) for name in fields[len(KEY_FIELDS):])
+        return record.pack(_encode_id(daily.participant_id), *values)
+
+    # Reading
+
+    def _open(self) -> Tuple[mmap.mmap, Header, List[Run]]:
+        """(mapping, header, runs), mapping the file once"""
+        if self._map is None:
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = decode_header(self._map)
+        if len(self._map) < header.end:
+            raise ValueError(f"Corrupt metrics store: {self.path} is truncated")
+        if not self._runs:
+            self._runs = read_runs(self._map, header)
+        return self._map, header, self._runs
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self._open()[1].fields
+
+    def __len__(self) -> int:
+        return sum(run.records for run in self._open()[2])
+
+    def columns(self) -> Dict[str, memoryview]:
+        """Every field as a strided float64 view into the mapping
+
+        The view runs from the first record to the last run's records, so
+        it includes the rows that the tables in between occupy.
+        """
+        mapped, header, runs = self._open()
+        last = runs[-1]
+        base = memoryview(mapped)[header.size:header.size + (last.first + last.records) * header.record_size]
+        if sys.byteorder != 'little':
+            raise OSError("Zero-copy reads need a little-endian host")
+        flat = base.cast('d')
+        stride = header.record_size // 8
+        columns = {name: flat[ID_WIDTH // 8 + i::stride] for i, name in enumerate(header.fields)}
+        self._views.extend([base, flat, *columns.values()])
+        return columns
+
+    def _tables(self) -> List[_Table]:
+        mapped, _, runs = self._open()
+        return [_Table(mapped, run) for run in runs]
+
+    def participants(self) -> List[str]:
+        """Stored participant IDs, sorted, read from the tables alone"""
+        tables = self._tables()
+        if len(tables) == 1:
+            return [pid for pid, _ in tables[0]]
+        return sorted({pid for table in tables for pid, _ in table})
+
+    def rows_of(self, participant_id: str) -> List[int]:
+        """Rows of one participant, in the order they were appended"""
+        return [row for table in self._tables() for row in table.find(participant_id)]
+
+    def participant_ids(self) -> Iterator[str]:
+        """Participant ID of every record, in row order"""
+        for table in self._tables():
+            for pid, rows in table:
+                for _ in rows:
+                    yield pid
+
+    def keys(self) -> Set[Tuple[str, int, Optional[str]]]:
+        """(participant, day, date) of every stored record"""
+        columns = self.columns()
+        days, dates = columns['training_day'], columns['date']
+        return {(pid, int(days[row]), ordinal_date(dates[row]))
+                for table in self._tables() for pid, rows in table for row in rows}
+
+    def frame(self, date: Optional[str] = None, participants: Optional[Iterable[str]] = None,
+              days: int = TRAINING_DAYS) -> MetricsFrame:
+        """Frame of the latest record of each participant's day
+
+        For the whole store the columns are zero-copy views. Given
+        participants, only their rows are visited, found through the
+        participant table, and copied out, so the frame - and anything
+        scored from it - is the size of that group, not of the store.
+        """
+        columns = self.columns()
+        day_column, date_column = columns.pop('training_day'), columns.pop('date')
+        only = None if date is None else date_ordinal(date)
+        tables = self._tables()
+        if participants is None:
+            groups = (group for table in tables for group in table)
+        else:
+            groups = ((pid, [row for table in tables for row in table.find(pid)])
+                      for pid in dict.fromkeys(participants))
+
+        keys: Dict[Tuple[str, int], int] = {}
+        for pid, rows in groups:
+            for row in rows:
+                day = int(day_column[row])
+                if not 1 <= day <= days or (only is not None and date_column[row] != only):
+                    continue
+                key = (pid, day)
+                previous = keys.get(key)
+                if previous is None or date_column[row] >= date_column[previous]:
+                    keys[key] = row
+        if participants is None:
+            return MetricsFrame(columns, len(day_column), keys, days)
+
+        selected = sorted(keys.values())
+        compact = {name: array('d', (column[row] for row in selected)) for name, column in columns.items()}
+        position = {row: i for i, row in enumerate(selected)}
+        return MetricsFrame(compact, len(selected), {key: position[row] for key, row in keys.items()}, days)
+
+    def close(self):
+        """Release the mapping; frames built from it become unusable"""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._runs = []
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> 'MetricsStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ingest(metrics_dir: str, store_path: str = DEFAULT_STORE, compact: bool = False) -> Tuple[int, int]:
+    """Append every JSON daily record not yet in the store; (added, already stored)
+
+    With compact=True the store is then rewritten as a single segment.
+    """
+    store = MetricsStore.create(store_path)
+    with store:
+        stored = store.keys()
+    records, skipped = [], 0
+    for path in index_for(metrics_dir).all_paths():
+        record = read_record(path)
+        if record is None:
+            continue
+        if (record.participant_id, record.day, record.date) in stored:
+            skipped += 1
+        else:
+            records.append(record)
+    added = store.append(records)
+    if compact:
+        store.compact()
+    return added, skipped
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build or refresh the full-text search index of the training material
+
+    python3 scripts/update-search-index.py                  # docs/ and training/
+    python3 scripts/update-search-index.py --jobs 0 docs    # only docs/, on every CPU
+
+Only files whose content changed since the last run are read again (see
+remediation.search). Query the index with search_docs.py.
+"""
+import argparse
+import os
+import sys
+import time
+
+from remediation.content_metrics import CONTENT_ROOTS
+from remediation.engine import resolve_jobs
+from remediation.search import INDEX_DIR, update
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Update the full-text search index")
+    parser.add_argument('paths', nargs='*',
+                        help=f"files or directories to index (default: {' and '.join(CONTENT_ROOTS)})")
+    parser.add_argument('--index', default=INDEX_DIR, metavar='DIR',
+                        help="index directory (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="tokenize changed files across N worker processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    if not args.paths:
+        args.paths = [root for root in CONTENT_ROOTS if os.path.isdir(root)]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        jobs = resolve_jobs(args.jobs)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    start = time.perf_counter()
+    result = update(args.paths, args.index, jobs)
+    for path, error in result.errors.items():
+        print(f"Error indexing {path}: {error}")
+    print(f"Indexed {result.files} files ({result.indexed} changed, {result.removed} removed): "
+          f"{result.sections} sections in {time.perf_counter() - start:.2f}s")
+    return 1 if result.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
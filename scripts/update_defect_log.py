@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
+import argparse
+import sys
 from datetime import datetime
 
-# Read the current defect log
-with open('DEFECT_LOG.md', 'r') as f:
-    content = f.read()
+from remediation.fileio import atomic_write_text, decode_text, iter_lines, locked
+from remediation.manifest import FORMATS, ManifestReport, detect_format, read_manifest
+from remediation.mdtable import MarkdownDocument, stream_tables
 
-# Current date for resolution
-current_date = datetime.now().strftime('%Y-%m-%d')
+DEFECT_LOG = 'DEFECT_LOG.md'
 
 # Define which defects we've resolved and their resolution notes
 resolved_defects = {
@@ -33,22 +34,212 @@ resolved_defects = {
     'DEF-021': 'Converted HX-Infrastructure Practical Exercise to proper heading'
 }
 
-# Update the defect log
-lines = content.split('\n')
-updated_lines = []
-
-for line in lines:
-    updated_line = line
-    for defect_id, resolution in resolved_defects.items():
-        if defect_id in line and '| Open |' in line:
-            # Update status from Open to Resolved and add resolution notes and date
-            updated_line = line.replace('| Open |', '| Resolved |')
-            updated_line = updated_line.replace('| |', f'| {resolution} |')
-            updated_line = updated_line.replace(f'| {current_date} | |', f'| {current_date} | {current_date} |')
-    updated_lines.append(updated_line)
-
-# Write the updated defect log
-with open('DEFECT_LOG.md', 'w') as f:
-    f.write('\n'.join(updated_lines))
-
-print(f"Updated defect log with {len(resolved_defects)} resolved defects")
+
+# Column names used by DEFECT_LOG.md, with the aliases older logs use
+ID_COLUMNS = ('Defect ID', 'ID')
+STATUS_COLUMNS = ('Status',)
+NOTES_COLUMNS = ('Resolution Notes',)
+CLOSED_COLUMNS = ('Date Closed', 'Resolved')
+SEVERITY_COLUMNS = ('Severity',)
+PR_COLUMNS = ('PR #', 'PR')
+
+# Statuses that carry a closing date
+CLOSED_STATUSES = ('Resolved', 'Closed', "Won't Fix")
+
+
+class DefectTable:
+    """The defect table of a log document, addressed by column name"""
+
+    def __init__(self, document):
+        self.document = document
+        self.table = None
+        for table in document.tables:
+            if table.resolve_column(*ID_COLUMNS) and table.resolve_column(*STATUS_COLUMNS):
+                self.table = table
+                break
+        if self.table is None:
+            raise ValueError("No defect table with ID and Status columns found")
+        self.id_column = self.table.resolve_column(*ID_COLUMNS)
+        self.status_column = self.table.resolve_column(*STATUS_COLUMNS)
+        self.notes_column = self.table.resolve_column(*NOTES_COLUMNS)
+        self.closed_column = self.table.resolve_column(*CLOSED_COLUMNS)
+        self.rows = self.table.index_by(self.id_column)
+
+    def resolve(self, defect_id, resolution, current_date):
+        """Mark one Open defect Resolved; returns False if not found or not Open"""
+        row = self.rows.get(defect_id)
+        if row is None or self.table.get(row, self.status_column) != 'Open':
+            return False
+        self.table.set(row, self.status_column, 'Resolved')
+        if self.notes_column:
+            self.table.set(row, self.notes_column, resolution)
+        if self.closed_column:
+            self.table.set(row, self.closed_column, current_date)
+        return True
+
+    def transition(self, defect_id, status, notes='', current_date=''):
+        """Move one defect to status; returns 'changed', 'missing' or 'unchanged'"""
+        row = self.rows.get(defect_id)
+        if row is None:
+            return 'missing'
+        if self.table.get(row, self.status_column) == status:
+            return 'unchanged'
+        self.table.set(row, self.status_column, status)
+        if notes and self.notes_column:
+            self.table.set(row, self.notes_column, notes)
+        if self.closed_column:
+            self.table.set(row, self.closed_column, current_date if status in CLOSED_STATUSES else '')
+        return 'changed'
+
+
+def update_content(content, resolutions, current_date):
+    """Apply resolutions to a defect log in one pass, keyed by exact defect ID
+
+    Returns the updated text and the IDs that were resolved.
+    """
+    document = MarkdownDocument.parse(content)
+    defects = DefectTable(document)
+    resolved = [defect_id for defect_id, resolution in resolutions.items()
+                if defects.resolve(defect_id, resolution, current_date)]
+    return document.serialize(), resolved
+
+
+def update_defect_log(path, resolutions, current_date=None):
+    """Read the defect log once, resolve defects, write it back atomically"""
+    current_date = current_date or datetime.now().strftime('%Y-%m-%d')
+
+    with locked(path) as f:
+        if f is None:
+            raise FileNotFoundError(f"No such file: {path}")
+        content = decode_text(f.read())
+
+        updated, resolved = update_content(content, resolutions, current_date)
+        if updated != content:
+            atomic_write_text(path, updated)
+    return resolved
+
+
+def apply_manifest(path, entries, current_date=None, write=True):
+    """Apply a stream of manifest entries in one pass over the defect log
+
+    The log is parsed once and each entry is a dictionary lookup, so the
+    cost is one read plus one write however many entries there are.
+    """
+    current_date = current_date or datetime.now().strftime('%Y-%m-%d')
+
+    # Locked from read to replace so concurrent updates are applied in turn
+    with locked(path, shared=not write) as f:
+        if f is None:
+            raise FileNotFoundError(f"No such file: {path}")
+        content = decode_text(f.read())
+
+        document = MarkdownDocument.parse(content)
+        defects = DefectTable(document)
+        report = ManifestReport()
+        for entry in entries:
+            report.add(defects.transition(entry.id, entry.status, entry.notes,
+                                          entry.date or current_date), entry)
+
+        updated = document.serialize()
+        if write and updated != content:
+            atomic_write_text(path, updated)
+    return report
+
+
+def defect_rows(lines):
+    """The defect table of a line stream, read row by row"""
+    for table in stream_tables(lines):
+        if table.resolve_column(*ID_COLUMNS) and table.resolve_column(*STATUS_COLUMNS):
+            return table
+    raise ValueError("No defect table with ID and Status columns found")
+
+
+def query_defects(table, status=None, severity=None, pr=None):
+    """Rows of a streamed defect table matching every given filter
+
+    Matching is case-insensitive, and only the filtered cells of each row
+    are split out; rows are never collected.
+    """
+    filters = []
+    for columns, value in ((STATUS_COLUMNS, status), (SEVERITY_COLUMNS, severity), (PR_COLUMNS, pr)):
+        if value is None:
+            continue
+        column = table.resolve_column(*columns)
+        if column is None:
+            raise ValueError(f"Defect table has no {columns[0]} column")
+        filters.append((table.columns[column], value.strip().lstrip('#').lower()))
+
+    for row in table:
+        if all(row.cell(index).lstrip('#').lower() == value for index, value in filters):
+            yield row
+
+
+def run_manifest(args):
+    fmt = args.format or ('json' if args.manifest == '-' else detect_format(args.manifest))
+    try:
+        if args.manifest == '-':
+            report = apply_manifest(args.log, read_manifest(sys.stdin, fmt), args.date,
+                                    write=not args.dry_run)
+        else:
+            with open(args.manifest, 'r', newline='') as f:
+                report = apply_manifest(args.log, read_manifest(f, fmt), args.date,
+                                        write=not args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+
+    print(report.summary())
+    return 1 if report.missing else 0
+
+
+def run_query(args):
+    try:
+        with open(args.log, 'r') as f:
+            table = defect_rows(iter_lines(f))
+            count = 0
+            for row in query_defects(table, args.status, args.severity, args.pr):
+                if count == 0:
+                    print(table.header_line)
+                    print(table.separator_line)
+                print(row.line)
+                count += 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+
+    print(f"{count} matching defects", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mark resolved defects in the defect log")
+    parser.add_argument('--log', default=DEFECT_LOG, help="defect log to update (default: %(default)s)")
+    manifest = parser.add_argument_group("bulk updates")
+    manifest.add_argument('--manifest', metavar='FILE',
+                          help="apply status changes from a JSON, JSONL or CSV manifest ('-' for stdin)")
+    manifest.add_argument('--format', choices=FORMATS,
+                          help="manifest format (default: from the file extension, JSON for stdin)")
+    manifest.add_argument('--date', help="closing date for entries without one (default: today)")
+    manifest.add_argument('--dry-run', action='store_true',
+                          help="report what the manifest would change without writing the log")
+    query = parser.add_argument_group("queries")
+    query.add_argument('--query', action='store_true',
+                       help="print the defects matching --status/--severity/--pr and exit")
+    query.add_argument('--status', help="filter by status (e.g. Open)")
+    query.add_argument('--severity', help="filter by severity (e.g. High)")
+    query.add_argument('--pr', help="filter by PR number")
+    args = parser.parse_args(argv)
+
+    if args.query:
+        return run_query(args)
+
+    if args.manifest:
+        return run_manifest(args)
+
+    update_defect_log(args.log, resolved_defects)
+    print(f"Updated defect log with {len(resolved_defects)} resolved defects")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
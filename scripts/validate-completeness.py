@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Check that structured documents have their required sections
+
+    python3 scripts/validate-completeness.py                    # docs/ and training/
+    python3 scripts/validate-completeness.py --json > metrics/completeness.json
+    python3 scripts/validate-completeness.py --rules doc-types.json --jobs 0 docs
+
+Specifications, implementation plans and ADRs must have the level-2
+sections of their templates in training/templates/, and sprint summaries
+need Overview, Key Achievements and Lessons Learned (see
+remediation.completeness). --rules replaces these with a JSON list of
+{"name", "patterns", "template", "sections"} entries. Exits 1 if any
+document is incomplete.
+"""
+import argparse
+import json
+import os
+import sys
+
+from remediation.completeness import DOCUMENT_TYPES, CompletenessValidator, load_types, report
+from remediation.content_metrics import CONTENT_ROOTS
+from remediation.engine import resolve_jobs
+from remediation.headings import INDEX_FILE
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate documentation completeness")
+    parser.add_argument('paths', nargs='*',
+                        help=f"files or directories to check (default: {' and '.join(CONTENT_ROOTS)})")
+    parser.add_argument('--root', default='.',
+                        help="repository root that patterns and templates are relative to (default: %(default)s)")
+    parser.add_argument('--rules', metavar='FILE', help="JSON document types to use instead of the built-in ones")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="parse files across N worker processes (0 = one per CPU)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--index', metavar='PATH',
+                        help=f"parsed-file index to reuse and update (default: ROOT/{INDEX_FILE})")
+    parser.add_argument('--no-index', dest='index', action='store_const', const='',
+                        help="parse every file and leave the index untouched")
+    args = parser.parse_args(argv)
+    if not args.paths:
+        args.paths = [os.path.join(args.root, d) for d in CONTENT_ROOTS
+                      if os.path.isdir(os.path.join(args.root, d))]
+    if args.index is None:
+        args.index = os.path.join(args.root, INDEX_FILE)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        jobs = resolve_jobs(args.jobs)
+        types = load_types(args.rules) if args.rules else DOCUMENT_TYPES
+        validator = CompletenessValidator(types, args.root)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    results = validator.validate(args.paths, jobs, args.index or None)
+    summary = report(results)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for result in results:
+            if result.error:
+                print(f"✗ {result.path} ({result.type}): {result.error}")
+            elif result.missing:
+                print(f"✗ {result.path} ({result.type}) missing: {', '.join(result.missing)}")
+        print(f"Checked {summary['checked']} documents: {summary['complete']} complete, "
+              f"{summary['incomplete']} incomplete")
+    return 1 if summary['incomplete'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())